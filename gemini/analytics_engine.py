@@ -0,0 +1,144 @@
+import numpy as np
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(moment):
+    """Seconds since 1970 for a naive local datetime (closed_at is stored as local wall-clock time)."""
+    return int((moment - EPOCH).total_seconds())
+
+
+class AnalyticsEngine:
+    """
+    Keeps every closed line item in memory as compact NumPy columns so the
+    reports screen can re-draw its charts without going back to SQLite.
+    Ids are int32, closed_at is int64 epoch seconds and prices are integer
+    cents. refresh() only fetches orders closed after the last one it saw,
+    and every aggregate is a vectorized bincount over a time-sorted slice.
+    """
+    COLUMNS = {
+        'order_id': np.int32,
+        'product_id': np.int32,
+        'user_id': np.int32,
+        'closed_at': np.int64,
+        'quantity': np.int32,
+        'price_cents': np.int64,
+    }
+
+    def __init__(self, db):
+        self.db = db
+        self.size = 0
+        self.high_water_mark = None  # (closed_at, order_id) of the newest order loaded
+        self.products = {}           # product id -> (name, category)
+        self.users = {}              # user id -> username
+        self._data = {name: np.empty(0, dtype) for name, dtype in self.COLUMNS.items()}
+        self._expose_columns()
+
+    def _expose_columns(self):
+        """Points engine.quantity, engine.closed_at, ... at the filled part of each column buffer."""
+        for name, column in self._data.items():
+            setattr(self, name, column[:self.size])
+
+    # --- Loading ---
+    def refresh(self):
+        """Appends the line items of orders closed since the last refresh. Returns how many were added."""
+        self.products = self.db.get_product_lookup()
+        self.users = self.db.get_user_lookup()
+        rows = self.db.get_closed_sales_since(self.high_water_mark)
+        if not rows:
+            return 0
+
+        order_id, closed_at, product_id, user_id, quantity, price = zip(*rows)
+        self._append({
+            'order_id': np.array(order_id, dtype=np.int32),
+            'product_id': np.array(product_id, dtype=np.int32),
+            'user_id': np.array(user_id, dtype=np.int32),
+            'closed_at': np.array(closed_at, dtype='datetime64[us]').astype('datetime64[s]').astype(np.int64),
+            'quantity': np.array(quantity, dtype=np.int32),
+            'price_cents': np.rint(np.array(price, dtype=np.float64) * 100).astype(np.int64),
+        })
+        self.high_water_mark = (rows[-1][1], rows[-1][0])
+        return len(rows)
+
+    def _append(self, new):
+        """Copies new rows onto the end of each column, doubling capacity when full."""
+        count = len(new['order_id'])
+        needed = self.size + count
+        capacity = len(self._data['order_id'])
+        if needed > capacity:
+            capacity = max(needed, capacity * 2, 1024)
+            for name, column in self._data.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                self._data[name] = grown
+        for name, values in new.items():
+            self._data[name][self.size:needed] = values
+        self.size = needed
+        self._expose_columns()
+
+    # --- Aggregates ---
+    def _window(self, start=None, end=None):
+        """Index slice of the rows closed in [start, end); rows are kept sorted by closed_at."""
+        closed_at = self.closed_at
+        lo = 0 if start is None else np.searchsorted(closed_at, to_epoch(start), side='left')
+        hi = self.size if end is None else np.searchsorted(closed_at, to_epoch(end), side='left')
+        return slice(lo, hi)
+
+    def _line_cents(self, rows):
+        return self.quantity[rows].astype(np.int64) * self.price_cents[rows]
+
+    def quantity_by_product(self, start=None, end=None):
+        """Units sold, indexed by product id."""
+        rows = self._window(start, end)
+        return np.bincount(self.product_id[rows], weights=self.quantity[rows])
+
+    def top_products(self, limit=5, start=None, end=None):
+        """The best-selling products as [(name, quantity), ...], highest first."""
+        sold = self.quantity_by_product(start, end)
+        best = np.argsort(sold)[::-1][:limit]
+        return [(self.products.get(int(pid), (f"#{pid}", ''))[0], int(sold[pid])) for pid in best if sold[pid] > 0]
+
+    def sales_by_category(self, start=None, end=None):
+        """Revenue per category as {category: dollars}."""
+        rows = self._window(start, end)
+        by_product = np.bincount(self.product_id[rows], weights=self._line_cents(rows))
+        categories = sorted({category for _, category in self.products.values()})
+        codes = np.full(len(by_product), len(categories), dtype=np.int32)  # Unknown products fall in the last bin
+        index = {category: code for code, category in enumerate(categories)}
+        for pid, (_, category) in self.products.items():
+            if pid < len(codes):
+                codes[pid] = index[category]
+        totals = np.bincount(codes, weights=by_product, minlength=len(categories) + 1)
+        return {category: totals[code] / 100 for code, category in enumerate(categories) if totals[code]}
+
+    def sales_by_server(self, start=None, end=None):
+        """Revenue per server as [(username, dollars), ...], highest first."""
+        rows = self._window(start, end)
+        totals = np.bincount(self.user_id[rows], weights=self._line_cents(rows))
+        order = np.argsort(totals)[::-1]
+        return [(self.users.get(int(uid), f"#{uid}"), totals[uid] / 100) for uid in order if totals[uid] > 0]
+
+    def sales_by_hour(self, start=None, end=None):
+        """Revenue for each hour of the day (index 0-23), in dollars."""
+        rows = self._window(start, end)
+        hours = (self.closed_at[rows] // 3600) % 24
+        return np.bincount(hours, weights=self._line_cents(rows), minlength=24) / 100
+
+    def daily_sales(self, start, end):
+        """Revenue per day in [start, end) as (list of dates, dollars), days without sales included."""
+        first_day = to_epoch(start) // 86400
+        last_day = (to_epoch(end) - 1) // 86400
+        rows = self._window(start, end)
+        days = self.closed_at[rows] // 86400 - first_day
+        totals = np.bincount(days, weights=self._line_cents(rows), minlength=last_day - first_day + 1) / 100
+        dates = [(EPOCH + timedelta(days=int(day))).date() for day in range(first_day, last_day + 1)]
+        return dates, totals
+
+    def monthly_sales(self, year):
+        """Revenue for each month of a year (index 0 = January), in dollars."""
+        # Rows are sorted by time, so each month is a contiguous run between two searchsorted bounds
+        starts = [to_epoch(datetime(year + month // 12, month % 12 + 1, 1)) for month in range(13)]
+        bounds = np.searchsorted(self.closed_at, starts, side='left')
+        running = np.concatenate(([0], np.cumsum(self._line_cents(slice(bounds[0], bounds[-1])))))
+        return np.diff(running[bounds - bounds[0]]) / 100
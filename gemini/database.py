@@ -82,6 +82,9 @@ class Database:
                 FOREIGN KEY (product_id) REFERENCES products(id)
             )
         ''')
+        # Lets reports read only the orders closed since their last load
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_closed_at ON orders (status, closed_at)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id)")
         self.conn.commit()
         self.seed_initial_data()
 
@@ -283,5 +286,35 @@ class Database:
         ''')
         return self.cursor.fetchall()
 
+    def get_closed_sales_since(self, after=None):
+        """
+        Fetches the line items of orders closed after a (closed_at, order_id)
+        high-water mark, oldest first, as plain id/number columns for the
+        analytics engine. Pass None to fetch everything.
+        """
+        query = '''
+            SELECT o.id, o.closed_at, oi.product_id, o.user_id, oi.quantity, oi.price_at_time
+            FROM orders o
+            JOIN order_items oi ON oi.order_id = o.id
+            WHERE o.status = 'closed'
+        '''
+        params = ()
+        if after is not None:
+            query += " AND (o.closed_at, o.id) > (?, ?)"
+            params = tuple(after)
+        query += " ORDER BY o.closed_at, o.id"
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    def get_product_lookup(self):
+        """Maps every product id to its (name, category)."""
+        self.cursor.execute("SELECT id, name, category FROM products")
+        return {row['id']: (row['name'], row['category']) for row in self.cursor.fetchall()}
+
+    def get_user_lookup(self):
+        """Maps every user id to its username."""
+        self.cursor.execute("SELECT id, username FROM users")
+        return {row['id']: row['username'] for row in self.cursor.fetchall()}
+
     def __del__(self):
         self.conn.close()
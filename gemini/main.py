@@ -25,6 +25,10 @@ try:
 except (ImportError, ModuleNotFoundError):
     plt = None
     FigureCanvasTkAgg = None
+try:
+    from analytics_engine import AnalyticsEngine
+except (ImportError, ModuleNotFoundError):
+    AnalyticsEngine = None
 
 
 class Style:
@@ -514,6 +518,7 @@ class ReportsScreen(ctk.CTkFrame):
         super().__init__(parent, fg_color=Style.BACKGROUND)
         self.controller = controller
         self.db = controller.get_db()
+        self.engine = AnalyticsEngine(self.db) if AnalyticsEngine else None
         self.graph_widgets = []
 
         header = ctk.CTkFrame(self, fg_color="transparent")
@@ -528,58 +533,53 @@ class ReportsScreen(ctk.CTkFrame):
         self.main_frame.grid_rowconfigure(0, weight=1); self.main_frame.grid_rowconfigure(1, weight=1)
 
     def refresh(self):
-        if pd is None or plt is None:
+        if self.engine is None or plt is None:
             for widget in self.main_frame.winfo_children(): widget.destroy()
-            ctk.CTkLabel(self.main_frame, text="Required libraries for reporting are not installed.\nPlease run: pip install pandas matplotlib",
+            ctk.CTkLabel(self.main_frame, text="Required libraries for reporting are not installed.\nPlease run: pip install numpy matplotlib",
                          font=Style.HEADER_FONT, text_color=Style.DANGER).pack(expand=True)
             return
 
         for widget in self.graph_widgets: widget.destroy()
         self.graph_widgets.clear()
         
-        all_data = self.db.get_all_sales_data_for_export()
-        if not all_data:
+        # Only orders closed since the last visit are read from the database
+        self.engine.refresh()
+        if self.engine.size == 0:
             for widget in self.main_frame.winfo_children(): widget.destroy()
             no_data_label = ctk.CTkLabel(self.main_frame, text="No sales data available to generate reports.", font=Style.HEADER_FONT)
             no_data_label.grid(row=0, column=0, columnspan=2, sticky="nsew")
             self.graph_widgets.append(no_data_label)
             return
 
-        df = pd.DataFrame(all_data, columns=['timestamp', 'table', 'server', 'item', 'category', 'quantity', 'price'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['total_price'] = df['quantity'] * df['price']
-
-        self.plot_bestsellers(df, 0, 0)
-        self.plot_monthly_sales(df, 0, 1)
-        self.plot_daily_trend(df, 1, 0, 2)
+        self.plot_bestsellers(0, 0)
+        self.plot_monthly_sales(0, 1)
+        self.plot_daily_trend(1, 0, 2)
 
-    def plot_bestsellers(self, df, row, col):
+    def plot_bestsellers(self, row, col):
         frame = ctk.CTkFrame(self.main_frame, fg_color=Style.FRAME_BG)
         frame.grid(row=row, column=col, sticky="nsew", padx=10, pady=10)
         self.graph_widgets.append(frame)
         
-        bestsellers = df.groupby('item')['quantity'].sum().nlargest(5)
+        bestsellers = self.engine.top_products(5)[::-1] # Largest bar at the top
         
         fig, ax = self._create_figure()
-        bestsellers.sort_values().plot(kind='barh', ax=ax, color=Style.ACCENT)
+        ax.barh([name for name, _ in bestsellers], [quantity for _, quantity in bestsellers], color=Style.ACCENT)
         ax.set_title('Top 5 Best-Selling Items', color=Style.TEXT)
         ax.set_xlabel('Quantity Sold', color=Style.TEXT_MUTED)
         ax.set_ylabel('')
         
         self._embed_plot(fig, frame)
 
-    def plot_monthly_sales(self, df, row, col):
+    def plot_monthly_sales(self, row, col):
         frame = ctk.CTkFrame(self.main_frame, fg_color=Style.FRAME_BG)
         frame.grid(row=row, column=col, sticky="nsew", padx=10, pady=10)
         self.graph_widgets.append(frame)
         
-        df_monthly = df[df['timestamp'].dt.year == datetime.now().year]
-        monthly_sales = df_monthly.groupby(df_monthly['timestamp'].dt.strftime('%b'))['total_price'].sum()
+        monthly_sales = self.engine.monthly_sales(datetime.now().year)
         months = [datetime(2000, i, 1).strftime('%b') for i in range(1, 13)]
-        monthly_sales = monthly_sales.reindex(months, fill_value=0)
 
         fig, ax = self._create_figure()
-        monthly_sales.plot(kind='bar', ax=ax, color=Style.SUCCESS)
+        ax.bar(months, monthly_sales, color=Style.SUCCESS)
         ax.set_title('Monthly Sales (Current Year)', color=Style.TEXT)
         ax.set_ylabel('Total Sales ($)', color=Style.TEXT_MUTED)
         ax.set_xlabel('')
@@ -587,16 +587,16 @@ class ReportsScreen(ctk.CTkFrame):
         
         self._embed_plot(fig, frame)
 
-    def plot_daily_trend(self, df, row, col, colspan):
+    def plot_daily_trend(self, row, col, colspan):
         frame = ctk.CTkFrame(self.main_frame, fg_color=Style.FRAME_BG)
         frame.grid(row=row, column=col, columnspan=colspan, sticky="nsew", padx=10, pady=10)
         self.graph_widgets.append(frame)
         
-        last_30_days_df = df[df['timestamp'] >= (datetime.now() - timedelta(days=30))]
-        daily_sales = last_30_days_df.groupby(last_30_days_df['timestamp'].dt.date)['total_price'].sum()
+        now = datetime.now()
+        days, daily_sales = self.engine.daily_sales(now - timedelta(days=30), now + timedelta(seconds=1))
 
         fig, ax = self._create_figure()
-        daily_sales.plot(kind='line', ax=ax, color=Style.ADMIN, marker='o')
+        ax.plot(days, daily_sales, color=Style.ADMIN, marker='o')
         ax.set_title('Sales Trend (Last 30 Days)', color=Style.TEXT)
         ax.set_ylabel('Total Sales ($)', color=Style.TEXT_MUTED)
         ax.set_xlabel('')
@@ -664,7 +664,8 @@ if __name__ == "__main__":
     missing = []
     if Usb is None: missing.append("'python-escpos' for printing")
     if openpyxl is None: missing.append("'openpyxl' for Excel export")
-    if pd is None: missing.append("'pandas' for analytics")
+    if AnalyticsEngine is None: missing.append("'numpy' for analytics")
+    if pd is None: missing.append("'pandas' for Excel export")
     if plt is None: missing.append("'matplotlib' for graphs")
     if missing:
         message = "The following libraries are missing:\n\n" + "\n".join(missing) + \
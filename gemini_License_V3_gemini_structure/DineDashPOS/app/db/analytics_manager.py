@@ -1,194 +1,480 @@
+import functools
 from .base_manager import BaseManager
+from .business_day import CUTOFF_SETTING_KEY, get_cutoff_hour, current_business_date, period_range
+from .events import ORDERS, TABLES, CATALOG, USERS, SETTINGS, EXTERNAL
+from .report_cache import ReportCache
+
+# ORDERS actions that only touch open orders, which no cached report reads
+OPEN_ORDER_ACTIONS = ("created", "items")
+
+# Queries behind each exportable report. They are streamed, never fetched whole.
+EXPORT_QUERIES = {
+    "daily_sales": '''
+        SELECT business_date as date, SUM(order_count) as orders, ROUND(SUM(revenue), 2) as revenue
+        FROM sales_rollup_orders
+        GROUP BY business_date
+        ORDER BY business_date
+    ''',
+    "monthly_sales": '''
+        SELECT substr(business_date, 1, 7) as month, SUM(order_count) as orders, ROUND(SUM(revenue), 2) as revenue
+        FROM sales_rollup_orders
+        GROUP BY month
+        ORDER BY month
+    ''',
+    "product_sales": '''
+        SELECT p.name as product_name, p.category, SUM(r.quantity) as quantity_sold, ROUND(SUM(r.revenue), 2) as revenue
+        FROM sales_rollup_items r
+        JOIN products p ON r.product_id = p.id
+        GROUP BY r.product_id
+        ORDER BY revenue DESC
+    ''',
+    "staff_performance": '''
+        SELECT u.username as server, u.role, SUM(r.order_count) as total_orders,
+               ROUND(SUM(r.revenue), 2) as total_sales, ROUND(SUM(r.revenue) / SUM(r.order_count), 2) as average_order
+        FROM sales_rollup_orders r
+        JOIN users u ON r.user_id = u.id
+        GROUP BY r.user_id
+        ORDER BY total_sales DESC
+    ''',
+    "order_history": '''
+        SELECT
+            o.id as order_id, o.closed_at as timestamp, t.name as table_name, u.username as server,
+            p.name as product_name, p.category, oi.quantity,
+            oi.price_at_time as price
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        JOIN products p ON oi.product_id = p.id
+        JOIN users u ON o.user_id = u.id
+        JOIN tables t ON o.table_id = t.id
+        WHERE o.status = 'closed'
+        ORDER BY o.closed_at DESC
+    ''',
+}
+
+# Incremental snapshots stop this many seconds behind the clock (see iter_closed_orders_since)
+SNAPSHOT_SETTLE_SECONDS = 10
+
+# Column order of the row tuples yielded by AnalyticsManager.iter_closed_orders_since
+SNAPSHOT_COLUMNS = {
+    "orders": ["order_id", "business_date", "created_at", "closed_at", "table_id", "table_name",
+               "user_id", "server", "item_count", "total_amount"],
+    "order_items": ["item_id", "order_id", "business_date", "closed_at", "product_id", "product_name",
+                    "category", "quantity", "price", "line_total"],
+}
+
+def cached_report(method):
+    """Serves an AnalyticsManager report from its ReportCache until the underlying data changes."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._cached_call(method, args, kwargs)
+    return wrapper
 
 class AnalyticsManager(BaseManager):
     """
     Manages all complex queries for analytics, reporting, and live statistics.
+    Sales figures are read from the pre-aggregated rollup tables maintained by
+    OrderManager.close_order, and period filters compare business dates against
+    half-open [start, end) ranges so SQLite can use an index range scan.
+    Historical reports are memoized in a ReportCache that is invalidated by the
+    change feed whenever an order closes or reference data changes. The
+    business-day cutoff hour is kept in memory until the setting changes.
     """
+    def __init__(self, pool, events=None, cache_size: int = 64):
+        super().__init__(pool, events)
+        self.cache = ReportCache(cache_size)
+        self._cutoff_hour = None
+        self._cutoff_generation = 0
+        if events is not None:
+            for topic in (ORDERS, TABLES, CATALOG, USERS, EXTERNAL):
+                events.subscribe(topic, self._on_data_changed)
+            events.subscribe(SETTINGS, self._on_setting_changed)
+
+    def _on_data_changed(self, topic: str, action: str = None, **payload):
+        """Bumps the report data version unless the change only touched open orders."""
+        if topic == EXTERNAL:
+            self._forget_cutoff_hour() # Another terminal may have changed it
+        if topic == ORDERS and action in OPEN_ORDER_ACTIONS:
+            return
+        self.cache.invalidate()
+
+    def _on_setting_changed(self, topic: str, action: str = None, key: str = None, **payload):
+        """Drops the cached cutoff hour when that setting is saved."""
+        if key == CUTOFF_SETTING_KEY:
+            self._forget_cutoff_hour()
+
+    def _forget_cutoff_hour(self):
+        """Makes the next report re-read the cutoff hour."""
+        self._cutoff_generation += 1
+        self._cutoff_hour = None
+
+    def _business_today(self, cursor=None):
+        """
+        Returns today's business date from the cached cutoff hour, reading the
+        setting (on the given cursor, or a borrowed reader) only when it is unknown.
+        """
+        cutoff_hour = self._cutoff_hour
+        if cutoff_hour is None:
+            generation = self._cutoff_generation
+            if cursor is None:
+                with self._read() as cursor:
+                    cutoff_hour = get_cutoff_hour(cursor)
+            else:
+                cutoff_hour = get_cutoff_hour(cursor)
+            if generation == self._cutoff_generation: # Not changed while we were reading it
+                self._cutoff_hour = cutoff_hour
+        return current_business_date(cutoff_hour)
+
+    def _cached_call(self, method, args: tuple, kwargs: dict):
+        """
+        Returns a cached result for (method, args, data version, business date)
+        or runs the query and caches it. The business date is part of the key
+        so named periods such as 'Today' roll over at the cutoff hour.
+        """
+        version = self.cache.version
+        today = self._business_today()
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), version, today)
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        result = method(self, *args, **kwargs)
+        self.cache.put(key, result, version)
+        return result
+
+    def get_cache_stats(self) -> dict:
+        """Returns the report cache's hit/miss counters."""
+        return self.cache.stats()
+
+    def _period_bounds(self, cursor, period: str) -> tuple[str | None, str | None]:
+        """Resolves a named period into [start, end) business-date bounds."""
+        return period_range(period, self._business_today(cursor))
 
     # --- Live Stats Dashboard Methods ---
     def get_live_stats(self) -> dict:
         """Gathers a dictionary of various live statistics for the dashboard."""
-        stats = {}
-        
-        # Today's revenue
-        self.cursor.execute("""
-            SELECT COALESCE(SUM(total_amount), 0) as today_sales
-            FROM orders 
-            WHERE status = 'closed' AND DATE(closed_at) = DATE('now')
-        """)
-        stats['today_revenue'] = self.cursor.fetchone()['today_sales']
-
-        # Active orders
-        self.cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'open'")
-        stats['active_orders'] = self.cursor.fetchone()['count']
-
-        # Tables status
-        self.cursor.execute("SELECT COUNT(*) FROM tables")
-        stats['total_tables'] = self.cursor.fetchone()[0]
-        self.cursor.execute("SELECT COUNT(DISTINCT table_id) FROM orders WHERE status = 'open'")
-        stats['occupied_tables'] = self.cursor.fetchone()[0]
-
-        # Average order value today
-        self.cursor.execute("""
-            SELECT AVG(total_amount) as avg_value
-            FROM orders
-            WHERE status = 'closed' AND DATE(closed_at) = DATE('now')
-        """)
-        result = self.cursor.fetchone()
-        stats['avg_order_value'] = result['avg_value'] if result and result['avg_value'] is not None else 0
-
-        # Top product today
-        self.cursor.execute("""
-            SELECT p.name
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.status = 'closed' AND DATE(o.closed_at) = DATE('now')
-            GROUP BY p.id, p.name
-            ORDER BY SUM(oi.quantity) DESC
-            LIMIT 1
-        """)
-        result = self.cursor.fetchone()
-        stats['top_product'] = result['name'] if result else "N/A"
-
-        # Active staff (simplified count)
-        self.cursor.execute("SELECT COUNT(*) as count FROM users")
-        stats['active_staff'] = self.cursor.fetchone()['count']
-
-        # Hourly sales for today
-        self.cursor.execute("""
-            SELECT strftime('%H', closed_at) as hour, SUM(total_amount) as amount
-            FROM orders
-            WHERE status = 'closed' AND DATE(closed_at) = DATE('now')
-            GROUP BY hour ORDER BY hour
-        """)
-        stats['hourly_sales'] = {f"{int(row['hour']):02d}:00": row['amount'] for row in self.cursor.fetchall()}
-
-        # Category distribution today
-        self.cursor.execute("""
-            SELECT p.category, SUM(oi.quantity * oi.price_at_time) as amount
-            FROM order_items oi
-            JOIN products p ON oi.product_id = p.id
-            JOIN orders o ON oi.order_id = o.id
-            WHERE o.status = 'closed' AND DATE(o.closed_at) = DATE('now')
-            GROUP BY p.category
-        """)
-        stats['category_distribution'] = {row['category']: row['amount'] for row in self.cursor.fetchall()}
-        
-        return stats
+        with self._read() as cursor:
+            stats = {}
+            today = self._period_bounds(cursor, "Today")
+
+            # Today's revenue and average order value
+            cursor.execute("""
+                SELECT COALESCE(SUM(revenue), 0) as today_sales, COALESCE(SUM(order_count), 0) as orders
+                FROM sales_rollup_orders
+                WHERE business_date >= ? AND business_date < ?
+            """, today)
+            result = cursor.fetchone()
+            stats['today_revenue'] = result['today_sales']
+            stats['avg_order_value'] = result['today_sales'] / result['orders'] if result['orders'] else 0
+
+            # Active orders
+            cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'open'")
+            stats['active_orders'] = cursor.fetchone()['count']
+
+            # Tables status
+            cursor.execute("SELECT COUNT(*) FROM tables")
+            stats['total_tables'] = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(DISTINCT table_id) FROM orders WHERE status = 'open'")
+            stats['occupied_tables'] = cursor.fetchone()[0]
+
+            # Top product today
+            cursor.execute("""
+                SELECT p.name
+                FROM sales_rollup_items r
+                JOIN products p ON r.product_id = p.id
+                WHERE r.business_date >= ? AND r.business_date < ?
+                GROUP BY r.product_id
+                ORDER BY SUM(r.quantity) DESC
+                LIMIT 1
+            """, today)
+            result = cursor.fetchone()
+            stats['top_product'] = result['name'] if result else "N/A"
+
+            # Active staff (simplified count)
+            cursor.execute("SELECT COUNT(*) as count FROM users")
+            stats['active_staff'] = cursor.fetchone()['count']
+
+            # Hourly sales for today
+            cursor.execute("""
+                SELECT hour, SUM(revenue) as amount
+                FROM sales_rollup_orders
+                WHERE business_date >= ? AND business_date < ?
+                GROUP BY hour ORDER BY hour
+            """, today)
+            stats['hourly_sales'] = {f"{row['hour']:02d}:00": row['amount'] for row in cursor.fetchall()}
+
+            # Category distribution today
+            stats['category_distribution'] = self._sales_by_category(cursor, today)
+
+            return stats
+
+    def _sales_by_category(self, cursor, bounds: tuple) -> dict:
+        """Sums rolled-up revenue per category within [start, end) business dates."""
+        cursor.execute("""
+            SELECT category, SUM(revenue) as amount
+            FROM sales_rollup_items
+            WHERE business_date >= ? AND business_date < ?
+            GROUP BY category
+        """, bounds)
+        return {row['category']: row['amount'] for row in cursor.fetchall()}
 
     # --- Historical Reporting Methods ---
+    @cached_report
     def get_daily_sales_summary(self) -> dict:
         """Gets a comprehensive summary for the daily sales report."""
-        self.cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT o.id) as total_orders,
-                COALESCE(SUM(o.total_amount), 0) as total_sales,
-                COALESCE(AVG(o.total_amount), 0) as average_order
-            FROM orders o
-            WHERE o.status = 'closed' AND DATE(o.closed_at) = DATE('now')
-        """)
-        summary = dict(self.cursor.fetchone())
-        
-        self.cursor.execute("""
-            SELECT p.category, SUM(oi.quantity * oi.price_at_time) as amount
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.status = 'closed' AND DATE(o.closed_at) = DATE('now')
-            GROUP BY p.category
-        """)
-        summary['sales_by_category'] = {row['category']: row['amount'] for row in self.cursor.fetchall()}
-        return summary
+        with self._read() as cursor:
+            today = self._period_bounds(cursor, "Today")
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(order_count), 0) as total_orders,
+                    COALESCE(SUM(revenue), 0) as total_sales
+                FROM sales_rollup_orders
+                WHERE business_date >= ? AND business_date < ?
+            """, today)
+            summary = dict(cursor.fetchone())
+            summary['average_order'] = summary['total_sales'] / summary['total_orders'] if summary['total_orders'] else 0
+            summary['sales_by_category'] = self._sales_by_category(cursor, today)
+            return summary
 
+    @cached_report
     def get_sales_by_period(self, period: str) -> dict:
         """Gets aggregated sales data for a specific period (e.g., 'Last 7 Days')."""
-        query_map = {
-            "Last 7 Days": " AND closed_at >= DATE('now', '-7 days')",
-            "Last 30 Days": " AND closed_at >= DATE('now', '-30 days')",
-            "This Month": " AND strftime('%Y-%m', closed_at) = strftime('%Y-%m', 'now')",
-            "Last Month": " AND strftime('%Y-%m', closed_at) = strftime('%Y-%m', 'now', '-1 month')"
-        }
-        
-        query = f"""
-            SELECT DATE(closed_at) as date, SUM(total_amount) as amount
-            FROM orders
-            WHERE status = 'closed' {query_map.get(period, '')}
-            GROUP BY DATE(closed_at)
-            ORDER BY date
-        """
-        self.cursor.execute(query)
-        return {row['date']: row['amount'] for row in self.cursor.fetchall()}
+        with self._read() as cursor:
+            start, end = self._period_bounds(cursor, period)
+            query = "SELECT business_date as date, SUM(revenue) as amount FROM sales_rollup_orders"
+            params = ()
+            if start is not None:
+                query += " WHERE business_date >= ? AND business_date < ?"
+                params = (start, end)
+            query += " GROUP BY business_date ORDER BY business_date"
+
+            cursor.execute(query, params)
+            return {row['date']: row['amount'] for row in cursor.fetchall()}
 
+    @cached_report
     def get_top_products(self, limit: int = 10) -> list:
         """Gets the best-selling products by quantity sold."""
-        self.cursor.execute('''
-            SELECT 
-                p.name,
-                SUM(oi.quantity) as quantity_sold,
-                SUM(oi.quantity * oi.price_at_time) as revenue
-            FROM order_items oi
-            JOIN products p ON oi.product_id = p.id
-            JOIN orders o ON oi.order_id = o.id
-            WHERE o.status = 'closed'
-            GROUP BY p.id, p.name
-            ORDER BY quantity_sold DESC
-            LIMIT ?
-        ''', (limit,))
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT
+                    p.name,
+                    SUM(r.quantity) as quantity_sold,
+                    SUM(r.revenue) as revenue
+                FROM sales_rollup_items r
+                JOIN products p ON r.product_id = p.id
+                GROUP BY p.id, p.name
+                ORDER BY quantity_sold DESC
+                LIMIT ?
+            ''', (limit,))
+            return cursor.fetchall()
 
+    @cached_report
     def get_staff_performance(self) -> list:
         """Gets performance metrics for each staff member."""
-        self.cursor.execute('''
-            SELECT 
-                u.username, u.role,
-                COUNT(DISTINCT o.id) as total_orders,
-                COALESCE(SUM(o.total_amount), 0) as total_sales,
-                COALESCE(AVG(o.total_amount), 0) as average_order
-            FROM users u
-            LEFT JOIN orders o ON u.id = o.user_id AND o.status = 'closed'
-            GROUP BY u.id, u.username, u.role
-            ORDER BY total_sales DESC
-        ''')
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT
+                    u.username, u.role,
+                    COALESCE(r.total_orders, 0) as total_orders,
+                    COALESCE(r.total_sales, 0) as total_sales,
+                    COALESCE(r.total_sales / r.total_orders, 0) as average_order
+                FROM users u
+                LEFT JOIN (
+                    SELECT user_id, SUM(order_count) as total_orders, SUM(revenue) as total_sales
+                    FROM sales_rollup_orders
+                    GROUP BY user_id
+                ) r ON u.id = r.user_id
+                ORDER BY total_sales DESC
+            ''')
+            return cursor.fetchall()
 
+    @cached_report
     def get_order_history(self, date_filter: str = "All Time") -> list:
         """Gets a filterable history of all closed orders."""
-        query = '''
-            SELECT 
-                o.id, o.closed_at, o.total_amount as total,
-                t.name as table_name, u.username as user_name
-            FROM orders o
-            JOIN tables t ON o.table_id = t.id
-            JOIN users u ON o.user_id = u.id
-            WHERE o.status = 'closed'
-        '''
-        
-        filter_map = {
-            "Today": " AND DATE(o.closed_at) = DATE('now')",
-            "Last 7 Days": " AND o.closed_at >= DATE('now', '-7 days')",
-            "Last 30 Days": " AND o.closed_at >= DATE('now', '-30 days')"
-        }
-        query += filter_map.get(date_filter, "")
-        query += " ORDER BY o.closed_at DESC"
-        
-        self.cursor.execute(query)
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            query = '''
+                SELECT
+                    o.id, o.closed_at, o.total_amount as total,
+                    t.name as table_name, u.username as user_name
+                FROM orders o
+                JOIN tables t ON o.table_id = t.id
+                JOIN users u ON o.user_id = u.id
+                WHERE o.status = 'closed'
+            '''
+            params = ()
+            start, end = self._period_bounds(cursor, date_filter)
+            if start is not None:
+                query += " AND o.business_date >= ? AND o.business_date < ?"
+                params = (start, end)
+            query += " ORDER BY o.closed_at DESC"
+
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    @cached_report
+    def get_order_history_page(self, date_filter: str = "All Time", after: tuple = None, limit: int = 100) -> tuple[list, tuple | None]:
+        """
+        Gets one page of closed orders, newest first.
+        Pages are keyed on (closed_at, id) instead of OFFSET, so every page is
+        an index range scan no matter how deep the user scrolls, and orders
+        closed meanwhile never shift rows between pages.
+
+        Args:
+            date_filter: A named period, as for get_order_history.
+            after: The cursor returned with the previous page, or None for the first page.
+            limit: Maximum number of orders in the page.
+
+        Returns:
+            (orders, cursor) - cursor is None once there are no more orders.
+        """
+        with self._read() as cursor:
+            query = '''
+                SELECT
+                    o.id, o.closed_at, o.total_amount as total,
+                    t.name as table_name, u.username as user_name
+                FROM orders o
+                JOIN tables t ON o.table_id = t.id
+                JOIN users u ON o.user_id = u.id
+                WHERE o.status = 'closed'
+            '''
+            params = []
+            start, end = self._period_bounds(cursor, date_filter)
+            if start is not None:
+                query += " AND o.business_date >= ? AND o.business_date < ?"
+                params += [start, end]
+            if after is not None:
+                query += " AND (o.closed_at, o.id) < (?, ?)"
+                params += list(after)
+            query += " ORDER BY o.closed_at DESC, o.id DESC LIMIT ?"
+            params.append(limit + 1) # One extra row tells us whether another page exists
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1]['closed_at'], rows[-1]['id'])
 
     # --- Data Export Methods ---
+    def get_export_columns(self, report: str) -> list[str]:
+        """Returns the column names of an exportable report without running it."""
+        with self._read() as cursor:
+            cursor.execute(f"SELECT * FROM ({EXPORT_QUERIES[report]}) LIMIT 0")
+            return [column[0] for column in cursor.description]
+
+    @cached_report
+    def count_export_rows(self, report: str) -> int:
+        """Counts the rows an export will write, for progress reporting."""
+        with self._read() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM ({EXPORT_QUERIES[report]})")
+            return cursor.fetchone()[0]
+
+    def iter_export_rows(self, report: str, batch_size: int = 5000):
+        """
+        Streams an exportable report as lists of row tuples, fetchmany() batch
+        by batch, so memory stays bounded however long the history is. The
+        read connection is held until the generator is exhausted or closed.
+
+        Args:
+            report: A key of EXPORT_QUERIES.
+            batch_size: Rows per batch.
+        """
+        with self._read() as cursor:
+            cursor.execute(EXPORT_QUERIES[report])
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield [tuple(row) for row in batch]
+
+    def iter_closed_orders_since(self, after: tuple = None, batch_size: int = 5000, settle_seconds: int = SNAPSHOT_SETTLE_SECONDS):
+        """
+        Streams closed orders and their line items oldest first, starting after
+        a (closed_at, id) cursor, for incremental snapshots. Each batch is an
+        index range scan on (status, closed_at), so resuming from the last
+        snapshot costs only the new orders. All batches run inside one read
+        transaction and so come from one consistent view of the database.
+
+        closed_at only has one-second resolution, so an order closed by another
+        terminal in the same second as the cursor, but committed after this
+        read began, would sort before the cursor and never be picked up. The
+        scan therefore stops at orders closed settle_seconds ago; anything
+        newer is left for the next run.
+
+        Args:
+            after: The cursor returned with the last batch of a previous run, or None for everything.
+            batch_size: Orders per batch.
+            settle_seconds: How far behind the current time the scan stops.
+
+        Yields:
+            (orders, items, cursor) - lists of row tuples (see SNAPSHOT_COLUMNS)
+            and the (closed_at, id) of the batch's last order.
+        """
+        with self._read() as cursor:
+            cursor.execute("BEGIN")
+            try:
+                # closed_at is stored in UTC, as datetime('now') returns it
+                cursor.execute("SELECT datetime('now', ?)", (f"-{int(settle_seconds)} seconds",))
+                settled = cursor.fetchone()[0]
+                while True:
+                    params = [settled]
+                    query = '''
+                        SELECT
+                            o.id, o.business_date, o.created_at, o.closed_at,
+                            o.table_id, t.name, o.user_id, u.username,
+                            (SELECT COUNT(*) FROM order_items oi WHERE oi.order_id = o.id),
+                            o.total_amount
+                        FROM orders o
+                        LEFT JOIN tables t ON o.table_id = t.id
+                        LEFT JOIN users u ON o.user_id = u.id
+                        WHERE o.status = 'closed' AND o.closed_at < ?
+                    '''
+                    if after is not None:
+                        query += " AND (o.closed_at, o.id) > (?, ?)"
+                        params += list(after)
+                    query += " ORDER BY o.closed_at, o.id LIMIT ?"
+                    params.append(batch_size)
+                    cursor.execute(query, params)
+                    orders = [tuple(row) for row in cursor.fetchall()]
+                    if not orders:
+                        break
+
+                    last = (orders[-1][3], orders[-1][0])
+                    query = '''
+                        SELECT
+                            oi.id, oi.order_id, o.business_date, o.closed_at,
+                            oi.product_id, p.name, p.category, oi.quantity,
+                            oi.price_at_time, oi.quantity * oi.price_at_time
+                        FROM orders o
+                        JOIN order_items oi ON oi.order_id = o.id
+                        LEFT JOIN products p ON oi.product_id = p.id
+                        WHERE o.status = 'closed' AND (o.closed_at, o.id) <= (?, ?)
+                    '''
+                    params = list(last)
+                    if after is not None:
+                        query += " AND (o.closed_at, o.id) > (?, ?)"
+                        params += list(after)
+                    query += " ORDER BY o.closed_at, o.id, oi.id"
+                    cursor.execute(query, params)
+                    items = [tuple(row) for row in cursor.fetchall()]
+
+                    yield orders, items, last
+                    after = last
+            finally:
+                cursor.execute("COMMIT") # Read-only, so this just ends the snapshot
+
     def get_all_sales_data_for_export(self) -> list:
         """Gets a comprehensive flat list of all sales data for export."""
-        self.cursor.execute('''
-            SELECT
-                o.closed_at as timestamp, t.name as table_name, u.username as server,
-                p.name as product_name, p.category, oi.quantity,
-                oi.price_at_time as price
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            JOIN products p ON oi.product_id = p.id
-            JOIN users u ON o.user_id = u.id
-            JOIN tables t ON o.table_id = t.id
-            WHERE o.status = 'closed'
-            ORDER BY o.closed_at DESC
-        ''')
-        return [dict(row) for row in self.cursor.fetchall()]
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT
+                    o.closed_at as timestamp, t.name as table_name, u.username as server,
+                    p.name as product_name, p.category, oi.quantity,
+                    oi.price_at_time as price
+                FROM order_items oi
+                JOIN orders o ON oi.order_id = o.id
+                JOIN products p ON oi.product_id = p.id
+                JOIN users u ON o.user_id = u.id
+                JOIN tables t ON o.table_id = t.id
+                WHERE o.status = 'closed'
+                ORDER BY o.closed_at DESC
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
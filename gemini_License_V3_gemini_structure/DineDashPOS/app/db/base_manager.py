@@ -1,17 +1,38 @@
-import sqlite3
+from contextlib import contextmanager
+from .connection_pool import ConnectionPool
+from .events import EventBus
 
 class BaseManager:
     """
     A base class for all database manager modules.
-    Its primary purpose is to hold a reference to the database connection object,
-    making it available to all manager classes that inherit from it.
+    Its primary purpose is to hold a reference to the connection pool and to
+    hand out cursors per call, so managers never share a connection or cursor
+    across threads. It also publishes change events once writes commit.
     """
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, pool: ConnectionPool, events: EventBus = None):
         """
-        Initializes the manager with the active database connection.
+        Initializes the manager with the shared connection pool.
 
         Args:
-            connection: The sqlite3 connection object.
+            pool: The ConnectionPool owned by the DatabaseManager.
+            events: The EventBus that change notifications are published to.
         """
-        self.conn = connection
-        self.cursor = connection.cursor()
+        self.pool = pool
+        self.events = events
+
+    @contextmanager
+    def _read(self):
+        """Yields a cursor on a borrowed read-only connection."""
+        with self.pool.reader() as conn:
+            yield conn.cursor()
+
+    @contextmanager
+    def _write(self):
+        """Yields a cursor on the writer connection inside a transaction."""
+        with self.pool.transaction() as conn:
+            yield conn.cursor()
+
+    def _publish(self, topic: str, **payload):
+        """Publishes a change event after the surrounding transaction commits."""
+        if self.events is not None:
+            self.pool.call_after_commit(lambda: self.events.publish(topic, **payload))
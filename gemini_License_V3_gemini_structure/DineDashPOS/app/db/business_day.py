@@ -0,0 +1,58 @@
+"""
+Business-day helpers shared by the order and analytics managers.
+
+A business day starts at a configurable cutoff hour (default 04:00 local time),
+so a sale rung up at 01:30 after a late service still counts towards the
+previous day. Orders store their business date as an ISO 'YYYY-MM-DD' string,
+which lets every period filter be written as an indexable half-open range.
+"""
+import sqlite3
+from datetime import date, datetime, timedelta
+
+DEFAULT_CUTOFF_HOUR = 4
+CUTOFF_SETTING_KEY = "business_day_cutoff_hour"
+
+
+def get_cutoff_hour(cursor: sqlite3.Cursor) -> int:
+    """Reads the configured cutoff hour from the settings table."""
+    cursor.execute("SELECT value FROM settings WHERE key=?", (CUTOFF_SETTING_KEY,))
+    row = cursor.fetchone()
+    try:
+        return int(row[0]) if row else DEFAULT_CUTOFF_HOUR
+    except (TypeError, ValueError):
+        return DEFAULT_CUTOFF_HOUR
+
+
+def business_date_for(moment: datetime, cutoff_hour: int) -> date:
+    """Returns the business date a local timestamp belongs to."""
+    return (moment - timedelta(hours=cutoff_hour)).date()
+
+
+def current_business_date(cutoff_hour: int) -> date:
+    """Returns today's business date in local time."""
+    return business_date_for(datetime.now(), cutoff_hour)
+
+
+def _add_months(day: date, months: int) -> date:
+    """Returns the first day of the month `months` away from `day`'s month."""
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def period_range(period: str, today: date) -> tuple[str | None, str | None]:
+    """
+    Converts a named reporting period into a half-open [start, end) pair of
+    ISO business dates. Unknown periods (e.g. 'All Time') return (None, None).
+    """
+    tomorrow = today + timedelta(days=1)
+    ranges = {
+        "Today": (today, tomorrow),
+        "Last 7 Days": (today - timedelta(days=7), tomorrow),
+        "Last 30 Days": (today - timedelta(days=30), tomorrow),
+        "This Month": (_add_months(today, 0), _add_months(today, 1)),
+        "Last Month": (_add_months(today, -1), _add_months(today, 0)),
+    }
+    if period not in ranges:
+        return None, None
+    start, end = ranges[period]
+    return start.isoformat(), end.isoformat()
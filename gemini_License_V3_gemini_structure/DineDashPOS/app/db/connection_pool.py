@@ -0,0 +1,143 @@
+import sqlite3
+import threading
+import queue
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+class ConnectionPool:
+    """
+    A small SQLite connection pool built around WAL journaling.
+    It keeps one dedicated writer connection (serialized by a lock) and a set of
+    read-only reader connections that managers borrow for the duration of a call,
+    so long-running reports never block order entry.
+    """
+    def __init__(self, db_path: str, readers: int = 4, busy_timeout_ms: int = 5000):
+        """
+        Opens the writer connection, switches the database to WAL mode and
+        opens the reader connections.
+
+        Args:
+            db_path: Full path to the SQLite database file.
+            readers: Number of read-only connections to keep in the pool.
+            busy_timeout_ms: How long a connection waits on a lock before failing.
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.reader_count = max(1, readers)
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._after_commit = []
+        self._data_version = None
+        # Time spent waiting for the write lock (in-process and SQLite's), for diagnostics
+        self.lock_wait_seconds = 0.0
+        self.transactions = 0
+
+        # The writer manages transactions explicitly (see transaction()).
+        self._writer = self._connect(db_path, isolation_level=None)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+
+        self._readers = queue.Queue()
+        self._all_readers = []
+        # as_uri() percent-encodes '?', '#' and '%', which a raw file: URI would misread
+        reader_uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        for _ in range(self.reader_count):
+            reader = self._connect(reader_uri, uri=True)
+            self._all_readers.append(reader)
+            self._readers.put(reader)
+
+    def _connect(self, target: str, **kwargs) -> sqlite3.Connection:
+        """Opens a connection configured the same way for every pool member."""
+        conn = sqlite3.connect(target, timeout=self.busy_timeout_ms / 1000, check_same_thread=False, **kwargs)
+        conn.row_factory = sqlite3.Row # Allows accessing columns by name
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrows a read-only connection and returns it to the pool afterwards."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a block on the writer connection inside a single transaction.
+        Nested calls from the same thread join the outermost transaction, which
+        is the only one that commits (or rolls back on error).
+        """
+        started = time.perf_counter()
+        with self._write_lock:
+            outermost = self._write_depth == 0
+            if outermost:
+                # IMMEDIATE takes the write lock up-front, avoiding lock upgrades
+                # that could deadlock against another terminal.
+                self._writer.execute("BEGIN IMMEDIATE")
+                self.lock_wait_seconds += time.perf_counter() - started
+                self.transactions += 1
+            self._write_depth += 1
+            try:
+                yield self._writer
+            except BaseException:
+                self._write_depth -= 1
+                if outermost:
+                    self._writer.rollback()
+                    self._after_commit.clear()
+                raise
+            self._write_depth -= 1
+            if not outermost:
+                return
+            try:
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                self._after_commit.clear()
+                raise
+            callbacks, self._after_commit = self._after_commit, []
+        # Run hooks outside the write lock so subscribers can query freely.
+        for callback in callbacks:
+            callback()
+
+    def call_after_commit(self, callback):
+        """
+        Defers a callback until the current transaction commits (it is dropped
+        on rollback). Outside a transaction the callback runs immediately.
+        """
+        with self._write_lock:
+            if self._write_depth > 0:
+                self._after_commit.append(callback)
+                return
+        callback()
+
+    def has_external_changes(self) -> bool:
+        """
+        Reports whether another process has committed since the last check.
+        Uses PRAGMA data_version on the writer, which ignores this process's
+        own commits; skips the check (returns False) while a write is running.
+        """
+        if not self._write_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._writer is None:
+                return False
+            version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._write_lock.release()
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return changed
+
+    def close(self):
+        """Closes the writer and every reader connection."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        for conn in self._all_readers:
+            conn.close()
+        self._all_readers = []
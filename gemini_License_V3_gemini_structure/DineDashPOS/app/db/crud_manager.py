@@ -1,145 +1,231 @@
 from .base_manager import BaseManager
+from . import events
 import sqlite3
+import threading
 
 class CrudManager(BaseManager):
     """
     Manages all basic Create, Read, Update, and Delete (CRUD) operations
     for the database entities like users, products, and tables.
+    Products are served from an in-memory catalog cache that is loaded with a
+    single query and invalidated whenever a product write commits.
     """
+    def __init__(self, pool, events=None):
+        super().__init__(pool, events)
+        self._catalog_lock = threading.Lock()
+        self._catalog = None
+        self._catalog_generation = 0
 
     # --- Settings Methods ---
     def get_setting(self, key: str) -> str | None:
         """Gets a setting value by its key."""
-        self.cursor.execute("SELECT value FROM settings WHERE key=?", (key,))
-        result = self.cursor.fetchone()
+        with self._read() as cursor:
+            cursor.execute("SELECT value FROM settings WHERE key=?", (key,))
+            result = cursor.fetchone()
         return result['value'] if result else None
 
     def set_setting(self, key: str, value: str):
         """Sets or updates a setting value."""
-        self.cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+            self._publish(events.SETTINGS, action="updated", key=key)
 
     # --- User Methods ---
     def get_users(self) -> list:
         """Gets all users from the database."""
-        self.cursor.execute("SELECT id, username, role FROM users ORDER BY role DESC, username")
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute("SELECT id, username, role FROM users ORDER BY role DESC, username")
+            return cursor.fetchall()
 
     def get_user_by_name(self, username: str) -> sqlite3.Row | None:
         """Gets a single user by their username."""
-        self.cursor.execute("SELECT id, username, role FROM users WHERE username=?", (username,))
-        return self.cursor.fetchone()
+        with self._read() as cursor:
+            cursor.execute("SELECT id, username, role FROM users WHERE username=?", (username,))
+            return cursor.fetchone()
 
     def add_user(self, username: str, role: str) -> bool:
         """Adds a new user to the database."""
         try:
-            self.cursor.execute("INSERT INTO users (username, role) VALUES (?, ?)", (username, role))
-            self.conn.commit()
+            with self._write() as cursor:
+                cursor.execute("INSERT INTO users (username, role) VALUES (?, ?)", (username, role))
+                self._publish(events.USERS, action="added")
             return True
         except sqlite3.IntegrityError: # Handles case where username is not unique
             return False
 
     def delete_user(self, user_id: int):
         """Deletes a user by their ID."""
-        self.cursor.execute("DELETE FROM users WHERE id=?", (user_id,))
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute("DELETE FROM users WHERE id=?", (user_id,))
+            self._publish(events.USERS, action="deleted")
+
+    # --- Product Catalog Cache ---
+    def _get_catalog(self) -> dict:
+        """Returns the cached catalog, loading it from the database if needed."""
+        with self._catalog_lock:
+            if self._catalog is not None:
+                return self._catalog
+            generation = self._catalog_generation
+
+        with self._read() as cursor:
+            cursor.execute("SELECT id, name, price, category, image FROM products ORDER BY category, name")
+            products = [dict(row) for row in cursor.fetchall()]
+
+        by_category = {}
+        for product in products:
+            by_category.setdefault(product['category'], []).append(product)
+        catalog = {
+            'products': products,
+            'by_id': {product['id']: product for product in products},
+            'by_category': by_category,
+            'categories': sorted(by_category),
+        }
+
+        with self._catalog_lock:
+            # Don't cache a snapshot that a concurrent write has already made stale
+            if generation == self._catalog_generation:
+                self._catalog = catalog
+        return catalog
+
+    def invalidate_catalog(self):
+        """Drops the cached catalog so the next read reloads it."""
+        with self._catalog_lock:
+            self._catalog = None
+            self._catalog_generation += 1
+
+    def _catalog_changed(self, action: str, product_id: int):
+        """Invalidates the cache and notifies subscribers once the write commits."""
+        self.pool.call_after_commit(self.invalidate_catalog)
+        self._publish(events.CATALOG, action=action, product_id=product_id)
 
     # --- Product Methods ---
-    def get_products(self) -> list:
-        """Gets all products from the database."""
-        self.cursor.execute("SELECT id, name, price, category, image FROM products ORDER BY category, name")
-        return self.cursor.fetchall()
+    def get_products(self) -> list[dict]:
+        """Gets all products, ordered by category and name."""
+        return list(self._get_catalog()['products'])
+
+    def get_product(self, product_id: int) -> dict | None:
+        """Gets a single product by its ID."""
+        return self._get_catalog()['by_id'].get(product_id)
+
+    def get_products_by_category(self, category: str) -> list[dict]:
+        """Gets the products in one category, ordered by name."""
+        return list(self._get_catalog()['by_category'].get(category, []))
 
     def get_product_categories(self) -> list[str]:
         """Gets all unique product categories."""
-        self.cursor.execute("SELECT DISTINCT category FROM products ORDER BY category")
-        return [row[0] for row in self.cursor.fetchall()]
+        return list(self._get_catalog()['categories'])
 
     def add_product(self, name: str, price: float, category: str, image: str = None) -> int:
         """Adds a new product and initializes its inventory."""
-        self.cursor.execute(
-            "INSERT INTO products (name, price, category, image) VALUES (?, ?, ?, ?)",
-            (name, price, category, image)
-        )
-        product_id = self.cursor.lastrowid
-        self.cursor.execute(
-            "INSERT INTO inventory (product_id, stock_quantity, min_stock_level) VALUES (?, ?, ?)",
-            (product_id, 100, 20)
-        )
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute(
+                "INSERT INTO products (name, price, category, image) VALUES (?, ?, ?, ?)",
+                (name, price, category, image)
+            )
+            product_id = cursor.lastrowid
+            cursor.execute(
+                "INSERT INTO inventory (product_id, stock_quantity, min_stock_level) VALUES (?, ?, ?)",
+                (product_id, 100, 20)
+            )
+            self._catalog_changed("added", product_id)
         return product_id
 
     def update_product(self, product_id: int, name: str, price: float, category: str):
         """Updates an existing product's details."""
-        self.cursor.execute(
-            "UPDATE products SET name=?, price=?, category=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-            (name, price, category, product_id)
-        )
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute(
+                "UPDATE products SET name=?, price=?, category=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                (name, price, category, product_id)
+            )
+            self._catalog_changed("updated", product_id)
 
     def update_product_image(self, product_id: int, image_filename: str):
         """Updates only the image filename for a product."""
-        self.cursor.execute(
-            "UPDATE products SET image=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-            (image_filename, product_id)
-        )
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute(
+                "UPDATE products SET image=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                (image_filename, product_id)
+            )
+            self._catalog_changed("updated", product_id)
+
+    def set_product_images(self, images: dict[int, str]) -> int:
+        """
+        Updates the image filename of many products in a single transaction.
+
+        Args:
+            images: Maps product_id to its new image filename.
+        Returns:
+            The number of products updated.
+        """
+        with self._write() as cursor:
+            cursor.executemany(
+                "UPDATE products SET image=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
+                [(filename, product_id) for product_id, filename in images.items()]
+            )
+            updated = cursor.rowcount
+            self._catalog_changed("updated", None)
+        return updated
 
     def delete_product(self, product_id: int):
         """Deletes a product and its associated inventory record."""
-        self.cursor.execute("DELETE FROM inventory WHERE product_id=?", (product_id,))
-        self.cursor.execute("DELETE FROM products WHERE id=?", (product_id,))
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute("DELETE FROM inventory WHERE product_id=?", (product_id,))
+            cursor.execute("DELETE FROM products WHERE id=?", (product_id,))
+            self._catalog_changed("deleted", product_id)
 
     # --- Table Methods ---
     def get_all_tables_for_management(self) -> list:
         """Gets all tables with their status, intended for the settings screen."""
-        self.cursor.execute('''
-            SELECT t.id, t.name, t.capacity,
-                   CASE WHEN o.id IS NOT NULL THEN 'occupied' ELSE 'available' END as status
-            FROM tables t
-            LEFT JOIN orders o ON t.id = o.table_id AND o.status = 'open'
-            ORDER BY t.name
-        ''')
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT t.id, t.name, t.capacity,
+                       CASE WHEN o.id IS NOT NULL THEN 'occupied' ELSE 'available' END as status
+                FROM tables t
+                LEFT JOIN orders o ON t.id = o.table_id AND o.status = 'open'
+                ORDER BY t.name
+            ''')
+            return cursor.fetchall()
 
     def add_table(self, name: str, capacity: int) -> bool:
         """Adds a new table to the restaurant floor plan."""
         try:
-            self.cursor.execute("INSERT INTO tables (name, capacity) VALUES (?, ?)", (name, capacity))
-            self.conn.commit()
+            with self._write() as cursor:
+                cursor.execute("INSERT INTO tables (name, capacity) VALUES (?, ?)", (name, capacity))
+                self._publish(events.TABLES, action="added", table_id=cursor.lastrowid)
             return True
         except sqlite3.IntegrityError: # Handles case where table name is not unique
             return False
 
     def delete_table(self, table_id: int) -> bool:
         """Deletes a table, but only if it is not currently occupied."""
-        self.cursor.execute("SELECT COUNT(*) FROM orders WHERE table_id=? AND status='open'", (table_id,))
-        if self.cursor.fetchone()[0] > 0:
-            return False  # Cannot delete an occupied table
-        self.cursor.execute("DELETE FROM tables WHERE id=?", (table_id,))
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM orders WHERE table_id=? AND status='open'", (table_id,))
+            if cursor.fetchone()[0] > 0:
+                return False  # Cannot delete an occupied table
+            cursor.execute("DELETE FROM tables WHERE id=?", (table_id,))
+            self._publish(events.TABLES, action="deleted", table_id=table_id)
         return True
 
     # --- Feedback Methods ---
     def add_feedback(self, order_id: int, rating: int, comment: str = None):
         """Adds customer feedback for a given order."""
-        self.cursor.execute(
-            "INSERT INTO feedback (order_id, rating, comment) VALUES (?, ?, ?)",
-            (order_id, rating, comment)
-        )
-        self.conn.commit()
+        with self._write() as cursor:
+            cursor.execute(
+                "INSERT INTO feedback (order_id, rating, comment) VALUES (?, ?, ?)",
+                (order_id, rating, comment)
+            )
 
     def get_recent_feedback(self, limit: int = 10) -> list:
         """Gets the most recent customer feedback entries."""
-        self.cursor.execute('''
-            SELECT f.rating, f.comment, f.created_at,
-                   t.name as table_name, u.username as server
-            FROM feedback f
-            JOIN orders o ON f.order_id = o.id
-            JOIN tables t ON o.table_id = t.id
-            JOIN users u ON o.user_id = u.id
-            ORDER BY f.created_at DESC
-            LIMIT ?
-        ''', (limit,))
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT f.rating, f.comment, f.created_at,
+                       t.name as table_name, u.username as server
+                FROM feedback f
+                JOIN orders o ON f.order_id = o.id
+                JOIN tables t ON o.table_id = t.id
+                JOIN users u ON o.user_id = u.id
+                ORDER BY f.created_at DESC
+                LIMIT ?
+            ''', (limit,))
+            return cursor.fetchall()
@@ -1,47 +1,68 @@
-import sqlite3
 import os
+from .connection_pool import ConnectionPool
+from .events import EventBus, EXTERNAL
 from .setup_manager import SetupManager
 from .crud_manager import CrudManager
 from .order_manager import OrderManager
 from .analytics_manager import AnalyticsManager
+from .rollup_manager import RollupManager
+from .receipt_manager import ReceiptManager
 
 class DatabaseManager:
     """
     The main orchestrator for all database operations.
-    This class initializes the database connection and provides access to all
-    specialized manager modules (CRUD, Orders, Analytics).
+    This class initializes the connection pool and provides access to all
+    specialized manager modules (CRUD, Orders, Analytics, Rollups, Receipts).
     """
-    def __init__(self, db_name="restaurant_pos.db"):
+    def __init__(self, db_name="restaurant_pos.db", readers=4):
         """
-        Initializes the database connection and all manager modules.
-        
+        Initializes the connection pool and all manager modules.
+
         Args:
             db_name: The name of the SQLite database file.
+            readers: Number of read-only connections shared by the managers.
         """
         # Ensure the application data directory exists
         home_dir = os.path.expanduser("~")
         app_data_dir = os.path.join(home_dir, "DineDashPOS")
         os.makedirs(app_data_dir, exist_ok=True)
         db_path = os.path.join(app_data_dir, db_name)
-        
-        # Establish connection
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row # Allows accessing columns by name
-        
+
+        # Establish the pooled connections (one writer, several readers, WAL mode)
+        self.pool = ConnectionPool(db_path, readers=readers)
+
+        # Change feed that views subscribe to instead of polling
+        self.events = EventBus()
+
         # Initialize all specialized managers
-        self.setup = SetupManager(self.conn)
-        self.crud = CrudManager(self.conn)
-        self.orders = OrderManager(self.conn)
-        self.analytics = AnalyticsManager(self.conn)
-        
+        self.setup = SetupManager(self.pool, self.events)
+        self.crud = CrudManager(self.pool, self.events)
+        self.orders = OrderManager(self.pool, self.events)
+        self.analytics = AnalyticsManager(self.pool, self.events)
+        self.rollups = RollupManager(self.pool, self.events)
+        self.receipts = ReceiptManager(self.pool, self.events)
+
         # Run initial setup (creates tables and seeds data if needed)
         self.setup.initialize_database()
 
+    def poll_external_changes(self) -> bool:
+        """
+        Publishes an EXTERNAL event if another terminal has committed since the
+        last call. This is a single PRAGMA, so it is cheap enough to run often.
+        """
+        if self.pool and self.pool.has_external_changes():
+            # Another terminal may have edited the menu
+            self.crud.invalidate_catalog()
+            self.events.publish(EXTERNAL)
+            return True
+        return False
+
     def close(self):
-        """Closes the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Closes all pooled database connections."""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
 
     def __del__(self):
-        """Ensures the database connection is closed when the object is destroyed."""
+        """Ensures the database connections are closed when the object is destroyed."""
         self.close()
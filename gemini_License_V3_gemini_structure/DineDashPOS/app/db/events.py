@@ -0,0 +1,44 @@
+import threading
+
+# Topics published by the managers. Payloads are passed as keyword arguments.
+ORDERS = "orders"       # action='created'|'items'|'closed'|'rebuilt', order_id, table_id
+TABLES = "tables"       # action='added'|'deleted', table_id
+CATALOG = "catalog"     # action='added'|'updated'|'deleted', product_id (None for bulk updates)
+USERS = "users"         # action='added'|'deleted'
+SETTINGS = "settings"   # action='updated', key
+EXTERNAL = "external"   # another terminal committed to the database file
+
+class EventBus:
+    """
+    A minimal in-process publish/subscribe hub used as the database change feed.
+    Managers publish after their transaction commits; views subscribe so they
+    refresh only when relevant rows actually change instead of polling.
+    Callbacks run on the publishing thread.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, topic: str, callback):
+        """Registers a callback for a topic. Subscribing twice is a no-op."""
+        with self._lock:
+            callbacks = self._subscribers.setdefault(topic, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+    def unsubscribe(self, topic: str, callback):
+        """Removes a previously registered callback, if present."""
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic: str, **payload):
+        """Calls every subscriber of a topic; a failing subscriber does not stop the rest."""
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, []))
+        for callback in callbacks:
+            try:
+                callback(topic, **payload)
+            except Exception as e:
+                print(f"Error in '{topic}' event subscriber: {e}")
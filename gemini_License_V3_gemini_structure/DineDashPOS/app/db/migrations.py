@@ -0,0 +1,117 @@
+"""
+Ordered schema migrations for the DineDash database.
+
+Each migration is applied exactly once, in order, and the schema version is
+recorded in SQLite's `PRAGMA user_version`. A database that is already at
+LATEST_VERSION needs no DDL at all on startup.
+"""
+import sqlite3
+from .business_day import get_cutoff_hour
+from .rollup_manager import create_rollup_tables, rebuild_rollups
+from .receipt_manager import create_receipt_table
+
+
+def _has_column(cursor: sqlite3.Cursor, table: str, column: str) -> bool:
+    """Checks whether a table already has a column (keeps ALTERs idempotent)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def _add_column(cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+    """Adds a column only if it does not exist yet."""
+    if not _has_column(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _create_base_schema(cursor: sqlite3.Cursor):
+    """Creates the original seven POS tables (adopts databases created before migrations)."""
+    cursor.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, username TEXT NOT NULL UNIQUE, role TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, name TEXT, price REAL, category TEXT, image TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS tables (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, capacity INTEGER)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS orders (id INTEGER PRIMARY KEY, table_id INTEGER, user_id INTEGER, status TEXT, total_amount REAL, created_at TIMESTAMP, closed_at TIMESTAMP)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS order_items (id INTEGER PRIMARY KEY, order_id INTEGER, product_id INTEGER, quantity INTEGER, price_at_time REAL)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS inventory (id INTEGER PRIMARY KEY, product_id INTEGER UNIQUE, stock_quantity INTEGER, min_stock_level INTEGER)")
+
+
+def _add_audit_columns_and_feedback(cursor: sqlite3.Cursor):
+    """Adds the timestamp columns and feedback table the managers already query."""
+    _add_column(cursor, "products", "updated_at", "TIMESTAMP")
+    _add_column(cursor, "order_items", "created_at", "TIMESTAMP")
+    _add_column(cursor, "inventory", "last_updated", "TIMESTAMP")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback (
+            id INTEGER PRIMARY KEY, order_id INTEGER, rating INTEGER,
+            comment TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _create_hot_path_indexes(cursor: sqlite3.Cursor):
+    """Indexes backing table-status lookups, order editing and reports."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_closed_at ON orders (status, closed_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_table_status ON orders (table_id, status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order_product ON order_items (order_id, product_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_category_name ON products (category, name)")
+
+
+def _add_business_date(cursor: sqlite3.Cursor):
+    """Stores each closed order's business date and backfills existing history."""
+    _add_column(cursor, "orders", "business_date", "TEXT")
+    cutoff_hour = get_cutoff_hour(cursor)
+    # closed_at is stored in UTC (CURRENT_TIMESTAMP); business dates are local.
+    cursor.execute(
+        "UPDATE orders SET business_date = DATE(closed_at, 'localtime', ?) "
+        "WHERE closed_at IS NOT NULL AND business_date IS NULL",
+        (f"-{cutoff_hour} hours",)
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_business_date ON orders (status, business_date)")
+
+
+def _add_sales_rollups(cursor: sqlite3.Cursor):
+    """Creates the sales rollup tables and fills them from existing history."""
+    create_rollup_tables(cursor)
+    rebuild_rollups(cursor)
+
+
+def _add_receipt_archive(cursor: sqlite3.Cursor):
+    """Creates the receipt archive (older receipts are rebuilt from their orders on demand)."""
+    create_receipt_table(cursor)
+
+
+# (version, description, function) - append new migrations to the end, never reorder.
+MIGRATIONS = [
+    (1, "base schema", _create_base_schema),
+    (2, "audit columns and feedback table", _add_audit_columns_and_feedback),
+    (3, "hot-path indexes", _create_hot_path_indexes),
+    (4, "orders.business_date", _add_business_date),
+    (5, "sales rollup tables", _add_sales_rollups),
+    (6, "receipt archive", _add_receipt_archive),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Returns the schema version stored in the database header."""
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def apply_migrations(cursor: sqlite3.Cursor) -> list[int]:
+    """
+    Applies every migration newer than the stored schema version.
+    Must be called inside a transaction; returns the versions that were applied.
+    """
+    current = get_schema_version(cursor)
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"[DEBUG] Applying migration {version}: {description}")
+        migrate(cursor)
+        applied.append(version)
+    if applied:
+        # PRAGMA does not accept bound parameters; the value is always an int.
+        cursor.execute(f"PRAGMA user_version = {int(applied[-1])}")
+    return applied
@@ -1,4 +1,10 @@
 from .base_manager import BaseManager
+from . import events
+from .business_day import get_cutoff_hour, business_date_for
+from .rollup_manager import record_closed_order
+from .receipt_manager import record_receipt
+from .order_session import OrderSession
+from datetime import datetime, timezone
 import sqlite3
 
 class OrderManager(BaseManager):
@@ -9,115 +15,204 @@ class OrderManager(BaseManager):
 
     def get_tables_with_status(self) -> list:
         """Gets all tables with their current status for the main floor view."""
-        self.cursor.execute('''
-            SELECT t.id, t.name, t.capacity, 
-                   CASE WHEN o.id IS NOT NULL THEN 'occupied' ELSE 'available' END as status
-            FROM tables t
-            LEFT JOIN orders o ON t.id = o.table_id AND o.status = 'open'
-            ORDER BY t.name
-        ''')
-        return self.cursor.fetchall()
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT t.id, t.name, t.capacity,
+                       CASE WHEN o.id IS NOT NULL THEN 'occupied' ELSE 'available' END as status
+                FROM tables t
+                LEFT JOIN orders o ON t.id = o.table_id AND o.status = 'open'
+                ORDER BY t.name
+            ''')
+            return cursor.fetchall()
 
     def get_open_order_for_table(self, table_id: int) -> sqlite3.Row | None:
         """Gets the currently open order for a specific table, if one exists."""
-        self.cursor.execute("SELECT id FROM orders WHERE table_id=? AND status='open'", (table_id,))
-        return self.cursor.fetchone()
+        with self._read() as cursor:
+            cursor.execute("SELECT id FROM orders WHERE table_id=? AND status='open'", (table_id,))
+            return cursor.fetchone()
 
     def create_order(self, table_id: int, user_id: int) -> int:
-        """Creates a new, empty order for a table and returns the new order ID."""
-        self.cursor.execute(
-            "INSERT INTO orders (table_id, user_id, status) VALUES (?, ?, 'open')", 
-            (table_id, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid
-        
+        """
+        Creates a new, empty order for a table and returns the new order ID.
+        If another terminal opened an order for the table first, that order's
+        ID is returned instead, so a table never has two open orders.
+        """
+        with self._write() as cursor:
+            cursor.execute("SELECT id FROM orders WHERE table_id=? AND status='open'", (table_id,))
+            existing_order = cursor.fetchone()
+            if existing_order:
+                return existing_order['id']
+            cursor.execute(
+                "INSERT INTO orders (table_id, user_id, status, created_at) VALUES (?, ?, 'open', CURRENT_TIMESTAMP)",
+                (table_id, user_id)
+            )
+            order_id = cursor.lastrowid
+            self._publish(events.ORDERS, action="created", order_id=order_id, table_id=table_id)
+            return order_id
+
     def get_order_items(self, order_id: int) -> list:
         """Gets all items associated with a specific order."""
-        self.cursor.execute('''
-            SELECT oi.id, oi.product_id, p.name as product_name, oi.quantity, oi.price_at_time
-            FROM order_items oi
-            JOIN products p ON oi.product_id = p.id
-            WHERE oi.order_id = ?
-            ORDER BY oi.created_at
-        ''', (order_id,))
-        return self.cursor.fetchall()
-
-    def add_item_to_order(self, order_id: int, product_id: int, quantity: int, price: float):
-        """Adds an item to an order. If the item exists, updates its quantity."""
-        self.cursor.execute(
-            "SELECT id, quantity FROM order_items WHERE order_id=? AND product_id=?", 
-            (order_id, product_id)
-        )
-        existing_item = self.cursor.fetchone()
-        
-        if existing_item:
-            new_quantity = existing_item['quantity'] + quantity
-            self.update_order_item_quantity(existing_item['id'], new_quantity)
-        else:
-            self.cursor.execute(
-                "INSERT INTO order_items (order_id, product_id, quantity, price_at_time) VALUES (?, ?, ?, ?)", 
-                (order_id, product_id, quantity, price)
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT oi.id, oi.product_id, p.name as product_name, oi.quantity, oi.price_at_time
+                FROM order_items oi
+                JOIN products p ON oi.product_id = p.id
+                WHERE oi.order_id = ?
+                ORDER BY oi.created_at
+            ''', (order_id,))
+            return cursor.fetchall()
+
+    def _is_open(self, cursor: sqlite3.Cursor, order_id: int) -> bool:
+        """Checks, inside the caller's transaction, that an order can still be edited."""
+        cursor.execute("SELECT 1 FROM orders WHERE id=? AND status='open'", (order_id,))
+        return cursor.fetchone() is not None
+
+    def add_item_to_order(self, order_id: int, product_id: int, quantity: int, price: float) -> bool:
+        """
+        Adds an item to an order. If the item exists, updates its quantity.
+        Returns False if the order was already closed (e.g. by another terminal).
+        """
+        with self._write() as cursor:
+            if not self._is_open(cursor, order_id):
+                return False
+            cursor.execute(
+                "SELECT id, quantity FROM order_items WHERE order_id=? AND product_id=?",
+                (order_id, product_id)
             )
-            self._update_inventory(product_id, -quantity) # Decrease stock
-            self.conn.commit()
+            existing_item = cursor.fetchone()
+
+            if existing_item:
+                new_quantity = existing_item['quantity'] + quantity
+                self.update_order_item_quantity(existing_item['id'], new_quantity)
+            else:
+                cursor.execute(
+                    "INSERT INTO order_items (order_id, product_id, quantity, price_at_time, created_at) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                    (order_id, product_id, quantity, price)
+                )
+                self._update_inventory(cursor, product_id, -quantity) # Decrease stock
+                self._publish(events.ORDERS, action="items", order_id=order_id)
+        return True
+
+    def session(self, order_id: int) -> OrderSession:
+        """Starts an editing session for an open order, loaded with its current items."""
+        return OrderSession(self, order_id).load()
+
+    def apply_item_changes(self, order_id: int, changes: dict):
+        """
+        Applies a batch of item quantities to an order in a single transaction,
+        adjusting inventory by the difference from what is currently stored.
+
+        Args:
+            order_id: The order being edited.
+            changes: Maps product_id to (quantity, price). A quantity of 0 removes the line.
+        """
+        if not changes:
+            return
+        with self._write() as cursor:
+            if not self._is_open(cursor, order_id):
+                raise ValueError(f"Order #{order_id} has already been closed")
+            for product_id, (quantity, price) in changes.items():
+                cursor.execute(
+                    "SELECT id, quantity FROM order_items WHERE order_id=? AND product_id=?",
+                    (order_id, product_id)
+                )
+                existing_item = cursor.fetchone()
+                current_quantity = existing_item['quantity'] if existing_item else 0
+                if quantity == current_quantity:
+                    continue
+
+                if existing_item and quantity > 0:
+                    cursor.execute("UPDATE order_items SET quantity=? WHERE id=?", (quantity, existing_item['id']))
+                elif existing_item:
+                    cursor.execute("DELETE FROM order_items WHERE id=?", (existing_item['id'],))
+                else:
+                    cursor.execute(
+                        "INSERT INTO order_items (order_id, product_id, quantity, price_at_time, created_at) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                        (order_id, product_id, quantity, price)
+                    )
+                self._update_inventory(cursor, product_id, current_quantity - quantity)
+            self._publish(events.ORDERS, action="items", order_id=order_id)
 
     def remove_order_item(self, order_item_id: int):
         """Removes an item from an order and returns its quantity to inventory."""
-        self.cursor.execute("SELECT product_id, quantity FROM order_items WHERE id=?", (order_item_id,))
-        item = self.cursor.fetchone()
-        if item:
-            self._update_inventory(item['product_id'], item['quantity']) # Add stock back
-            self.cursor.execute("DELETE FROM order_items WHERE id=?", (order_item_id,))
-            self.conn.commit()
+        with self._write() as cursor:
+            item = self._get_open_item(cursor, order_item_id)
+            if item:
+                self._update_inventory(cursor, item['product_id'], item['quantity']) # Add stock back
+                cursor.execute("DELETE FROM order_items WHERE id=?", (order_item_id,))
+                self._publish(events.ORDERS, action="items", order_id=item['order_id'])
 
     def update_order_item_quantity(self, order_item_id: int, new_quantity: int):
         """Updates an item's quantity and adjusts inventory accordingly."""
-        self.cursor.execute("SELECT product_id, quantity FROM order_items WHERE id=?", (order_item_id,))
-        item = self.cursor.fetchone()
-        if not item:
-            return
+        with self._write() as cursor:
+            item = self._get_open_item(cursor, order_item_id)
+            if not item:
+                return
 
-        quantity_change = item['quantity'] - new_quantity
-        self._update_inventory(item['product_id'], quantity_change) # Adjust stock
-
-        if new_quantity > 0:
-            self.cursor.execute("UPDATE order_items SET quantity=? WHERE id=?", (new_quantity, order_item_id))
-        else:
-            # If new quantity is 0 or less, remove the item
-            self.cursor.execute("DELETE FROM order_items WHERE id=?", (order_item_id,))
-        self.conn.commit()
-
-    def close_order(self, order_id: int):
-        """Closes an order, calculating and storing the final total amount."""
-        self.cursor.execute('''
-            SELECT SUM(quantity * price_at_time) as total 
-            FROM order_items WHERE order_id = ?
-        ''', (order_id,))
-        result = self.cursor.fetchone()
-        total_amount = result['total'] if result and result['total'] is not None else 0.0
-        
-        self.cursor.execute(
-            "UPDATE orders SET status='closed', closed_at=CURRENT_TIMESTAMP, total_amount=? WHERE id=?", 
-            (total_amount, order_id)
-        )
-        self.conn.commit()
+            quantity_change = item['quantity'] - new_quantity
+            self._update_inventory(cursor, item['product_id'], quantity_change) # Adjust stock
+
+            if new_quantity > 0:
+                cursor.execute("UPDATE order_items SET quantity=? WHERE id=?", (new_quantity, order_item_id))
+            else:
+                # If new quantity is 0 or less, remove the item
+                cursor.execute("DELETE FROM order_items WHERE id=?", (order_item_id,))
+            self._publish(events.ORDERS, action="items", order_id=item['order_id'])
+
+    def close_order(self, order_id: int) -> bool:
+        """
+        Closes an order, calculating and storing the final total amount and the
+        business date it counts towards. The sales rollups and the receipt
+        archive are updated in the same transaction.
+        Returns False if the order was no longer open.
+        """
+        with self._write() as cursor:
+            if not self._is_open(cursor, order_id):
+                return False # Already settled, possibly by another terminal
+            cursor.execute('''
+                SELECT SUM(quantity * price_at_time) as total
+                FROM order_items WHERE order_id = ?
+            ''', (order_id,))
+            result = cursor.fetchone()
+            total_amount = result['total'] if result and result['total'] is not None else 0.0
+
+            closed_at = datetime.now(timezone.utc)
+            business_date = business_date_for(closed_at.astimezone(), get_cutoff_hour(cursor))
+            cursor.execute(
+                "UPDATE orders SET status='closed', closed_at=?, business_date=?, total_amount=? WHERE id=?",
+                (closed_at.strftime("%Y-%m-%d %H:%M:%S"), business_date.isoformat(), total_amount, order_id)
+            )
+            record_closed_order(cursor, order_id)
+            record_receipt(cursor, order_id)
+            self._publish(events.ORDERS, action="closed", order_id=order_id)
+            return True
 
     def get_last_closed_order_for_table(self, table_id: int) -> sqlite3.Row | None:
         """Gets the most recently closed order for a table, for reprinting receipts."""
-        self.cursor.execute('''
-            SELECT id, user_id, closed_at, total_amount FROM orders 
-            WHERE table_id=? AND status='closed' 
-            ORDER BY closed_at DESC LIMIT 1
-        ''', (table_id,))
-        return self.cursor.fetchone()
-
-    def _update_inventory(self, product_id: int, quantity_change: int):
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT id, user_id, closed_at, total_amount FROM orders
+                WHERE table_id=? AND status='closed'
+                ORDER BY closed_at DESC LIMIT 1
+            ''', (table_id,))
+            return cursor.fetchone()
+
+    def _get_open_item(self, cursor: sqlite3.Cursor, order_item_id: int) -> sqlite3.Row | None:
+        """Gets an order line, but only while its order is still open."""
+        cursor.execute('''
+            SELECT oi.order_id, oi.product_id, oi.quantity
+            FROM order_items oi JOIN orders o ON o.id = oi.order_id
+            WHERE oi.id = ? AND o.status = 'open'
+        ''', (order_item_id,))
+        return cursor.fetchone()
+
+    def _update_inventory(self, cursor: sqlite3.Cursor, product_id: int, quantity_change: int):
         """
         Internal helper to update inventory stock for a product.
         A negative change subtracts from stock, a positive change adds to it.
+        Runs on the caller's cursor so it joins the caller's transaction.
         """
-        self.cursor.execute(
-            "UPDATE inventory SET stock_quantity = stock_quantity - ?, last_updated = CURRENT_TIMESTAMP WHERE product_id = ?",
+        cursor.execute(
+            "UPDATE inventory SET stock_quantity = stock_quantity + ?, last_updated = CURRENT_TIMESTAMP WHERE product_id = ?",
             (quantity_change, product_id)
         )
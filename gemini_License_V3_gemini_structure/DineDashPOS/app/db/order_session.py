@@ -0,0 +1,142 @@
+import threading
+
+class OrderSession:
+    """
+    A unit of work for editing one open order.
+    Item changes are applied to an in-memory copy of the order and written back
+    (items and inventory together) in a single transaction on flush(), so a
+    burst of "+" taps costs one commit instead of one per tap.
+
+    Usage:
+        with db.orders.session(order_id) as session:
+            session.add(product_id, "Burger", 12.5)
+            session.change_quantity(product_id, 1)
+        # flushed on exit
+    """
+    def __init__(self, orders, order_id: int):
+        """
+        Args:
+            orders: The OrderManager used to read and persist the order.
+            order_id: The open order being edited.
+        """
+        self.orders = orders
+        self.order_id = order_id
+        self.closed = False
+        self._lock = threading.Lock()
+        self._items = {}      # product_id -> item dict, in the order items were added
+        self._persisted = {}  # product_id -> quantity last written to the database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and not self.closed:
+            self.flush()
+
+    def load(self):
+        """Reads the order's current items from the database, discarding unsaved edits."""
+        rows = self.orders.get_order_items(self.order_id)
+        with self._lock:
+            self._items = {row['product_id']: dict(row) for row in rows}
+            self._persisted = {product_id: item['quantity'] for product_id, item in self._items.items()}
+        return self
+
+    # --- Editing (in memory only) ---
+    def add(self, product_id: int, product_name: str, price: float, quantity: int = 1):
+        """Adds a product to the order, or increases its quantity if already present."""
+        with self._lock:
+            item = self._items.get(product_id)
+            if item:
+                item['quantity'] += quantity
+            else:
+                self._items[product_id] = {
+                    'id': None, 'product_id': product_id, 'product_name': product_name,
+                    'quantity': quantity, 'price_at_time': price
+                }
+
+    def change_quantity(self, product_id: int, delta: int):
+        """Changes an item's quantity by `delta`, removing it when it reaches zero."""
+        with self._lock:
+            item = self._items.get(product_id)
+            quantity = item['quantity'] + delta if item else 0
+        self.set_quantity(product_id, quantity)
+
+    def set_quantity(self, product_id: int, quantity: int):
+        """Sets an item's quantity; zero or less removes the item."""
+        with self._lock:
+            if product_id not in self._items:
+                return
+            if quantity > 0:
+                self._items[product_id]['quantity'] = quantity
+            else:
+                del self._items[product_id]
+
+    def item(self, product_id: int) -> dict | None:
+        """Returns a copy of one line, or None if the product is not on the order."""
+        with self._lock:
+            item = self._items.get(product_id)
+            return dict(item) if item else None
+
+    def items(self) -> list[dict]:
+        """Returns a snapshot of the order's items, including unsaved edits."""
+        with self._lock:
+            return [dict(item) for item in self._items.values()]
+
+    @property
+    def dirty(self) -> bool:
+        """True if there are edits that have not been flushed yet."""
+        with self._lock:
+            return bool(self._pending_changes())
+
+    # --- Persisting ---
+    def flush(self) -> int:
+        """
+        Writes all pending edits in one transaction.
+        Safe to call from a worker thread while the UI keeps editing; edits made
+        during the flush stay pending for the next one.
+
+        Returns:
+            The number of order lines that were written.
+        """
+        with self._lock:
+            changes = self._pending_changes()
+        if not changes:
+            return 0
+        self.orders.apply_item_changes(self.order_id, changes)
+        self._mark_persisted(changes)
+        return len(changes)
+
+    def settle(self):
+        """
+        Flushes pending edits and closes the order in the same transaction.
+        Raises ValueError if another terminal has already closed the order.
+        """
+        with self._lock:
+            changes = self._pending_changes()
+        with self.orders.pool.transaction():
+            self.orders.apply_item_changes(self.order_id, changes)
+            if not self.orders.close_order(self.order_id):
+                raise ValueError(f"Order #{self.order_id} was already closed by another terminal")
+        self._mark_persisted(changes)
+        self.closed = True
+
+    def _pending_changes(self) -> dict:
+        """Maps product_id to (quantity, price) for every line that differs from the database."""
+        changes = {
+            product_id: (item['quantity'], item['price_at_time'])
+            for product_id, item in self._items.items()
+            if self._persisted.get(product_id) != item['quantity']
+        }
+        for product_id in self._persisted:
+            if product_id not in self._items:
+                changes[product_id] = (0, None)
+        return changes
+
+    def _mark_persisted(self, changes: dict):
+        """Records the quantities that a successful flush wrote."""
+        with self._lock:
+            for product_id, (quantity, _) in changes.items():
+                if quantity > 0:
+                    self._persisted[product_id] = quantity
+                else:
+                    self._persisted.pop(product_id, None)
@@ -0,0 +1,200 @@
+from .base_manager import BaseManager
+from datetime import date, datetime, timedelta, timezone
+import gzip
+import json
+import os
+import sqlite3
+import zlib
+
+TAX_RATE = 0.10
+
+
+def create_receipt_table(cursor: sqlite3.Cursor):
+    """Creates the receipt archive: one compressed row per closed order."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS receipts (
+            order_id INTEGER PRIMARY KEY,
+            table_id INTEGER,
+            business_date TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            details BLOB,   -- zlib-compressed JSON, NULL once rotated out
+            segment TEXT    -- archive file holding the details after rotation
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipts_date_table ON receipts (business_date, table_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipts_table_order ON receipts (table_id, order_id)")
+
+
+def build_receipt_details(cursor: sqlite3.Cursor, order_id: int) -> dict | None:
+    """Collects everything a receipt shows for an order, in the shape the receipt templates expect."""
+    cursor.execute('''
+        SELECT o.id, o.table_id, o.closed_at, o.business_date,
+               COALESCE(t.name, 'N/A') AS table_name, COALESCE(u.username, 'N/A') AS user_name
+        FROM orders o
+        LEFT JOIN tables t ON t.id = o.table_id
+        LEFT JOIN users u ON u.id = o.user_id
+        WHERE o.id = ?
+    ''', (order_id,))
+    order = cursor.fetchone()
+    if order is None:
+        return None
+    cursor.execute('''
+        SELECT p.name AS product_name, oi.quantity, oi.price_at_time
+        FROM order_items oi
+        JOIN products p ON oi.product_id = p.id
+        WHERE oi.order_id = ?
+        ORDER BY oi.created_at
+    ''', (order_id,))
+    items = [dict(row) for row in cursor.fetchall()]
+    subtotal = sum(item['quantity'] * item['price_at_time'] for item in items)
+    tax = subtotal * TAX_RATE
+
+    timestamp = order['closed_at'] or ""
+    if timestamp:
+        # closed_at is stored in UTC; receipts show local time
+        closed_at = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        timestamp = closed_at.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    return {
+        "order_id": order['id'], "table_id": order['table_id'], "business_date": order['business_date'],
+        "table_name": order['table_name'], "user_name": order['user_name'], "timestamp": timestamp,
+        "items": items, "subtotal": subtotal, "tax": tax, "total": subtotal + tax,
+    }
+
+
+def record_receipt(cursor: sqlite3.Cursor, order_id: int):
+    """
+    Archives the receipt of a just-closed order.
+    Runs on the caller's cursor so it commits together with the close itself.
+    """
+    details = build_receipt_details(cursor, order_id)
+    cursor.execute(
+        "INSERT OR REPLACE INTO receipts (order_id, table_id, business_date, created_at, details) VALUES (?, ?, ?, ?, ?)",
+        (order_id, details['table_id'], details['business_date'], details['timestamp'], _pack(details))
+    )
+
+
+def _pack(details: dict) -> bytes:
+    return zlib.compress(json.dumps(details, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob))
+
+
+class ReceiptManager(BaseManager):
+    """
+    An append-only archive of every receipt, instead of one file per sale.
+    Receipts are written in the transaction that closes the order and indexed
+    by order id, business date and table. Recent receipts keep their
+    compressed details in the database; rotate() moves older ones into one
+    gzip segment per business day (the index rows stay, so lookups still
+    work), and purge() drops receipts past the retention period.
+    """
+    def get_archive_dir(self) -> str:
+        """Returns the folder holding rotated receipt segments."""
+        archive_dir = os.path.join(os.path.dirname(self.pool.db_path), "receipts", "archive")
+        os.makedirs(archive_dir, exist_ok=True)
+        return archive_dir
+
+    def get_receipt(self, order_id: int) -> dict | None:
+        """
+        Returns the archived receipt details for an order, ready for the
+        receipt templates. Orders closed before the archive existed are
+        rebuilt from the order tables.
+        """
+        with self._read() as cursor:
+            cursor.execute("SELECT details, segment FROM receipts WHERE order_id=?", (order_id,))
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute("SELECT 1 FROM orders WHERE id=? AND status='closed'", (order_id,))
+                return build_receipt_details(cursor, order_id) if cursor.fetchone() else None
+        if row['details'] is not None:
+            return _unpack(row['details'])
+        return self._read_from_segment(row['segment'], order_id)
+
+    def get_last_receipt_for_table(self, table_id: int) -> dict | None:
+        """Returns the most recent receipt printed for a table, for reprints."""
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT id FROM orders WHERE table_id=? AND status='closed'
+                ORDER BY closed_at DESC LIMIT 1
+            ''', (table_id,))
+            row = cursor.fetchone()
+        return self.get_receipt(row['id']) if row else None
+
+    def find_receipts(self, business_date: str = None, table_id: int = None, limit: int = 200) -> list:
+        """Lists archived receipts (without their details), newest first, filtered by date and/or table."""
+        conditions, params = [], []
+        if business_date:
+            conditions.append("business_date = ?")
+            params.append(business_date)
+        if table_id is not None:
+            conditions.append("table_id = ?")
+            params.append(table_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._read() as cursor:
+            cursor.execute(f'''
+                SELECT order_id, table_id, business_date, created_at, segment IS NOT NULL AS rotated
+                FROM receipts {where} ORDER BY order_id DESC LIMIT ?
+            ''', (*params, limit))
+            return cursor.fetchall()
+
+    def rotate(self, hot_days: int = 90) -> int:
+        """
+        Moves receipts older than hot_days out of the database into daily
+        gzip segments and returns how many were moved. Segments are appended
+        to, and written before the database rows are cleared, so an
+        interrupted rotation is simply redone on the next run.
+        """
+        cutoff = (date.today() - timedelta(days=hot_days)).isoformat()
+        with self._read() as cursor:
+            cursor.execute(
+                "SELECT DISTINCT business_date FROM receipts WHERE details IS NOT NULL AND business_date < ?", (cutoff,)
+            )
+            days = [row[0] for row in cursor.fetchall()]
+
+        moved = 0
+        for day in days:
+            segment = f"receipts_{day}.jsonl.gz"
+            with self._read() as cursor:
+                cursor.execute(
+                    "SELECT order_id, details FROM receipts WHERE business_date=? AND details IS NOT NULL ORDER BY order_id",
+                    (day,)
+                )
+                rows = cursor.fetchall()
+            with gzip.open(os.path.join(self.get_archive_dir(), segment), 'at', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({"order_id": row['order_id'], "details": _unpack(row['details'])}) + "\n")
+            with self._write() as cursor:
+                cursor.executemany(
+                    "UPDATE receipts SET details=NULL, segment=? WHERE order_id=?",
+                    [(segment, row['order_id']) for row in rows]
+                )
+            moved += len(rows)
+        print(f"[DEBUG] Rotated {moved} receipts from {len(days)} day(s) into archive segments.")
+        return moved
+
+    def purge(self, keep_days: int = 7 * 365) -> int:
+        """Deletes receipts (rows and segments) older than the retention period; returns the row count."""
+        cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+        with self._write() as cursor:
+            cursor.execute("DELETE FROM receipts WHERE business_date < ?", (cutoff,))
+            deleted = cursor.rowcount
+        archive_dir = self.get_archive_dir()
+        for name in os.listdir(archive_dir):
+            if name.startswith("receipts_") and name[len("receipts_"):len("receipts_") + 10] < cutoff:
+                os.remove(os.path.join(archive_dir, name))
+        return deleted
+
+    def _read_from_segment(self, segment: str, order_id: int) -> dict | None:
+        """Finds an order's receipt in a rotated segment (the last copy wins after a re-run)."""
+        path = os.path.join(self.get_archive_dir(), segment)
+        if not os.path.exists(path):
+            return None
+        found = None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['order_id'] == order_id:
+                    found = entry['details']
+        return found
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+class ReportCache:
+    """
+    A small thread-safe LRU cache for report results.
+    Entries are keyed on the report call and the data version they were
+    computed from. Bumping the version (whenever sales data changes) drops
+    everything at once, and a result computed against an older version is
+    never stored. Cached results are shared, so callers must treat them as
+    read-only.
+    """
+    def __init__(self, maxsize: int = 64):
+        """
+        Args:
+            maxsize: Maximum number of results kept; the least recently used is evicted first.
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Returns (True, result) for a cached key, moving it to the front, or (False, None)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, result, version: int):
+        """Stores a result unless the data has changed since it was computed."""
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Moves to a new data version and drops every cached result."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current size, for diagnostics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'version': self.version,
+            }
@@ -0,0 +1,99 @@
+from .base_manager import BaseManager
+from . import events
+import sqlite3
+
+# Local hour an order was closed in (closed_at is stored in UTC).
+_HOUR_EXPR = "CAST(strftime('%H', o.closed_at, 'localtime') AS INTEGER)"
+
+_ITEM_ROLLUP_SELECT = f'''
+    SELECT o.business_date, {_HOUR_EXPR}, oi.product_id, COALESCE(p.category, ''), COALESCE(o.user_id, 0),
+           SUM(oi.quantity), SUM(oi.quantity * oi.price_at_time)
+    FROM orders o
+    JOIN order_items oi ON oi.order_id = o.id
+    JOIN products p ON oi.product_id = p.id
+    WHERE {{where}}
+    GROUP BY 1, 2, 3, 4, 5
+'''
+
+_ORDER_ROLLUP_SELECT = f'''
+    SELECT o.business_date, {_HOUR_EXPR}, COALESCE(o.user_id, 0),
+           COUNT(*), COALESCE(SUM(o.total_amount), 0)
+    FROM orders o
+    WHERE {{where}}
+    GROUP BY 1, 2, 3
+'''
+
+
+def create_rollup_tables(cursor: sqlite3.Cursor):
+    """Creates the pre-aggregated sales tables."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_rollup_items (
+            business_date TEXT NOT NULL, hour INTEGER NOT NULL, product_id INTEGER NOT NULL,
+            category TEXT NOT NULL DEFAULT '', user_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL, revenue REAL NOT NULL,
+            PRIMARY KEY (business_date, hour, product_id, category, user_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_rollup_orders (
+            business_date TEXT NOT NULL, hour INTEGER NOT NULL, user_id INTEGER NOT NULL,
+            order_count INTEGER NOT NULL, revenue REAL NOT NULL,
+            PRIMARY KEY (business_date, hour, user_id)
+        ) WITHOUT ROWID
+    ''')
+
+
+def record_closed_order(cursor: sqlite3.Cursor, order_id: int):
+    """
+    Folds a just-closed order into the rollup tables.
+    Runs on the caller's cursor so it commits together with the close itself.
+    """
+    # "WHERE true" disambiguates INSERT ... SELECT from the ON CONFLICT clause.
+    cursor.execute(f'''
+        INSERT INTO sales_rollup_items (business_date, hour, product_id, category, user_id, quantity, revenue)
+        SELECT * FROM ({_ITEM_ROLLUP_SELECT.format(where="o.id = ?")}) WHERE true
+        ON CONFLICT (business_date, hour, product_id, category, user_id) DO UPDATE SET
+            quantity = quantity + excluded.quantity,
+            revenue = revenue + excluded.revenue
+    ''', (order_id,))
+    cursor.execute(f'''
+        INSERT INTO sales_rollup_orders (business_date, hour, user_id, order_count, revenue)
+        SELECT * FROM ({_ORDER_ROLLUP_SELECT.format(where="o.id = ?")}) WHERE true
+        ON CONFLICT (business_date, hour, user_id) DO UPDATE SET
+            order_count = order_count + excluded.order_count,
+            revenue = revenue + excluded.revenue
+    ''', (order_id,))
+
+
+def rebuild_rollups(cursor: sqlite3.Cursor):
+    """Recomputes both rollup tables from the full order history."""
+    where = "o.status = 'closed' AND o.business_date IS NOT NULL"
+    cursor.execute("DELETE FROM sales_rollup_items")
+    cursor.execute("DELETE FROM sales_rollup_orders")
+    cursor.execute(
+        "INSERT INTO sales_rollup_items (business_date, hour, product_id, category, user_id, quantity, revenue) "
+        + _ITEM_ROLLUP_SELECT.format(where=where)
+    )
+    cursor.execute(
+        "INSERT INTO sales_rollup_orders (business_date, hour, user_id, order_count, revenue) "
+        + _ORDER_ROLLUP_SELECT.format(where=where)
+    )
+
+
+class RollupManager(BaseManager):
+    """
+    Maintains the materialized daily/hourly sales rollups that back the
+    dashboard and period reports. Rows are keyed by business date, hour,
+    product, category and server, and are updated by OrderManager.close_order.
+    """
+
+    def rebuild(self) -> dict:
+        """Recomputes the rollups from order history and returns row counts."""
+        with self._write() as cursor:
+            rebuild_rollups(cursor)
+            cursor.execute("SELECT COUNT(*) FROM sales_rollup_items")
+            item_rows = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM sales_rollup_orders")
+            order_rows = cursor.fetchone()[0]
+            self._publish(events.ORDERS, action="rebuilt")
+        return {"item_rows": item_rows, "order_rows": order_rows}
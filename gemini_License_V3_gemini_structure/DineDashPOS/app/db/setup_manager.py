@@ -1,61 +1,63 @@
 from .base_manager import BaseManager
+from . import migrations
 
 class SetupManager(BaseManager):
     """
-    Manages the initial setup of the database, including table creation
-    and seeding of initial data.
+    Manages the initial setup of the database, including versioned schema
+    migrations and seeding of initial data.
     """
     def initialize_database(self):
-        """Runs all setup and seeding operations."""
+        """Runs pending migrations and seeds a freshly created database."""
         print("[DEBUG] Initializing database...")
+        with self._read() as cursor:
+            version = migrations.get_schema_version(cursor)
+        if version >= migrations.LATEST_VERSION:
+            # Warm start: schema is current, so no DDL or seed checks are needed.
+            print(f"[DEBUG] Schema is up to date (version {version}).")
+            return
+
         self.create_tables()
-        self.seed_initial_data()
+        if version == 0:
+            self.seed_initial_data()
         print("[DEBUG] Database initialization complete.")
 
     def create_tables(self):
-        """Creates all necessary tables for the POS system."""
-        print("[DEBUG] Creating tables...")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, username TEXT NOT NULL UNIQUE, role TEXT)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, name TEXT, price REAL, category TEXT, image TEXT)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS tables (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, capacity INTEGER)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS orders (id INTEGER PRIMARY KEY, table_id INTEGER, user_id INTEGER, status TEXT, total_amount REAL, created_at TIMESTAMP, closed_at TIMESTAMP)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS order_items (id INTEGER PRIMARY KEY, order_id INTEGER, product_id INTEGER, quantity INTEGER, price_at_time REAL)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS inventory (id INTEGER PRIMARY KEY, product_id INTEGER UNIQUE, stock_quantity INTEGER, min_stock_level INTEGER)")
-        self.conn.commit()
-        print("[DEBUG] Table creation step finished and COMMITTED.")
+        """Brings the schema up to date by applying all pending migrations."""
+        print("[DEBUG] Applying schema migrations...")
+        with self._write() as cursor:
+            applied = migrations.apply_migrations(cursor)
+        print(f"[DEBUG] Applied migrations {applied} and COMMITTED.")
 
     def seed_initial_data(self):
         """Seeds the database with initial data if tables are empty."""
         print("[DEBUG] Checking if data seeding is required...")
-        
+
         # --- CRITICAL FIX: Seed and commit tables FIRST ---
-        self.cursor.execute("SELECT COUNT(*) FROM tables")
-        if self.cursor.fetchone()[0] == 0:
-            print("[DEBUG] Seeding default tables...")
-            tables_to_seed = [
-                ('T1', 2), ('T2', 4), ('T3', 4), ('T4', 6), ('T5', 2), ('T6', 4),
-                ('T7', 6), ('T8', 4), ('P1', 8), ('P2', 6), ('B1', 2), ('B2', 2)
-            ]
-            self.cursor.executemany("INSERT INTO tables (name, capacity) VALUES (?, ?)", tables_to_seed)
-            self.conn.commit() # This immediate commit is the core of the fix.
-            print(f"[DEBUG] Inserted {len(tables_to_seed)} tables and COMMITTED.")
+        with self._write() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM tables")
+            if cursor.fetchone()[0] == 0:
+                print("[DEBUG] Seeding default tables...")
+                tables_to_seed = [
+                    ('T1', 2), ('T2', 4), ('T3', 4), ('T4', 6), ('T5', 2), ('T6', 4),
+                    ('T7', 6), ('T8', 4), ('P1', 8), ('P2', 6), ('B1', 2), ('B2', 2)
+                ]
+                cursor.executemany("INSERT INTO tables (name, capacity) VALUES (?, ?)", tables_to_seed)
+                print(f"[DEBUG] Inserted {len(tables_to_seed)} tables.")
+        print("[DEBUG] Table seeding COMMITTED.")
 
         # Seed other data
-        self.cursor.execute("SELECT COUNT(*) FROM users")
-        if self.cursor.fetchone()[0] == 0:
-            users = [('Admin', 'Admin'), ('Jessica', 'Server'), ('David', 'Server')]
-            self.cursor.executemany("INSERT INTO users (username, role) VALUES (?, ?)", users)
-        
-        self.cursor.execute("SELECT COUNT(*) FROM products")
-        if self.cursor.fetchone()[0] == 0:
-            products = [
-                ('Spring Rolls', 8.99, 'Appetizers'), ('Garlic Bread', 6.50, 'Appetizers'),
-                ('Margherita Pizza', 15.99, 'Mains'), ('Beef Burger', 16.99, 'Mains'),
-                ('Tiramisu', 9.50, 'Desserts'), ('Coca-Cola', 3.50, 'Drinks')
-            ]
-            self.cursor.executemany("INSERT INTO products (name, price, category) VALUES (?, ?, ?)", products)
-        
-        self.conn.commit() # Commit all other data
-        print("[DEBUG] All remaining data seeding is complete and COMMITTED.")
+        with self._write() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM users")
+            if cursor.fetchone()[0] == 0:
+                users = [('Admin', 'Admin'), ('Jessica', 'Server'), ('David', 'Server')]
+                cursor.executemany("INSERT INTO users (username, role) VALUES (?, ?)", users)
 
+            cursor.execute("SELECT COUNT(*) FROM products")
+            if cursor.fetchone()[0] == 0:
+                products = [
+                    ('Spring Rolls', 8.99, 'Appetizers'), ('Garlic Bread', 6.50, 'Appetizers'),
+                    ('Margherita Pizza', 15.99, 'Mains'), ('Beef Burger', 16.99, 'Mains'),
+                    ('Tiramisu', 9.50, 'Desserts'), ('Coca-Cola', 3.50, 'Drinks')
+                ]
+                cursor.executemany("INSERT INTO products (name, price, category) VALUES (?, ?, ?)", products)
+        print("[DEBUG] All remaining data seeding is complete and COMMITTED.")
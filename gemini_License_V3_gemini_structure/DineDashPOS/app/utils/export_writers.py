@@ -0,0 +1,266 @@
+import csv
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from openpyxl import Workbook
+except (ImportError, ModuleNotFoundError):
+    Workbook = None
+
+class ExportCancelled(Exception):
+    """Raised by export_report when the user cancels; no file is left behind."""
+
+
+class CsvWriter:
+    """Writes rows to a UTF-8 CSV file as they arrive (BOM included so Excel detects the encoding)."""
+    extension = ".csv"
+
+    def __init__(self, path: str, sheet_name: str, columns: list):
+        self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_rows(self, rows: list):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class XlsxWriter:
+    """
+    Writes rows with openpyxl's write-only mode, which streams each row to a
+    temporary file instead of keeping a cell object per value in memory.
+    """
+    extension = ".xlsx"
+
+    def __init__(self, path: str, sheet_name: str, columns: list):
+        if Workbook is None:
+            raise RuntimeError("Excel export requires the 'openpyxl' library.\nPlease install it using: pip install openpyxl")
+        self._path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(title=sheet_name[:31]) # Excel's sheet name limit
+        self._sheet.append(columns)
+
+    def write_rows(self, rows: list):
+        for row in rows:
+            self._sheet.append(row)
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per row."""
+    extension = ".jsonl"
+
+    def __init__(self, path: str, sheet_name: str, columns: list):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._columns = columns
+
+    def write_rows(self, rows: list):
+        columns = self._columns
+        self._file.writelines(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class WorkbookWriter:
+    """
+    Writes several reports as the sheets of one write-only workbook. Every
+    sheet streams to its own temporary file, so rows can be appended to the
+    sheets in any order as their queries deliver them. A sheet that reaches
+    Excel's row limit continues on a new sheet.
+    """
+    extension = ".xlsx"
+    MAX_ROWS = 1_048_576  # Excel's per-sheet limit, header included
+
+    def __init__(self, path: str, sheets: dict):
+        """
+        Args:
+            path: Destination file path.
+            sheets: {sheet_name: columns}, in the order the sheets should appear.
+        """
+        if Workbook is None:
+            raise RuntimeError("Excel export requires the 'openpyxl' library.\nPlease install it using: pip install openpyxl")
+        self._path = path
+        self._workbook = Workbook(write_only=True)
+        self._columns = dict(sheets)
+        self._sheets = {}  # sheet_name -> [current worksheet, rows on it, continuation count]
+        for name in sheets:
+            self._sheets[name] = [self._new_sheet(name, name), 0, 1]
+
+    def _new_sheet(self, name: str, title: str):
+        sheet = self._workbook.create_sheet(title=title[:31]) # Excel's sheet name limit
+        sheet.append(self._columns[name])
+        return sheet
+
+    def write_rows(self, sheet_name: str, rows: list):
+        state = self._sheets[sheet_name]
+        for row in rows:
+            if state[1] >= self.MAX_ROWS - 1:
+                state[2] += 1
+                suffix = f" ({state[2]})"
+                state[0], state[1] = self._new_sheet(sheet_name, sheet_name[:31 - len(suffix)] + suffix), 0
+            state[0].append(row)
+            state[1] += 1
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+# Export formats offered in the UI: label -> writer class
+WRITERS = {"Excel (.xlsx)": XlsxWriter, "CSV (.csv)": CsvWriter, "JSON Lines (.jsonl)": JsonLinesWriter}
+
+# Sheets of the full workbook export, in workbook order
+WORKBOOK_REPORTS = ["monthly_sales", "daily_sales", "product_sales", "staff_performance", "order_history"]
+
+
+def _sheet_name(report: str) -> str:
+    return report.replace('_', ' ').title()
+
+
+def export_report(analytics, report: str, path: str, writer_class, progress=None, cancel_event=None, batch_size: int = 5000) -> int:
+    """
+    Streams one report from the database into a file with bounded memory.
+    The file is written under a temporary name and only renamed into place
+    once complete, so a failed or cancelled export never leaves a partial file.
+    Runs on a worker thread (see TaskRunner.submit).
+
+    Args:
+        analytics: The AnalyticsManager to read from.
+        report: A key of analytics_manager.EXPORT_QUERIES.
+        path: Destination file path.
+        writer_class: One of the WRITERS classes.
+        progress: Optional callback(rows_written, total_rows), called after every batch.
+        cancel_event: Optional threading.Event; setting it stops the export with ExportCancelled.
+        batch_size: Rows fetched and written per batch.
+
+    Returns:
+        The number of rows written.
+    """
+    total = analytics.count_export_rows(report) if progress else 0
+    columns = analytics.get_export_columns(report)
+    sheet_name = _sheet_name(report)
+    temp_path = path + ".part"
+    writer = writer_class(temp_path, sheet_name, columns)
+    written = 0
+    batches = analytics.iter_export_rows(report, batch_size)
+    try:
+        for batch in batches:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            writer.write_rows(batch)
+            written += len(batch)
+            if progress:
+                progress(written, total)
+        writer.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        batches.close() # Returns the read connection to the pool straight away
+        try:
+            writer.close()
+        except Exception:
+            pass
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written
+
+
+def export_workbook(analytics, reports: list, path: str, progress=None, cancel_event=None,
+                    batch_size: int = 5000, max_workers: int = None) -> dict:
+    """
+    Exports several reports as the sheets of one Excel workbook. Each report
+    query runs on its own pooled read connection in a worker thread, and the
+    calling thread appends batches to their sheets as they arrive, so the
+    queries overlap with each other and with the (single-threaded) workbook
+    writing. Like export_report, memory stays bounded and the file only
+    appears once it is complete.
+
+    Args:
+        analytics: The AnalyticsManager to read from.
+        reports: Keys of analytics_manager.EXPORT_QUERIES, one sheet each.
+        path: Destination file path.
+        progress: Optional callback(report, rows_written, total_rows), called per sheet
+            on the calling thread; rows_written == total_rows once a sheet is done.
+        cancel_event: Optional threading.Event; setting it stops the export with ExportCancelled.
+        batch_size: Rows fetched and written per batch.
+        max_workers: Queries run at once; by default one read connection is left free for the UI.
+
+    Returns:
+        {report: rows_written}
+    """
+    if max_workers is None:
+        max_workers = max(1, min(len(reports), analytics.pool.reader_count - 1))
+    sheets = {_sheet_name(report): analytics.get_export_columns(report) for report in reports}
+    stop = threading.Event()
+    # Bounded, so fetchers wait for the workbook instead of buffering whole reports
+    arrivals = queue.Queue(maxsize=max_workers * 2)
+
+    def send(item) -> bool:
+        """Queues an item for the writer unless the export has been stopped."""
+        while not stop.is_set():
+            try:
+                arrivals.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def fetch(report):
+        """Runs on a worker: streams one report's batches to the writer."""
+        try:
+            total = analytics.count_export_rows(report) if progress else 0
+            batches = analytics.iter_export_rows(report, batch_size)
+            try:
+                for batch in batches:
+                    if not send((report, batch, total)):
+                        return
+            finally:
+                batches.close()
+            send((report, None, total))
+        except BaseException as e:
+            send((report, e, 0))
+
+    temp_path = path + ".part"
+    writer = WorkbookWriter(temp_path, sheets)
+    written = {report: 0 for report in reports}
+    pending = set(reports)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export") as executor:
+        try:
+            for report in reports:
+                executor.submit(fetch, report)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                try:
+                    report, rows, total = arrivals.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if isinstance(rows, BaseException):
+                    raise rows
+                if rows is None:
+                    pending.discard(report)
+                    total = written[report]
+                else:
+                    writer.write_rows(_sheet_name(report), rows)
+                    written[report] += len(rows)
+                if progress:
+                    progress(report, written[report], total)
+            writer.close()
+            os.replace(temp_path, path)
+        except BaseException:
+            stop.set() # Workers drop their connections at the next batch
+            try:
+                writer.close()
+            except Exception:
+                pass
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return written
@@ -1,8 +1,23 @@
 import os
+import threading
+from collections import OrderedDict
 from PIL import Image, ImageTk
 
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+
 class ImageManager:
-    """Handles saving, loading, and managing product images."""
+    """
+    Handles saving, loading, and managing product images.
+    Thumbnails are cached at two levels: decoded PhotoImages in an in-memory
+    LRU (bounded by MEMORY_BUDGET_BYTES) and pre-resized JPEGs on disk under
+    images/thumbs/<w>x<h>, so a card never resizes the full image twice.
+    """
+    MEMORY_BUDGET_BYTES = 32 * 1024 * 1024
+
+    _cache = OrderedDict()  # (filename, size, mtime) -> (PhotoImage, bytes)
+    _cache_bytes = 0
+    _placeholders = {}      # size -> shared placeholder PhotoImage
+    _lock = threading.Lock()
 
     @staticmethod
     def get_images_dir():
@@ -11,44 +26,159 @@ class ImageManager:
         images_dir = os.path.join(home_dir, "DineDashPOS", "images")
         os.makedirs(images_dir, exist_ok=True)
         return images_dir
-    
+
+    @staticmethod
+    def get_thumbs_dir(size):
+        """Returns the on-disk thumbnail cache directory for one display size."""
+        thumbs_dir = os.path.join(ImageManager.get_images_dir(), "thumbs", f"{size[0]}x{size[1]}")
+        os.makedirs(thumbs_dir, exist_ok=True)
+        return thumbs_dir
+
     @staticmethod
     def save_product_image(product_id, source_path):
         """Saves, resizes, and converts a product image to JPEG."""
         if not os.path.exists(source_path):
             return None
         
-        images_dir = ImageManager.get_images_dir()
-        file_ext = os.path.splitext(source_path)[1].lower()
-        if file_ext not in ['.jpg', '.jpeg', '.png', '.bmp', '.gif']:
-            return None
-        
-        filename = f"product_{product_id}.jpg" # Standardize to .jpg
-        destination = os.path.join(images_dir, filename)
-        
         try:
-            with Image.open(source_path) as img:
-                img = img.convert('RGB')
-                img.thumbnail((300, 300), Image.Resampling.LANCZOS)
-                img.save(destination, 'JPEG', quality=85)
+            filename = ImageManager.import_product_image(product_id, source_path)
+            ImageManager.invalidate(filename)
             return filename
         except Exception as e:
             print(f"Error saving image: {e}")
             return None
-    
+
     @staticmethod
-    def get_product_image(image_filename, size=(150, 150)):
-        """Loads a product image or returns a placeholder if not found."""
-        image_path = os.path.join(ImageManager.get_images_dir(), image_filename) if image_filename else ""
+    def import_product_image(product_id, source_path, thumb_sizes=()):
+        """
+        Converts a source image into the product's standard JPEG and optionally
+        pre-renders its thumbnails. Raises on failure and touches no Tk state,
+        so it can run in a worker process (see tools/import_images.py).
+
+        Args:
+            product_id: The product the image belongs to.
+            source_path: Path of the original image file.
+            thumb_sizes: Display sizes to write on-disk thumbnails for.
+        """
+        file_ext = os.path.splitext(source_path)[1].lower()
+        if file_ext not in IMAGE_EXTENSIONS:
+            raise ValueError(f"Unsupported image type '{file_ext}'")
+        
+        filename = f"product_{product_id}.jpg" # Standardize to .jpg
+        destination = os.path.join(ImageManager.get_images_dir(), filename)
         
+        with Image.open(source_path) as img:
+            img = img.convert('RGB')
+            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
+            img.save(destination, 'JPEG', quality=85)
+        for size in thumb_sizes:
+            ImageManager.load_thumbnail(filename, size)
+        return filename
+
+    @staticmethod
+    def load_thumbnail(image_filename, size):
+        """
+        Returns a resized PIL image for a product, or None if it has no image.
+        Reads the on-disk thumbnail when it is newer than the original, and
+        writes one otherwise. Touches no Tk state, so it is safe on any thread.
+        """
+        size = tuple(size)
+        image_path = os.path.join(ImageManager.get_images_dir(), image_filename) if image_filename else ""
+        if not os.path.exists(image_path):
+            return None
+
+        thumb_path = os.path.join(ImageManager.get_thumbs_dir(size), image_filename)
         try:
-            if os.path.exists(image_path):
-                with Image.open(image_path) as img:
-                    img.thumbnail(size, Image.Resampling.LANCZOS)
-                    return ImageTk.PhotoImage(img)
+            if os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= os.path.getmtime(image_path):
+                with Image.open(thumb_path) as thumb:
+                    thumb.load()
+                    return thumb.copy()
+        except Exception as e:
+            print(f"Error reading cached thumbnail {thumb_path}: {e}")
+
+        try:
+            with Image.open(image_path) as img:
+                img = img.convert('RGB')
+                img.thumbnail(size, Image.Resampling.LANCZOS)
+            try:
+                img.save(thumb_path, 'JPEG', quality=90)
+            except OSError as e:
+                print(f"Error caching thumbnail {thumb_path}: {e}")
+            return img
         except Exception as e:
             print(f"Error loading image {image_filename}: {e}")
-            
-        # Return a placeholder image if the original is not found or fails to load
-        placeholder = Image.new('RGB', size, color='#21262d')
-        return ImageTk.PhotoImage(placeholder)
+            return None
+
+    @staticmethod
+    def cache_key(image_filename, size):
+        """Returns the memory-cache key for an image, or None if the file is missing."""
+        if not image_filename:
+            return None
+        try:
+            mtime = os.stat(os.path.join(ImageManager.get_images_dir(), image_filename)).st_mtime_ns
+        except OSError:
+            return None
+        return (image_filename, tuple(size), mtime)
+
+    @staticmethod
+    def get_product_image(image_filename, size=(150, 150)):
+        """Loads a product image (from cache when possible) or returns the shared placeholder."""
+        size = tuple(size)
+        key = ImageManager.cache_key(image_filename, size)
+        if key is None:
+            return ImageManager.get_placeholder(size)
+
+        cached = ImageManager.get_cached_image(key)
+        if cached is not None:
+            return cached
+
+        img = ImageManager.load_thumbnail(image_filename, size)
+        if img is None:
+            return ImageManager.get_placeholder(size)
+        return ImageManager.cache_image(key, img)
+
+    @staticmethod
+    def get_cached_image(key):
+        """Returns the cached PhotoImage for a cache key, or None."""
+        with ImageManager._lock:
+            cached = ImageManager._cache.get(key)
+            if cached:
+                ImageManager._cache.move_to_end(key)
+                return cached[0]
+        return None
+
+    @staticmethod
+    def cache_image(key, img):
+        """Converts a PIL image to a PhotoImage (Tk thread only) and stores it in the LRU."""
+        photo = ImageTk.PhotoImage(img)
+        cost = img.width * img.height * 4
+        with ImageManager._lock:
+            ImageManager._cache[key] = (photo, cost)
+            ImageManager._cache_bytes += cost
+            while ImageManager._cache_bytes > ImageManager.MEMORY_BUDGET_BYTES and len(ImageManager._cache) > 1:
+                _, (_, evicted_cost) = ImageManager._cache.popitem(last=False)
+                ImageManager._cache_bytes -= evicted_cost
+        return photo
+
+    @staticmethod
+    def get_placeholder(size):
+        """Returns the one placeholder PhotoImage shared by every card of this size."""
+        size = tuple(size)
+        placeholder = ImageManager._placeholders.get(size)
+        if placeholder is None:
+            placeholder = ImageTk.PhotoImage(Image.new('RGB', size, color='#21262d'))
+            ImageManager._placeholders[size] = placeholder
+        return placeholder
+
+    @staticmethod
+    def invalidate(image_filename):
+        """Drops every cached size of an image after it has been replaced."""
+        with ImageManager._lock:
+            for key in [k for k in ImageManager._cache if k[0] == image_filename]:
+                ImageManager._cache_bytes -= ImageManager._cache.pop(key)[1]
+        thumbs_root = os.path.join(ImageManager.get_images_dir(), "thumbs")
+        if os.path.isdir(thumbs_root):
+            for size_dir in os.listdir(thumbs_root):
+                thumb_path = os.path.join(thumbs_root, size_dir, image_filename)
+                if os.path.exists(thumb_path):
+                    os.remove(thumb_path)
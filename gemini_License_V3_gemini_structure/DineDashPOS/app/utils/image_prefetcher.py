@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.image_manager import ImageManager
+
+# Thumbnail sizes the UI uses: order menu cards and settings product rows.
+UI_IMAGE_SIZES = ((120, 120), (50, 50))
+
+class ImagePrefetcher:
+    """
+    Decodes and resizes product thumbnails on a background thread pool.
+    Cards ask for an image with request(): they get the cached PhotoImage at
+    once if it is ready, or the shared placeholder plus a callback that swaps
+    the real image in when the worker finishes. PIL work happens on the
+    workers; PhotoImages are only created on the Tk thread.
+    """
+    def __init__(self, tasks, db, max_workers: int = 2):
+        """
+        Args:
+            tasks: The App's TaskRunner, used to hand results to the Tk thread.
+            db: The DatabaseManager, used to list the catalog for prefetching.
+            max_workers: Number of decode threads.
+        """
+        self.tasks = tasks
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-decode")
+        self._waiters = {}  # cache key -> callbacks waiting for that image (Tk thread only)
+
+    def prefetch_catalog(self, sizes=UI_IMAGE_SIZES):
+        """Warms the cache with every product image in the catalog, e.g. at login."""
+        self.tasks.submit(self.db.crud.get_products, on_success=lambda products: self.prefetch(products, sizes))
+
+    def prefetch(self, products, sizes=UI_IMAGE_SIZES):
+        """Queues decoding of the given products' images at each size (Tk thread)."""
+        for product in products:
+            for size in sizes:
+                self.request(product.get('image'), size)
+
+    def request(self, image_filename, size, on_ready=None):
+        """
+        Returns the image if it is already cached, otherwise the placeholder.
+        In the second case on_ready(photo) is called on the Tk thread once the
+        image has been decoded. Must be called on the Tk thread.
+        """
+        size = tuple(size)
+        key = ImageManager.cache_key(image_filename, size)
+        if key is None:
+            return ImageManager.get_placeholder(size)
+
+        photo = ImageManager.get_cached_image(key)
+        if photo is not None:
+            return photo
+
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            waiters = self._waiters[key] = []
+            future = self._executor.submit(ImageManager.load_thumbnail, image_filename, size)
+            future.add_done_callback(lambda done: self.tasks.call_soon(self._deliver, key, done))
+        if on_ready is not None:
+            waiters.append(on_ready)
+        return ImageManager.get_placeholder(size)
+
+    def _deliver(self, key, done):
+        """Turns a decoded image into a cached PhotoImage and notifies waiting cards (Tk thread)."""
+        waiters = self._waiters.pop(key, [])
+        if done.cancelled() or done.exception() is not None or done.result() is None:
+            return
+        photo = ImageManager.cache_image(key, done.result())
+        for on_ready in waiters:
+            try:
+                on_ready(photo)
+            except Exception as e:
+                print(f"Error showing prefetched image: {e}")
+
+    def shutdown(self):
+        """Stops decoding; queued images are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+
+from app.db.analytics_manager import SNAPSHOT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except (ImportError, ModuleNotFoundError):
+    pa = pc = pq = None
+
+SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), "DineDashPOS", "snapshots")
+STATE_FILE = "_snapshot_state.json"
+ROW_GROUP_ROWS = 64_000  # Rows buffered per month before a row group is written
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"  # How OrderManager stores created_at/closed_at (UTC)
+
+
+def _schemas() -> dict:
+    """Arrow schemas for each dataset, in SNAPSHOT_COLUMNS order."""
+    timestamp = pa.timestamp("s", tz="UTC")
+    types = {
+        "orders": [pa.int64(), pa.date32(), timestamp, timestamp, pa.int64(), pa.string(),
+                   pa.int64(), pa.string(), pa.int32(), pa.float64()],
+        "order_items": [pa.int64(), pa.int64(), pa.date32(), timestamp, pa.int64(), pa.string(),
+                        pa.string(), pa.int32(), pa.float64(), pa.float64()],
+    }
+    return {name: pa.schema(list(zip(SNAPSHOT_COLUMNS[name], types[name]))) for name in types}
+
+
+def _to_table(rows: list, schema):
+    """Builds a typed Arrow table from row tuples; SQLite's date/time text is parsed here."""
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type):
+            text = pa.array(values, type=pa.string())
+            if pa.types.is_date(field.type):
+                parsed = pc.strptime(text, format="%Y-%m-%d", unit="s")
+            else:
+                parsed = pc.strptime(text, format=TIMESTAMP_FORMAT, unit="s")
+            arrays.append(parsed.cast(field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _month(row: tuple, columns: list) -> str:
+    """The YYYY-MM partition of a row: its business month, or its closing month for legacy rows."""
+    business_date = row[columns.index("business_date")]
+    return (business_date or row[columns.index("closed_at")])[:7]
+
+
+def _part_name(after: tuple | None) -> str:
+    """
+    Names a run's files after the cursor it started from, so re-running after
+    a crash overwrites the same files instead of adding duplicates.
+    """
+    if after is None:
+        return "part-0.parquet"
+    return f"part-{re.sub(r'[^0-9]', '', after[0])}-{after[1]}.parquet"
+
+
+def load_state(root: str = SNAPSHOT_DIR) -> dict:
+    """Returns the saved high-water mark, or {} before the first snapshot."""
+    path = os.path.join(root, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(root: str, state: dict):
+    path = os.path.join(root, STATE_FILE)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".part", path)
+
+
+class _MonthWriter:
+    """Writes one month partition of one dataset, buffering rows into large row groups."""
+
+    def __init__(self, path: str, schema, compression: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.temp_path = path + ".part"
+        self.schema = schema
+        self.rows = []
+        self._writer = pq.ParquetWriter(self.temp_path, schema, compression=compression)
+
+    def add(self, rows: list):
+        self.rows.extend(rows)
+        if len(self.rows) >= ROW_GROUP_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self._writer.write_table(_to_table(self.rows, self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def discard(self):
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def write_snapshot(analytics, root: str = SNAPSHOT_DIR, compression: str = "zstd", full: bool = False,
+                   batch_size: int = 5000, progress=None) -> dict:
+    """
+    Appends the orders closed since the last snapshot to month-partitioned
+    Parquet datasets under root:
+
+        orders/month=YYYY-MM/part-*.parquet
+        order_items/month=YYYY-MM/part-*.parquet
+
+    Each run adds one file per dataset and month it touches, then moves the
+    high-water mark in _snapshot_state.json forward. Files are written under
+    temporary names and the mark is only saved once they are all in place,
+    so an interrupted run is simply repeated. The directories can be read as
+    one dataset by pyarrow, pandas, DuckDB or Spark (hive partitioning).
+
+    Args:
+        analytics: The AnalyticsManager to read from.
+        root: Snapshot directory.
+        compression: Parquet codec ("zstd", "snappy", "gzip" or "none").
+        full: Delete the existing snapshot and re-export the whole history.
+        batch_size: Orders read from the database per batch.
+        progress: Optional callback(orders_written), called after every batch.
+
+    Returns:
+        {"orders": n, "order_items": n, "months": [...], "cursor": (closed_at, id) or None}
+    """
+    if pa is None:
+        raise RuntimeError("Parquet snapshots require the 'pyarrow' library.\nPlease install it using: pip install pyarrow")
+
+    if full:
+        for name in list(SNAPSHOT_COLUMNS) + [STATE_FILE]:
+            path = os.path.join(root, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+    os.makedirs(root, exist_ok=True)
+
+    state = load_state(root)
+    after = tuple(state["cursor"]) if state.get("cursor") else None
+    part = _part_name(after)
+    schemas = _schemas()
+    writers = {}  # (dataset, month) -> _MonthWriter
+    counts = {name: 0 for name in SNAPSHOT_COLUMNS}
+    last = None
+
+    batches = analytics.iter_closed_orders_since(after, batch_size)
+    try:
+        for orders, items, last in batches:
+            for name, rows in (("orders", orders), ("order_items", items)):
+                by_month = {}
+                for row in rows:
+                    by_month.setdefault(_month(row, SNAPSHOT_COLUMNS[name]), []).append(row)
+                for month, month_rows in by_month.items():
+                    writer = writers.get((name, month))
+                    if writer is None:
+                        path = os.path.join(root, name, f"month={month}", part)
+                        writer = writers[(name, month)] = _MonthWriter(path, schemas[name], compression)
+                    writer.add(month_rows)
+                counts[name] += len(rows)
+            if progress:
+                progress(counts["orders"])
+        for writer in writers.values():
+            writer.close()
+    except BaseException:
+        batches.close() # Returns the read connection to the pool straight away
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+    for writer in writers.values():
+        os.replace(writer.temp_path, writer.path)
+    if last is not None:
+        _save_state(root, {
+            "cursor": list(last),
+            "orders": state.get("orders", 0) + counts["orders"],
+            "order_items": state.get("order_items", 0) + counts["order_items"],
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    counts["months"] = sorted({month for _, month in writers})
+    counts["cursor"] = last
+    return counts
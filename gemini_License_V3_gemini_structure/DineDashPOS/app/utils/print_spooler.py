@@ -0,0 +1,216 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+try:
+    from escpos.printer import Usb
+except (ImportError, ModuleNotFoundError):
+    Usb = None
+
+class PrintSpooler:
+    """
+    A durable, asynchronous receipt print queue.
+    Jobs are stored in their own SQLite file (so printing never contends with
+    order writes) and sent by one background thread that keeps the ESC/POS
+    connection open between tickets. Failed jobs are retried with exponential
+    backoff; after MAX_ATTEMPTS they are dead-lettered and appended to the
+    day's receipt log so the receipt is never lost. Without python-escpos
+    installed, every job goes straight to that log.
+
+    A job is a list of printer commands, e.g. [["text", "..."], ["cut"]].
+    """
+    MAX_ATTEMPTS = 5
+    BASE_BACKOFF_S = 1.0
+    MAX_BACKOFF_S = 60.0
+
+    def __init__(self, vendor_id: int = 0x04b8, product_id: int = 0x0202, listener=None):
+        """
+        Args:
+            vendor_id: USB vendor ID of the thermal printer.
+            product_id: USB product ID of the thermal printer.
+            listener: Optional callback(job_id, status, detail) run on the worker
+                thread whenever a job finishes ('done', 'saved' or 'dead').
+        """
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.listener = listener
+        self.base_dir = os.path.join(os.path.expanduser("~"), "DineDashPOS")
+        self.receipts_dir = os.path.join(self.base_dir, "receipts")
+        os.makedirs(self.receipts_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.base_dir, "print_spool.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS print_jobs (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT,
+                    commands TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_print_jobs_status ON print_jobs (status, next_attempt_at)")
+            # Jobs interrupted by a crash are printed again
+            self._conn.execute("UPDATE print_jobs SET status='pending' WHERE status='printing'")
+
+        self._printer = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+        self._thread.start()
+
+    # --- Public API ---
+    def submit_text(self, text: str, title: str = "receipt") -> int:
+        """Queues a plain-text receipt followed by a paper cut."""
+        return self.submit([["text", text], ["cut"]], title)
+
+    def submit(self, commands: list, title: str = "receipt") -> int:
+        """Queues a job and returns its ID immediately; printing happens in the background."""
+        with self._lock, self._conn:
+            job_id = self._conn.execute(
+                "INSERT INTO print_jobs (title, commands) VALUES (?, ?)", (title, json.dumps(commands))
+            ).lastrowid
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id: int) -> sqlite3.Row | None:
+        """Returns the job's status, attempt count and last error."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title, status, attempts, last_error, created_at, finished_at FROM print_jobs WHERE id=?",
+                (job_id,)
+            ).fetchone()
+
+    def dead_letters(self) -> list:
+        """Returns jobs that exhausted their retries (their text was saved to a file)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title, attempts, last_error, created_at FROM print_jobs WHERE status='dead' ORDER BY id"
+            ).fetchall()
+
+    def retry(self, job_id: int):
+        """Puts a dead-lettered job back in the queue, e.g. after the printer is fixed."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE print_jobs SET status='pending', attempts=0, next_attempt_at=0 WHERE id=? AND status='dead'",
+                (job_id,)
+            )
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        """Stops the worker after the job in progress and closes the printer and queue."""
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._disconnect()
+        with self._lock:
+            self._conn.close()
+
+    # --- Worker ---
+    def _run(self):
+        """Worker loop: prints due jobs in order, sleeping until the next one is due."""
+        while not self._stopping.is_set():
+            job, wait = self._next_job()
+            if job is None:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            self._process(job)
+
+    def _next_job(self):
+        """
+        Claims the oldest pending job once it is due. Tickets print strictly in
+        order, so a job that is backing off holds back the ones behind it.
+        Returns (job, None) or (None, seconds to wait).
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            job = self._conn.execute(
+                "SELECT * FROM print_jobs WHERE status='pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if job is None:
+                return None, None
+            if job['next_attempt_at'] > now:
+                return None, job['next_attempt_at'] - now
+            self._conn.execute("UPDATE print_jobs SET status='printing' WHERE id=?", (job['id'],))
+        return job, None
+
+    def _process(self, job):
+        """Prints one job, or schedules a retry / dead-letters it on failure."""
+        commands = json.loads(job['commands'])
+        if Usb is None:
+            path = self._save_to_file(job, commands)
+            self._finish(job['id'], 'saved', path)
+            return
+        try:
+            self._send(commands)
+            self._finish(job['id'], 'done', None)
+        except Exception as e:
+            self._disconnect() # Reconnect from scratch on the next attempt
+            attempts = job['attempts'] + 1
+            if attempts >= self.MAX_ATTEMPTS:
+                path = self._save_to_file(job, commands)
+                self._finish(job['id'], 'dead', f"{e}; saved to {path}", attempts)
+                return
+            delay = min(self.MAX_BACKOFF_S, self.BASE_BACKOFF_S * 2 ** (attempts - 1))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE print_jobs SET status='pending', attempts=?, next_attempt_at=?, last_error=? WHERE id=?",
+                    (attempts, time.time() + delay, str(e), job['id'])
+                )
+            print(f"Print job {job['id']} failed (attempt {attempts}), retrying in {delay:.0f}s: {e}")
+
+    def _send(self, commands: list):
+        """Sends commands over the persistent printer connection, opening it if needed."""
+        if self._printer is None:
+            self._printer = Usb(self.vendor_id, self.product_id)
+        for command, *args in commands:
+            if command == "text":
+                self._printer.text(args[0])
+            elif command == "set":
+                self._printer.set(**args[0])
+            elif command == "cut":
+                self._printer.cut()
+
+    def _disconnect(self):
+        """Closes the printer connection, ignoring errors from a device that went away."""
+        if self._printer is not None:
+            try:
+                self._printer.close()
+            except Exception:
+                pass
+            self._printer = None
+
+    def _save_to_file(self, job, commands: list) -> str:
+        """Appends a job's text to the day's receipt log as a fallback (one file per day, not per job)."""
+        now = datetime.now()
+        path = os.path.join(self.receipts_dir, f"receipts_{now:%Y-%m-%d}.txt")
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(f"----- {job['title']} #{job['id']} {now:%H:%M:%S} -----\n")
+            f.write("".join(args[0] for command, *args in commands if command == "text"))
+            f.write("\n")
+        return path
+
+    def _finish(self, job_id: int, status: str, detail: str | None, attempts: int = None):
+        """Records a job's final state and notifies the listener."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE print_jobs SET status=?, last_error=COALESCE(?, last_error), "
+                "attempts=COALESCE(?, attempts), finished_at=CURRENT_TIMESTAMP WHERE id=?",
+                (status, detail if status == 'dead' else None, attempts, job_id)
+            )
+        if self.listener:
+            try:
+                self.listener(job_id, status, detail)
+            except Exception as e:
+                print(f"Error in print spooler listener: {e}")
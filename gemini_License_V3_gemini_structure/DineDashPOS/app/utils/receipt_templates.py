@@ -0,0 +1,255 @@
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+except (ImportError, ModuleNotFoundError):
+    canvas = None
+
+# Characters per line for each output. 80mm is Font A on an Epson TM-T88;
+# "pdf" only limits how much of an item name fits before the amounts.
+PAPER_WIDTHS = {"58mm": 32, "80mm": 42, "pdf": 60}
+DEFAULT_PAPER = "80mm"
+
+# One laid-out receipt line. align is 'left', 'center' or 'rule' (a divider
+# made of `left` characters); right is an optional right-aligned column.
+Line = namedtuple("Line", "align bold left right")
+
+# The receipt layout, shared by every paper size. Each entry is a tuple:
+#   ("center", text, bold)      static centered text
+#   ("rule", char)              full-width divider
+#   ("blank",)                  empty line
+#   ("flag", key, text)         centered text, only if details[key] is truthy
+#   ("field", label, key)       "label: value" from details
+#   ("items",)                  one row per order item
+#   ("amount", label, key, bold) label on the left, money on the right
+RECEIPT_LAYOUT = (
+    ("center", "=" * 10, False),
+    ("center", "DINEDASH RESTAURANT", True),
+    ("center", "Premium Dining Experience", False),
+    ("center", "=" * 10, False),
+    ("blank",),
+    ("flag", "is_reprint", "*** REPRINT ***"),
+    ("field", "Date", "timestamp"),
+    ("field", "Table", "table_name"),
+    ("field", "Server", "user_name"),
+    ("rule", "-"),
+    ("items",),
+    ("rule", "-"),
+    ("amount", "Subtotal:", "subtotal", False),
+    ("amount", "Tax (10%):", "tax", False),
+    ("rule", "="),
+    ("amount", "TOTAL:", "total", True),
+    ("rule", "="),
+    ("blank",),
+    ("center", "Thank you for dining with us!", False),
+    ("center", "Visit us again soon!", False),
+    ("blank",),
+    ("blank",),
+)
+
+
+class ReceiptTemplate:
+    """
+    A receipt layout compiled for one paper width.
+    Compiling resolves everything that does not depend on the order up front:
+    static lines are laid out and formatted once, and dynamic lines become
+    small closures with their column widths baked into format strings. A
+    render is then a single pass over the compiled steps, which keeps
+    reprints and batch output cheap. Get instances through get_template().
+    """
+    def __init__(self, layout, width: int, currency: str = "$"):
+        """
+        Args:
+            layout: A layout tuple such as RECEIPT_LAYOUT.
+            width: Characters per line.
+            currency: Symbol printed before money amounts.
+        """
+        self.width = width
+        self.currency = currency
+        self._steps = [self._compile(spec) for spec in layout]
+
+    def render(self, details: dict) -> "Receipt":
+        """
+        Lays out one receipt.
+
+        Args:
+            details: Order data with 'items' (rows with product_name, quantity
+                and price_at_time), 'subtotal', 'tax', 'total', the header
+                fields and optionally 'is_reprint'.
+        """
+        lines = []
+        for step in self._steps:
+            if isinstance(step, list):
+                lines.extend(step)
+            else:
+                step(details, lines)
+        return Receipt(lines, self.width)
+
+    # --- Compilation ---
+    def _format(self, line: Line) -> tuple:
+        """Pairs a line with its plain-text form."""
+        width = self.width
+        if line.align == "rule":
+            return line, line.left * width
+        if line.align == "center":
+            return line, line.left[:width].center(width).rstrip()
+        if line.right is None:
+            return line, line.left[:width]
+        room = max(0, width - len(line.right) - 1)
+        return line, f"{line.left[:room]:<{room}} {line.right}"
+
+    def _compile(self, spec):
+        """Turns a layout entry into a list of static lines or a render closure."""
+        kind = spec[0]
+        fmt = self._format
+        money = self.currency + "{:.2f}"
+
+        if kind == "center":
+            return [fmt(Line("center", spec[2], spec[1], None))]
+        if kind == "rule":
+            return [fmt(Line("rule", False, spec[1], None))]
+        if kind == "blank":
+            return [fmt(Line("left", False, "", None))]
+
+        if kind == "flag":
+            _, key, text = spec
+            flagged = [fmt(Line("center", True, text, None)), fmt(Line("left", False, "", None))]
+            def step(details, out):
+                if details.get(key):
+                    out.extend(flagged)
+            return step
+
+        if kind == "field":
+            _, label, key = spec
+            prefix = f"{label}: "
+            def step(details, out):
+                out.append(fmt(Line("left", False, prefix + str(details.get(key, "")), None)))
+            return step
+
+        if kind == "amount":
+            _, label, key, bold = spec
+            def step(details, out):
+                out.append(fmt(Line("left", bold, label, money.format(details[key]))))
+            return step
+
+        if kind == "items":
+            item_right = f"{{:>10}} {{:>{max(9, len(self.currency) + 7)}}}"
+            def step(details, out):
+                for item in details['items']:
+                    quantity, price = item['quantity'], item['price_at_time']
+                    right = item_right.format(f"{quantity}x {money.format(price)}", money.format(quantity * price))
+                    out.append(fmt(Line("left", False, item['product_name'], right)))
+            return step
+
+        raise ValueError(f"Unknown receipt layout entry '{kind}'")
+
+
+class Receipt:
+    """
+    A rendered receipt that can be emitted as plain text, raw ESC/POS bytes,
+    PrintSpooler commands or a PDF page. All outputs come from the same
+    laid-out lines, so they never drift apart.
+    """
+    ESC_INIT = b"\x1b@"
+    ESC_BOLD = {False: b"\x1bE\x00", True: b"\x1bE\x01"}
+    FEED_AND_CUT = b"\x1dV\x42\x00"
+
+    def __init__(self, lines: list, width: int):
+        self.lines = lines  # (Line, text) pairs
+        self.width = width
+
+    @property
+    def text(self) -> str:
+        """The receipt as plain text."""
+        return "\n".join(text for _, text in self.lines) + "\n"
+
+    def escpos(self, encoding: str = "cp437") -> bytes:
+        """The receipt as raw ESC/POS bytes, ending with a paper cut."""
+        out = bytearray(self.ESC_INIT)
+        bold = False
+        for line, text in self.lines:
+            if line.bold != bold:
+                bold = line.bold
+                out += self.ESC_BOLD[bold]
+            out += text.encode(encoding, "replace") + b"\n"
+        if bold:
+            out += self.ESC_BOLD[False]
+        out += self.FEED_AND_CUT
+        return bytes(out)
+
+    def commands(self) -> list:
+        """The receipt as a PrintSpooler job (text runs split by bold changes)."""
+        commands, run, bold = [], [], False
+        for line, text in self.lines:
+            if line.bold != bold:
+                if run:
+                    commands.append(["text", "\n".join(run) + "\n"])
+                    run = []
+                bold = line.bold
+                commands.append(["set", {"bold": bold}])
+            run.append(text)
+        if run:
+            commands.append(["text", "\n".join(run) + "\n"])
+        if bold:
+            commands.append(["set", {"bold": False}])
+        commands.append(["cut"])
+        return commands
+
+    def to_pdf(self, path: str) -> str:
+        """Writes the receipt to a one-page PDF and returns the path."""
+        return write_pdf([self], path)
+
+    def draw(self, pdf, page_size):
+        """Draws the receipt onto a reportlab canvas, starting new pages as needed."""
+        page_width, page_height = page_size
+        margin, leading = 50, 16
+        y = page_height - margin
+        for line, _ in self.lines:
+            if y < margin:
+                pdf.showPage()
+                y = page_height - margin
+            pdf.setFont("Helvetica-Bold" if line.bold else "Helvetica", 11)
+            if line.align == "rule":
+                pdf.line(margin, y + 4, page_width - margin, y + 4)
+            elif line.align == "center":
+                pdf.drawCentredString(page_width / 2, y, line.left)
+            else:
+                pdf.drawString(margin, y, line.left)
+                if line.right is not None:
+                    pdf.drawRightString(page_width - margin, y, line.right)
+            y -= leading
+
+
+@lru_cache(maxsize=None)
+def get_template(paper: str = DEFAULT_PAPER) -> ReceiptTemplate:
+    """Returns the receipt template for a paper size, compiling it on first use."""
+    if paper not in PAPER_WIDTHS:
+        raise ValueError(f"Unknown paper size '{paper}', expected one of {', '.join(PAPER_WIDTHS)}")
+    return ReceiptTemplate(RECEIPT_LAYOUT, PAPER_WIDTHS[paper])
+
+
+def render_receipt(details: dict, paper: str = DEFAULT_PAPER) -> Receipt:
+    """Renders one receipt with the compiled template for a paper size."""
+    return get_template(paper).render(details)
+
+
+def write_pdf(receipts, path: str, page_size=None) -> str:
+    """
+    Writes receipts to a PDF, one receipt per page, e.g. for batch reprints.
+
+    Args:
+        receipts: Receipts rendered with the "pdf" template.
+        path: Output file path.
+        page_size: reportlab page size, letter by default.
+    """
+    if canvas is None:
+        raise RuntimeError("PDF receipts need reportlab. Run: pip install reportlab")
+    page_size = page_size or letter
+    pdf = canvas.Canvas(str(path), pagesize=page_size)
+    for receipt in receipts:
+        receipt.draw(pdf, page_size)
+        pdf.showPage()
+    pdf.save()
+    return path
@@ -0,0 +1,76 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+class TaskRunner:
+    """
+    Runs blocking work (mostly SQL) off the Tk main loop.
+    Reads go to a small thread pool; writes go to a single worker so they are
+    applied in the order they were submitted. Results are handed back to the
+    Tk thread through a queue that is drained with `after()`, because Tk
+    widgets must only be touched from the thread that created them.
+    """
+    def __init__(self, root, max_workers: int = 4, poll_ms: int = 30):
+        """
+        Args:
+            root: The Tk root window used to schedule callbacks.
+            max_workers: Number of threads used for read tasks.
+            poll_ms: How often the result queue is drained on the Tk thread.
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self._readers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._callbacks = queue.SimpleQueue()
+        self._poll_job = self.root.after(self.poll_ms, self._drain)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        """Runs a read task on the worker pool and returns its Future."""
+        return self._submit(self._readers, fn, args, kwargs, on_success, on_error)
+
+    def submit_write(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        """Runs a write task on the single ordered writer thread and returns its Future."""
+        return self._submit(self._writer, fn, args, kwargs, on_success, on_error)
+
+    def call_soon(self, callback, *args):
+        """Schedules a callback on the Tk thread. Safe to call from any thread."""
+        self._callbacks.put((callback, args))
+
+    def _submit(self, executor, fn, args, kwargs, on_success, on_error):
+        """Submits a task and routes its outcome back to the Tk thread."""
+        future = executor.submit(fn, *args, **kwargs)
+
+        def deliver(done):
+            error = done.exception()
+            if error is not None:
+                self.call_soon(on_error or self._report_error, error)
+            elif on_success is not None:
+                self.call_soon(on_success, done.result())
+
+        future.add_done_callback(deliver)
+        return future
+
+    def _drain(self):
+        """Runs every queued callback on the Tk thread, then re-arms itself."""
+        while True:
+            try:
+                callback, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in background task callback: {e}")
+        self._poll_job = self.root.after(self.poll_ms, self._drain)
+
+    @staticmethod
+    def _report_error(error):
+        """Default error handler for tasks submitted without on_error."""
+        print(f"Background task failed: {error}")
+
+    def shutdown(self):
+        """Stops delivering callbacks and waits for queued writes to finish."""
+        if self._poll_job:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._readers.shutdown(wait=False, cancel_futures=True)
+        self._writer.shutdown(wait=True)
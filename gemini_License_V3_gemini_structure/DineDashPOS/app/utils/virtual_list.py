@@ -0,0 +1,181 @@
+import math
+import tkinter as tk
+import customtkinter as ctk
+from app.utils.style import Style
+
+class VirtualList(ctk.CTkFrame):
+    """
+    A scrolling list that only creates widgets for the rows on screen.
+    Rows have a fixed height; a small pool of row widgets is re-bound to
+    whichever items are visible as the user scrolls, so 100k items cost the
+    same as 10. Items are fetched a page at a time in the background and the
+    next page is requested when the user scrolls near the end.
+    """
+    PREFETCH_ROWS = 20  # Fetch the next page when this close to the end
+
+    def __init__(self, parent, tasks, row_height: int, create_row, bind_row, empty_text: str = "Nothing to show", **kwargs):
+        """
+        Args:
+            parent: The parent widget.
+            tasks: The App's TaskRunner, used to fetch pages off the UI thread.
+            row_height: Height of every row in pixels, including spacing.
+            create_row: Called with a fixed-height slot frame; builds a row inside
+                it (filling the slot) and returns the row widget.
+            bind_row: Called with (row, item) to show an item in a pooled row.
+            empty_text: Message shown when the first page is empty.
+        """
+        super().__init__(parent, fg_color=kwargs.pop("fg_color", Style.BACKGROUND), **kwargs)
+        self.tasks = tasks
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.empty_text = empty_text
+
+        self.items = []
+        self.offset = 0          # Pixels scrolled from the top
+        self.fetch = None        # fetch(cursor) -> (items, next_cursor), run on a worker
+        self.cursor = None
+        self.has_more = False
+        self.loading = False
+        self._token = None       # Identifies the current reset() so stale pages are dropped
+        self._slots = []         # Pooled (slot frame, row widget) pairs
+        self._bound = []         # Index of the item each pooled row shows
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.status_label = ctk.CTkLabel(self.body, text="", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED)
+
+        self.body.bind("<Configure>", lambda e: self._render())
+        self._bind_wheel(self)
+
+    # --- Data ---
+    def reset(self, fetch):
+        """Clears the list and starts loading from the first page of a new query."""
+        self.fetch = fetch
+        self._token = object()
+        self.items = []
+        self.offset = 0
+        self.cursor = None
+        self.has_more = True
+        self.loading = False
+        self._bound = [None] * len(self._slots)
+        self._show_status("Loading...")
+        self._render()
+        self._load_more()
+
+    def _load_more(self):
+        """Requests the next page unless one is already on its way."""
+        if self.loading or not self.has_more or self.fetch is None:
+            return
+        self.loading = True
+        token = self._token
+        self.tasks.submit(
+            self.fetch, self.cursor,
+            on_success=lambda result: self._on_page(token, result),
+            on_error=lambda error: self._on_page_failed(token, error)
+        )
+
+    def _on_page(self, token, result):
+        """Appends a fetched page (Tk thread); pages from a superseded query are ignored."""
+        if token is not self._token or not self.winfo_exists():
+            return
+        page, self.cursor = result
+        self.has_more = self.cursor is not None
+        self.loading = False
+        self.items.extend(page)
+        if self.items:
+            self.status_label.place_forget()
+        else:
+            self._show_status(self.empty_text)
+        self._render()
+
+    def _on_page_failed(self, token, error):
+        if token is not self._token or not self.winfo_exists():
+            return
+        self.loading = False
+        self.has_more = False
+        self._show_status(f"Failed to load: {error}")
+
+    def _show_status(self, text):
+        self.status_label.configure(text=text)
+        self.status_label.place(relx=0.5, y=50, anchor="n")
+        self.status_label.lift()
+
+    # --- Scrolling ---
+    def _content_height(self) -> int:
+        return len(self.items) * self.row_height
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, self._content_height() - self.body.winfo_height())
+        offset = min(max(0, int(offset)), max_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, *args):
+        """Handles scrollbar drags ('moveto') and arrow/page clicks ('scroll')."""
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * self._content_height())
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self.body.winfo_height() if unit == "pages" else self.row_height
+            self._scroll_to(self.offset + amount * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) in (4, 5): # X11
+            direction = -1 if event.num == 4 else 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self._scroll_to(self.offset + direction * self.row_height)
+
+    def _bind_wheel(self, widget):
+        """
+        Binds the wheel on a widget and everything inside it. Wheel events go to
+        the widget under the pointer and do not propagate to parents, so each
+        one needs the binding; it is added alongside any existing bindings and
+        never touches the app-wide ones CTkScrollableFrame relies on.
+        """
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            # tk.Misc.bind directly, as CTk widgets forward their own bind() to inner widgets
+            tk.Misc.bind(widget, sequence, self._on_wheel, "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    # --- Rendering ---
+    def _render(self):
+        """Places pooled rows over the visible items and updates the scrollbar."""
+        height = self.body.winfo_height()
+        if height <= 1:
+            return # Not laid out yet; <Configure> will call again
+
+        needed = math.ceil(height / self.row_height) + 1
+        while len(self._slots) < needed:
+            slot_frame = ctk.CTkFrame(self.body, fg_color="transparent", height=self.row_height)
+            slot_frame.pack_propagate(False)
+            self._slots.append((slot_frame, self.create_row(slot_frame)))
+            self._bind_wheel(slot_frame)
+            self._bound.append(None)
+
+        first = self.offset // self.row_height
+        shift = self.offset % self.row_height
+        for slot, (slot_frame, row) in enumerate(self._slots):
+            index = first + slot
+            if slot < needed and index < len(self.items):
+                if self._bound[slot] != index:
+                    self.bind_row(row, self.items[index])
+                    self._bound[slot] = index
+                slot_frame.place(x=0, y=slot * self.row_height - shift, relwidth=1.0)
+            else:
+                slot_frame.place_forget()
+                self._bound[slot] = None
+
+        total = self._content_height()
+        if total > height:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        if first + needed >= len(self.items) - self.PREFETCH_ROWS:
+            self._load_more()
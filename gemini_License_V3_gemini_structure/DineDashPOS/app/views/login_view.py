@@ -56,5 +56,6 @@ class LoginScreen(ctk.CTkFrame):
     def login(self, user):
         """Sets the current user in the controller and navigates to the table screen."""
         self.controller.current_user = dict(user)
+        self.controller.images.prefetch_catalog() # Warm menu thumbnails before the first order
         self.controller.show_frame("TableScreen")
 
@@ -1,26 +1,37 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from app.utils.style import Style
-from app.utils.image_manager import ImageManager
-from datetime import datetime
-
-try:
-    from escpos.printer import Usb
-except (ImportError, ModuleNotFoundError):
-    Usb = None
-import os
+from app.utils.receipt_templates import render_receipt
+from app.db import events
 
 class OrderScreen(ctk.CTkFrame):
     """
     The main screen for taking and managing customer orders.
     It displays the menu, the current order details, and handles payment.
+    Item edits go into an OrderSession and are written to the database in one
+    transaction on settle, when leaving the screen, or after a short idle pause.
     """
+    IDLE_FLUSH_MS = 3000
+
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color=Style.BACKGROUND)
         self.controller = controller
         self.db = controller.get_db()
         self.current_category = None
         self.current_order_details = {}
+        self.session = None
+        self.flush_job = None
+        self.item_rows = {}         # product_id -> widgets and values of its order line
+        self.rows_editable = True
+        self.placeholder_label = None
+        self.subtotal = 0.0
+        # Menu tabs and per-category grids are cached until the catalog changes
+        self.category_buttons = {}
+        self.category_grids = {}    # category -> {'frame', 'add_buttons', 'enabled'}
+        self.shown_category = None
+        self.menu_products = None    # product list the cached tabs and grids were built from
+        self.pending_products = None # newer product list, loaded in the background, not built yet
+        self.menu_enabled = True
         
         # Configure grid layout
         self.grid_columnconfigure(0, weight=2)
@@ -57,6 +68,7 @@ class OrderScreen(ctk.CTkFrame):
         # Menu items grid
         self.menu_items_frame = ctk.CTkScrollableFrame(menu_frame, fg_color=Style.BACKGROUND)
         self.menu_items_frame.grid(row=2, column=0, sticky="nsew", padx=20, pady=10)
+        self.menu_items_frame.grid_columnconfigure(0, weight=1)
         
         # Right panel - Order
         order_frame = ctk.CTkFrame(self, fg_color=Style.CARD_BG, corner_radius=0)
@@ -99,6 +111,10 @@ class OrderScreen(ctk.CTkFrame):
             fg_color=Style.ACCENT, height=50, command=self.print_receipt
         )
 
+        for topic in (events.CATALOG, events.EXTERNAL):
+            self.db.events.subscribe(topic, self.on_catalog_changed)
+        self.on_catalog_changed(events.CATALOG) # Load the menu before the screen is first shown
+
     def create_total_row(self, parent, row, text, font=Style.BODY_FONT):
         ctk.CTkLabel(
             parent, text=text, font=font, text_color=Style.TEXT
@@ -114,75 +130,174 @@ class OrderScreen(ctk.CTkFrame):
         
         self.table_label.configure(text=f"🍽️ {self.controller.selected_table_name}")
         
-        # --- UPDATED LOGIC ---
-        order = self.db.orders.get_open_order_for_table(self.controller.selected_table_id)
-        if order:
-            self.controller.current_order_id = order['id']
-        else:
-            self.controller.current_order_id = self.db.orders.create_order(
-                self.controller.selected_table_id, self.controller.current_user['id']
-            )
-        
+        # The order is opened on the writer thread; the panel shows a placeholder meanwhile
+        self.controller.current_order_id = None
+        self.session = None
         self._set_pre_payment_state()
         self.load_categories()
-        self.load_order_items()
+        self.show_order_placeholder("Loading order...")
+        table_id = self.controller.selected_table_id
+        self.controller.tasks.submit_write(
+            self._open_order_for_table, table_id, self.controller.current_user['id'],
+            on_success=lambda result: self._on_order_opened(table_id, result),
+            on_error=lambda e: self.show_order_placeholder(f"Could not open order: {e}")
+        )
+
+    def _open_order_for_table(self, table_id, user_id):
+        """Finds or creates the table's open order and starts an editing session (worker thread)."""
+        order = self.db.orders.get_open_order_for_table(table_id)
+        order_id = order['id'] if order else self.db.orders.create_order(table_id, user_id)
+        return self.db.orders.session(order_id)
+
+    def _on_order_opened(self, table_id, session):
+        """Shows the opened order, unless the user has already moved to another table."""
+        if table_id != self.controller.selected_table_id:
+            return
+        self.session = session
+        self.controller.current_order_id = session.order_id
+        self.render_order_items(session.items())
+
+    def on_hide(self):
+        """Called by the controller when navigating away; saves pending edits."""
+        self.flush_session()
+
+    def _schedule_flush(self):
+        """(Re)starts the idle timer that saves pending edits."""
+        if self.flush_job:
+            self.after_cancel(self.flush_job)
+        self.flush_job = self.after(self.IDLE_FLUSH_MS, self.flush_session)
+
+    def flush_session(self):
+        """Writes the session's pending edits in the background, if there are any."""
+        if self.flush_job:
+            self.after_cancel(self.flush_job)
+            self.flush_job = None
+        if self.session and not self.session.closed and self.session.dirty:
+            self.controller.tasks.submit_write(
+                self.session.flush,
+                on_error=lambda e: messagebox.showerror("❌ Error", f"Failed to save order changes: {e}")
+            )
+
+    def show_order_placeholder(self, text):
+        """Replaces the order panel with a single status message."""
+        self._clear_item_rows()
+        self.current_order_details = {}
+        self.placeholder_label = ctk.CTkLabel(
+            self.order_items_frame, text=text, font=Style.BODY_FONT,
+            text_color=Style.TEXT_MUTED
+        )
+        self.placeholder_label.pack(pady=50)
+
+    def on_catalog_changed(self, topic, **payload):
+        """Re-checks the catalog after a product edit or another terminal's commit. May be called from any thread."""
+        self.controller.tasks.submit(self.db.crud.get_products, on_success=self._on_catalog_loaded)
+
+    def _on_catalog_loaded(self, products):
+        """Queues a menu rebuild if the products differ from the ones the cached grids show."""
+        latest = self.pending_products if self.pending_products is not None else self.menu_products
+        if products == latest:
+            return
+        self.pending_products = products
+        if self.controller.current_frame == "OrderScreen":
+            self.load_categories(is_enabled=self.menu_enabled)
 
     def load_categories(self, is_enabled=True):
-        """Loads and displays product category tabs."""
-        for widget in self.category_frame.winfo_children():
-            widget.destroy()
-        
-        # --- UPDATED LINE ---
-        categories = self.db.crud.get_product_categories()
-        if not categories:
+        """
+        Shows the product category tabs and the selected category's menu.
+        Tabs and grids are built once and reused; they are only rebuilt after
+        the catalog changes. Until the first catalog load arrives there is
+        nothing to show; _on_catalog_loaded calls back here when it does.
+        """
+        if self.pending_products is not None:
+            self._rebuild_menu(self.pending_products)
+        if not self.category_buttons:
             return
             
-        self.current_category = categories[0]
+        # Keep the selected tab across redraws unless its category disappeared
+        if self.current_category not in self.category_buttons:
+            self.current_category = next(iter(self.category_buttons))
+        
+        if is_enabled != self.menu_enabled:
+            self.menu_enabled = is_enabled
+            for btn in self.category_buttons.values():
+                btn.configure(state="normal" if is_enabled else "disabled")
+        
+        self.set_category(self.current_category)
+
+    def _rebuild_menu(self, products):
+        """Recreates the category tabs from a loaded product list and discards every cached grid."""
+        for widget in self.category_frame.winfo_children():
+            widget.destroy()
+        for grid in self.category_grids.values():
+            grid['frame'].destroy()
+        self.category_buttons = {}
+        self.category_grids = {}
+        self.shown_category = None
+        self.menu_products = products
+        self.pending_products = None
         
         icons = {"Appetizers": "🥗", "Mains": "🍽️", "Desserts": "🍰", "Drinks": "🥤"}
-        for category in categories:
+        for category in sorted({product['category'] for product in products}):
             icon = icons.get(category, "🍴")
             
             btn = ctk.CTkButton(
                 self.category_frame, text=f"{icon} {category}", font=Style.BUTTON_FONT,
-                fg_color=Style.ACCENT if category == self.current_category else Style.FRAME_BG,
+                fg_color=Style.FRAME_BG,
                 command=lambda c=category: self.set_category(c)
             )
             btn.pack(side="left", padx=8, pady=5)
-            
-            if not is_enabled:
+            if not self.menu_enabled:
                 btn.configure(state="disabled")
-        
-        self.load_menu_items(is_enabled=is_enabled)
+            self.category_buttons[category] = btn
 
     def set_category(self, category):
-        """Handles category tab selection."""
+        """Handles category tab selection by swapping in that category's cached grid."""
         self.current_category = category
-        self.load_categories()
-        self.load_menu_items()
+        for name, btn in self.category_buttons.items():
+            btn.configure(fg_color=Style.ACCENT if name == category else Style.FRAME_BG)
+        self.load_menu_items(is_enabled=self.menu_enabled)
 
     def load_menu_items(self, is_enabled=True):
-        """Loads and displays menu items for the selected category."""
-        for widget in self.menu_items_frame.winfo_children():
-            widget.destroy()
-        
-        # --- UPDATED LINE ---
-        all_products = self.db.crud.get_products()
-        products = [p for p in all_products if p['category'] == self.current_category]
+        """Shows the menu grid for the selected category, building it on first use."""
+        grid = self.category_grids.get(self.current_category)
+        if grid is None:
+            grid = self._build_menu_grid(self.current_category)
+            self.category_grids[self.current_category] = grid
+        
+        if grid['enabled'] != is_enabled:
+            for add_btn in grid['add_buttons']:
+                add_btn.configure(state="normal" if is_enabled else "disabled")
+            grid['enabled'] = is_enabled
+        
+        if self.shown_category != self.current_category:
+            if self.shown_category in self.category_grids:
+                self.category_grids[self.shown_category]['frame'].grid_remove()
+            grid['frame'].grid()
+            self.shown_category = self.current_category
+
+    def _build_menu_grid(self, category):
+        """Builds the product cards for one category in their own (initially hidden) frame."""
+        grid_frame = ctk.CTkFrame(self.menu_items_frame, fg_color="transparent")
+        grid_frame.grid(row=0, column=0, sticky="nsew")
+        grid_frame.grid_remove()
+        add_buttons = []
+        
+        products = [product for product in self.menu_products if product['category'] == category]
         num_columns = 3
         
         for i, product in enumerate(products):
             row, col = divmod(i, num_columns)
             
-            product_card = ctk.CTkFrame(self.menu_items_frame, fg_color=Style.CARD_BG, corner_radius=15)
+            product_card = ctk.CTkFrame(grid_frame, fg_color=Style.CARD_BG, corner_radius=15)
             product_card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew", ipadx=5, ipady=10)
             
             try:
-                product_image = ImageManager.get_product_image(product.get('image'), (120, 120))
-                if product_image:
-                    image_label = ctk.CTkLabel(product_card, image=product_image, text="")
-                    image_label.pack(pady=(10, 5))
-                    image_label.image = product_image
+                image_label = ctk.CTkLabel(product_card, text="")
+                product_image = self.controller.images.request(
+                    product.get('image'), (120, 120), lambda photo, l=image_label: self._swap_image(l, photo)
+                )
+                self._swap_image(image_label, product_image)
+                image_label.pack(pady=(10, 5))
             except Exception:
                 pass
             
@@ -201,66 +316,139 @@ class OrderScreen(ctk.CTkFrame):
                 command=lambda p=product: self.add_to_order(p)
             )
             add_btn.pack(pady=(0, 10), padx=10, fill="x")
-            if not is_enabled:
-                add_btn.configure(state="disabled")
+            add_buttons.append(add_btn)
         
         for i in range(num_columns):
-            self.menu_items_frame.grid_columnconfigure(i, weight=1)
+            grid_frame.grid_columnconfigure(i, weight=1)
+        return {'frame': grid_frame, 'add_buttons': add_buttons, 'enabled': True}
+
+    @staticmethod
+    def _swap_image(label, photo):
+        """Shows an image on a card label, e.g. when a prefetched thumbnail arrives."""
+        if label.winfo_exists():
+            label.configure(image=photo)
+            label.image = photo
 
     def add_to_order(self, product):
         """Adds a product to the current order."""
-        if not self.controller.current_order_id:
+        if not self.session or self.session.closed:
             return
         
-        # --- UPDATED LINE ---
-        self.db.orders.add_order_item(
-            self.controller.current_order_id, product['id'], 1, product['price']
-        )
-        self.load_order_items()
+        self.session.add(product['id'], product['name'], product['price'])
+        self._refresh_item(product['id'])
+        self._schedule_flush()
 
     def load_order_items(self, is_editable=True):
-        """Loads and displays items for the current order."""
-        for widget in self.order_items_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.controller.current_order_id:
+        """Displays the current order's items, including edits not yet saved."""
+        if self.session:
+            self.render_order_items(self.session.items(), is_editable)
+
+    def render_order_items(self, order_items, is_editable=True):
+        """
+        Reconciles the order panel with the given items. Rows are keyed by
+        product (an order has one line per product), so only rows whose
+        quantity or price changed are touched, and only new or removed lines
+        create or destroy widgets.
+        """
+        if is_editable != self.rows_editable:
+            self._clear_item_rows() # The +/- controls differ, so start over
+            self.rows_editable = is_editable
+        elif self.placeholder_label and not self.item_rows:
+            self.placeholder_label.destroy() # e.g. "Loading order..."
+            self.placeholder_label = None
+
+        current ={item['product_id']: item for item in order_items}
+        for product_id in [key for key in self.item_rows if key not in current]:
+            self.sync_item_row(product_id, None)
+        for product_id, item in current.items():
+            self.sync_item_row(product_id, item)
+
+        self.current_order_details["items"] = list(order_items)
+        self._update_totals()
+
+    def sync_item_row(self, product_id, item):
+        """Creates, updates or removes the row for one order line and adjusts the subtotal."""
+        row = self.item_rows.get(product_id)
+        if item is None:
+            if row:
+                self.subtotal -= row['line_total']
+                row['frame'].destroy()
+                del self.item_rows[product_id]
+            return
+
+        line_total = item['price_at_time'] * item['quantity']
+        if row is None:
+            row = self._create_item_row(item)
+            self.item_rows[product_id] = row
+            self.subtotal += line_total
+        elif (row['quantity'], row['price']) != (item['quantity'], item['price_at_time']):
+            row['price_label'].configure(
+                text=f"${item['price_at_time']:.2f} × {item['quantity']} = ${line_total:.2f}"
+            )
+            if row['quantity_label']:
+                row['quantity_label'].configure(text=str(item['quantity']))
+            self.subtotal += line_total - row['line_total']
+        else:
             return
+        row.update(quantity=item['quantity'], price=item['price_at_time'], line_total=line_total)
+
+    def _create_item_row(self, item):
+        """Builds the widgets for one order line and returns the row record."""
+        if self.placeholder_label:
+            self.placeholder_label.destroy()
+            self.placeholder_label = None
+
+        item_frame = ctk.CTkFrame(self.order_items_frame, fg_color=Style.BACKGROUND, corner_radius=10)
+        item_frame.pack(fill="x", pady=5, padx=5)
         
-        # --- UPDATED LINE ---
-        order_items = self.db.orders.get_order_items(self.controller.current_order_id)
+        details_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
+        details_frame.pack(side="left", fill="x", expand=True, padx=10, pady=10)
         
-        if not order_items:
-            ctk.CTkLabel(
-                self.order_items_frame, text="No items in order", font=Style.BODY_FONT,
-                text_color=Style.TEXT_MUTED
-            ).pack(pady=50)
-        
-        subtotal = 0
-        for item in order_items:
-            item_frame = ctk.CTkFrame(self.order_items_frame, fg_color=Style.BACKGROUND, corner_radius=10)
-            item_frame.pack(fill="x", pady=5, padx=5)
-            
-            details_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
-            details_frame.pack(side="left", fill="x", expand=True, padx=10, pady=10)
-            
-            ctk.CTkLabel(details_frame, text=item['product_name'], font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(anchor="w")
-            ctk.CTkLabel(
-                details_frame, text=f"${item['price_at_time']:.2f} × {item['quantity']} = ${item['price_at_time'] * item['quantity']:.2f}",
-                font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED
-            ).pack(anchor="w")
-            
-            if is_editable:
-                controls_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
-                controls_frame.pack(side="right", padx=10)
-                
-                ctk.CTkButton(controls_frame, text="-", width=30, height=30, fg_color=Style.DANGER, hover_color="#c92a2a",
-                              command=lambda i=item: self.update_quantity(i, -1)).pack(side="left", padx=2)
-                ctk.CTkLabel(controls_frame, text=str(item['quantity']), font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(side="left", padx=10)
-                ctk.CTkButton(controls_frame, text="+", width=30, height=30, fg_color=Style.SUCCESS, hover_color=Style.ACCENT_HOVER,
-                              command=lambda i=item: self.update_quantity(i, 1)).pack(side="left", padx=2)
-            
-            subtotal += item['price_at_time'] * item['quantity']
+        ctk.CTkLabel(details_frame, text=item['product_name'], font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(anchor="w")
+        price_label = ctk.CTkLabel(
+            details_frame, text=f"${item['price_at_time']:.2f} × {item['quantity']} = ${item['price_at_time'] * item['quantity']:.2f}",
+            font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED
+        )
+        price_label.pack(anchor="w")
         
+        quantity_label = None
+        if self.rows_editable:
+            controls_frame = ctk.CTkFrame(item_frame, fg_color="transparent")
+            controls_frame.pack(side="right", padx=10)
+            
+            ctk.CTkButton(controls_frame, text="-", width=30, height=30, fg_color=Style.DANGER, hover_color="#c92a2a",
+                          command=lambda i=item: self.update_quantity(i, -1)).pack(side="left", padx=2)
+            quantity_label = ctk.CTkLabel(controls_frame, text=str(item['quantity']), font=Style.BUTTON_FONT, text_color=Style.TEXT)
+            quantity_label.pack(side="left", padx=10)
+            ctk.CTkButton(controls_frame, text="+", width=30, height=30, fg_color=Style.SUCCESS, hover_color=Style.ACCENT_HOVER,
+                          command=lambda i=item: self.update_quantity(i, 1)).pack(side="left", padx=2)
+
+        return {
+            'frame': item_frame, 'price_label': price_label, 'quantity_label': quantity_label,
+            'quantity': item['quantity'], 'price': item['price_at_time'],
+            'line_total': item['price_at_time'] * item['quantity'],
+        }
+
+    def _clear_item_rows(self):
+        """Destroys every row in the order panel and resets the running subtotal."""
+        for widget in self.order_items_frame.winfo_children():
+            widget.destroy()
+        self.item_rows = {}
+        self.placeholder_label = None
+        self.subtotal = 0.0
+
+    def _update_totals(self):
+        """Refreshes the totals from the running subtotal and shows the empty message if needed."""
+        if not self.item_rows:
+            self.subtotal = 0.0 # Drop any floating point residue
+            if not self.placeholder_label:
+                self.placeholder_label = ctk.CTkLabel(
+                    self.order_items_frame, text="No items in order", font=Style.BODY_FONT,
+                    text_color=Style.TEXT_MUTED
+                )
+                self.placeholder_label.pack(pady=50)
+
+        subtotal = self.subtotal
         tax = subtotal * 0.10
         total = subtotal + tax
         
@@ -268,17 +456,25 @@ class OrderScreen(ctk.CTkFrame):
         self.tax_label.configure(text=f"${tax:.2f}")
         self.total_label.configure(text=f"${total:.2f}")
         
-        self.current_order_details = {"items": order_items, "subtotal": subtotal, "tax": tax, "total": total}
+        self.current_order_details.update(subtotal=subtotal, tax=tax, total=total)
 
     def update_quantity(self, item, delta):
         """Updates the quantity of an item in the order."""
-        # --- UPDATED LINE ---
-        self.db.orders.update_order_item_quantity(item['id'], delta)
-        self.load_order_items()
+        if not self.session or self.session.closed:
+            return
+        self.session.change_quantity(item['product_id'], delta)
+        self._refresh_item(item['product_id'])
+        self._schedule_flush()
+
+    def _refresh_item(self, product_id):
+        """Updates just the row of the line that changed."""
+        self.sync_item_row(product_id, self.session.item(product_id))
+        self.current_order_details["items"] = self.session.items()
+        self._update_totals()
 
     def settle_order(self):
         """Finalizes and closes the current order."""
-        if not self.controller.current_order_id:
+        if not self.session or self.session.closed:
             return
         
         if not self.current_order_details.get("items"):
@@ -286,10 +482,26 @@ class OrderScreen(ctk.CTkFrame):
             return
         
         if messagebox.askyesno("💳 Confirm Payment", "Has the customer paid for this order?"):
-            # --- UPDATED LINE ---
-            self.db.orders.close_order(self.controller.current_order_id)
-            self._set_post_payment_state()
-            messagebox.showinfo("✅ Success", "Order settled successfully!")
+            self.settle_button.configure(state="disabled")
+            if self.flush_job:
+                self.after_cancel(self.flush_job)
+                self.flush_job = None
+            # Pending edits are flushed in the same transaction that closes the order
+            self.controller.tasks.submit_write(
+                self.session.settle,
+                on_success=self._on_order_settled, on_error=self._on_settle_failed
+            )
+
+    def _on_order_settled(self, _):
+        """Switches to the post-payment state once the order is closed."""
+        self.settle_button.configure(state="normal")
+        self._set_post_payment_state()
+        messagebox.showinfo("✅ Success", "Order settled successfully!")
+
+    def _on_settle_failed(self, error):
+        """Re-enables settling after a failed close."""
+        self.settle_button.configure(state="normal")
+        messagebox.showerror("❌ Error", f"Failed to settle order: {error}")
 
     def _set_pre_payment_state(self):
         """Sets the UI to the state before an order is paid."""
@@ -304,83 +516,21 @@ class OrderScreen(ctk.CTkFrame):
         self.load_order_items(is_editable=False)
 
     def print_receipt(self):
-        """Prints the receipt for the just-settled order."""
-        receipt_details = self.current_order_details.copy()
-        receipt_details["table_name"] = self.controller.selected_table_name
-        receipt_details["user_name"] = self.controller.current_user['username']
-        receipt_details["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        self._print_receipt_logic(receipt_details)
+        """Prints the archived receipt of the just-settled order."""
+        self.controller.tasks.submit(
+            self.db.receipts.get_receipt, self.session.order_id,
+            on_success=self._print_receipt_logic,
+            on_error=lambda e: messagebox.showerror("❌ Print Error", f"Failed to load receipt: {e}")
+        )
 
     def _print_receipt_logic(self, receipt_details, is_reprint=False):
-        """Formats and prints a receipt, with a fallback to saving as a text file."""
-        receipt_text = self._format_receipt(receipt_details, is_reprint)
-        
-        # Try to print to a connected USB thermal printer
-        if Usb:
-            try:
-                # You may need to change these vendor and product IDs for your specific printer
-                printer = Usb(0x04b8, 0x0202) 
-                printer.text(receipt_text)
-                printer.cut()
-                if not is_reprint:
-                    messagebox.showinfo("🖨️ Success", "Receipt sent to printer!")
-                return
-            except Exception:
-                pass # Fallback to saving file if printer not found
-        
-        # Fallback: Save to a text file
+        """Renders a receipt with the compiled template and hands it to the background print spooler."""
+        receipt = render_receipt(dict(receipt_details, is_reprint=is_reprint))
         try:
-            receipts_dir = os.path.join(os.path.expanduser("~"), "DineDashPOS", "receipts")
-            os.makedirs(receipts_dir, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"receipt_{timestamp}.txt"
-            filepath = os.path.join(receipts_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(receipt_text)
-            
-            messagebox.showinfo("🖨️ Receipt Saved", f"No printer found.\nReceipt saved to:\n{filepath}")
+            self.controller.spooler.submit(receipt.commands(), "reprint" if is_reprint else "receipt")
         except Exception as e:
-            messagebox.showerror("❌ Print Error", f"Failed to print or save receipt: {str(e)}")
-
-    def _format_receipt(self, details, is_reprint=False):
-        """Formats the receipt details into a string for printing."""
-        lines = []
-        center = lambda s, w=40: s.center(w)
-        
-        lines.append(center("=" * 10))
-        lines.append(center("DINEDASH RESTAURANT"))
-        lines.append(center("Premium Dining Experience"))
-        lines.append(center("=" * 10))
-        lines.append("")
-        
-        if is_reprint:
-            lines.append(center("*** REPRINT ***"))
-            lines.append("")
-        
-        lines.append(f"Date: {details['timestamp']}")
-        lines.append(f"Table: {details['table_name']}")
-        lines.append(f"Server: {details['user_name']}")
-        lines.append("-" * 40)
-        
-        for item in details['items']:
-            name = item['product_name'][:18]
-            qty_price = f"{item['quantity']}x ${item['price_at_time']:.2f}"
-            total = f"${item['quantity'] * item['price_at_time']:.2f}"
-            lines.append(f"{name:<18} {qty_price:>10} {total:>10}")
-            
-        lines.append("-" * 40)
-        lines.append(f"{'Subtotal:':<30}{f'${details['subtotal']:.2f}':>10}")
-        lines.append(f"{'Tax (10%):':<30}{f'${details['tax']:.2f}':>10}")
-        lines.append("=" * 40)
-        lines.append(f"{'TOTAL:':<30}{f'${details['total']:.2f}':>10}")
-        lines.append("=" * 40)
-        lines.append("")
-        lines.append(center("Thank you for dining with us!"))
-        lines.append(center("Visit us again soon!"))
-        lines.append("\n\n")
-        
-        return "\n".join(lines)
+            messagebox.showerror("❌ Print Error", f"Failed to queue receipt: {str(e)}")
+            return
+        if not is_reprint:
+            messagebox.showinfo("🖨️ Printing", "Receipt sent to the printer queue.")
 
@@ -1,13 +1,11 @@
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 from app.utils.style import Style
+from app.utils.virtual_list import VirtualList
+from app.utils.export_writers import WRITERS, WORKBOOK_REPORTS, ExportCancelled, export_report, export_workbook
 from datetime import datetime
-import os
+import threading
 
-try:
-    import pandas as pd
-except (ImportError, ModuleNotFoundError):
-    pd = None
 try:
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     import matplotlib.pyplot as plt
@@ -20,6 +18,9 @@ class ReportsScreen(ctk.CTkFrame):
     Admin-only screen for viewing historical reports and analytics.
     Provides various views like daily sales, top products, and data export.
     """
+    HISTORY_ROW_HEIGHT = 100
+    HISTORY_PAGE_SIZE = 100
+
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color=Style.BACKGROUND)
         self.controller = controller
@@ -91,27 +92,59 @@ class ReportsScreen(ctk.CTkFrame):
         content_frame = ctk.CTkScrollableFrame(dialog, fg_color=Style.BACKGROUND)
         content_frame.pack(fill="both", expand=True, padx=30, pady=10)
         
-        # --- UPDATED LINE ---
-        sales_data = self.db.analytics.get_daily_sales_summary()
-        
-        if not sales_data or not sales_data['total_orders']:
-            ctk.CTkLabel(content_frame, text="No sales data for today", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
-            return
+        def render(sales_data):
+            if not sales_data or not sales_data['total_orders']:
+                ctk.CTkLabel(content_frame, text="No sales data for today", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
+                return
         
-        summary_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-        summary_frame.pack(fill="x", pady=20)
+            summary_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+            summary_frame.pack(fill="x", pady=20)
         
-        self.create_summary_card(summary_frame, "Total Sales", f"${sales_data['total_sales']:.2f}", Style.SUCCESS)
-        self.create_summary_card(summary_frame, "Orders", str(sales_data['total_orders']), Style.ACCENT)
-        self.create_summary_card(summary_frame, "Avg Order", f"${sales_data['average_order']:.2f}", Style.WARNING)
+            self.create_summary_card(summary_frame, "Total Sales", f"${sales_data['total_sales']:.2f}", Style.SUCCESS)
+            self.create_summary_card(summary_frame, "Orders", str(sales_data['total_orders']), Style.ACCENT)
+            self.create_summary_card(summary_frame, "Avg Order", f"${sales_data['average_order']:.2f}", Style.WARNING)
         
-        if sales_data['sales_by_category']:
-            ctk.CTkLabel(content_frame, text="Sales by Category", font=Style.HEADER_FONT, text_color=Style.TEXT).pack(pady=(30, 10))
-            for category, amount in sales_data['sales_by_category'].items():
-                cat_frame = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
-                cat_frame.pack(fill="x", pady=5)
-                ctk.CTkLabel(cat_frame, text=category, font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(side="left", padx=20, pady=10)
-                ctk.CTkLabel(cat_frame, text=f"${amount:.2f}", font=Style.BUTTON_FONT, text_color=Style.ACCENT).pack(side="right", padx=20, pady=10)
+            if sales_data['sales_by_category']:
+                ctk.CTkLabel(content_frame, text="Sales by Category", font=Style.HEADER_FONT, text_color=Style.TEXT).pack(pady=(30, 10))
+                for category, amount in sales_data['sales_by_category'].items():
+                    cat_frame = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
+                    cat_frame.pack(fill="x", pady=5)
+                    ctk.CTkLabel(cat_frame, text=category, font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(side="left", padx=20, pady=10)
+                    ctk.CTkLabel(cat_frame, text=f"${amount:.2f}", font=Style.BUTTON_FONT, text_color=Style.ACCENT).pack(side="right", padx=20, pady=10)
+
+        self.load_into(content_frame, render, self.db.analytics.get_daily_sales_summary)
+
+    def load_into(self, frame, render, fn, *args, **kwargs):
+        """
+        Shows a loading placeholder in a frame, runs a query in the background
+        and hands its result to `render` on the Tk thread. A newer load into the
+        same frame (e.g. a changed filter) supersedes any that are still running.
+
+        Args:
+            frame: The container that is cleared and filled by `render`.
+            render: Callback taking the query result.
+            fn: The database method to run off the UI thread.
+        """
+        for widget in frame.winfo_children():
+            widget.destroy()
+        placeholder = ctk.CTkLabel(frame, text="Loading...", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED)
+        placeholder.pack(pady=50)
+        token = object()
+        frame.load_token = token
+
+        def is_current():
+            return frame.winfo_exists() and getattr(frame, "load_token", None) is token
+
+        def on_success(result):
+            if is_current():
+                placeholder.destroy()
+                render(result)
+
+        def on_error(error):
+            if is_current():
+                placeholder.configure(text=f"Failed to load report: {error}")
+
+        return self.controller.tasks.submit(fn, *args, on_success=on_success, on_error=on_error, **kwargs)
 
     def create_summary_card(self, parent, title, value, color):
         """Helper function to create a summary card for report dialogs."""
@@ -139,12 +172,10 @@ class ReportsScreen(ctk.CTkFrame):
         chart_frame.pack(fill="both", expand=True, padx=30, pady=20)
         
         def update_chart(period_choice):
-            for widget in chart_frame.winfo_children():
-                widget.destroy()
-            
-            # --- UPDATED LINE ---
-            sales_data = self.db.analytics.get_sales_by_period(period_choice)
-            
+            self.load_into(chart_frame, lambda data: draw_chart(period_choice, data),
+                           self.db.analytics.get_sales_by_period, period_choice)
+
+        def draw_chart(period_choice, sales_data):
             if not sales_data or not plt:
                 ctk.CTkLabel(chart_frame, text="No data available or matplotlib not installed", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(expand=True)
                 return
@@ -188,27 +219,27 @@ class ReportsScreen(ctk.CTkFrame):
         content_frame = ctk.CTkScrollableFrame(dialog, fg_color=Style.BACKGROUND)
         content_frame.pack(fill="both", expand=True, padx=30, pady=10)
         
-        # --- UPDATED LINE ---
-        top_products = self.db.analytics.get_top_products(limit=10)
-        
-        if not top_products:
-            ctk.CTkLabel(content_frame, text="No sales data available", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
-            return
+        def render(top_products):
+            if not top_products:
+                ctk.CTkLabel(content_frame, text="No sales data available", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
+                return
         
-        for i, product in enumerate(top_products, 1):
-            product_frame = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
-            product_frame.pack(fill="x", pady=5)
+            for i, product in enumerate(top_products, 1):
+                product_frame = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
+                product_frame.pack(fill="x", pady=5)
             
-            rank_color = Style.WARNING if i <= 3 else Style.TEXT_MUTED
-            ctk.CTkLabel(product_frame, text=f"#{i}", font=Style.HEADER_FONT, text_color=rank_color, width=50).pack(side="left", padx=20)
+                rank_color = Style.WARNING if i <= 3 else Style.TEXT_MUTED
+                ctk.CTkLabel(product_frame, text=f"#{i}", font=Style.HEADER_FONT, text_color=rank_color, width=50).pack(side="left", padx=20)
             
-            info_frame = ctk.CTkFrame(product_frame, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True, pady=15)
+                info_frame = ctk.CTkFrame(product_frame, fg_color="transparent")
+                info_frame.pack(side="left", fill="x", expand=True, pady=15)
             
-            ctk.CTkLabel(info_frame, text=product['name'], font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(anchor="w")
-            ctk.CTkLabel(info_frame, text=f"Sold: {product['quantity_sold']} units", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED).pack(anchor="w")
+                ctk.CTkLabel(info_frame, text=product['name'], font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(anchor="w")
+                ctk.CTkLabel(info_frame, text=f"Sold: {product['quantity_sold']} units", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED).pack(anchor="w")
             
-            ctk.CTkLabel(product_frame, text=f"${product['revenue']:.2f}", font=Style.HEADER_FONT, text_color=Style.ACCENT).pack(side="right", padx=20)
+                ctk.CTkLabel(product_frame, text=f"${product['revenue']:.2f}", font=Style.HEADER_FONT, text_color=Style.ACCENT).pack(side="right", padx=20)
+
+        self.load_into(content_frame, render, self.db.analytics.get_top_products, limit=10)
 
     def show_staff_performance(self):
         """Displays a dialog with sales performance for each staff member."""
@@ -224,29 +255,29 @@ class ReportsScreen(ctk.CTkFrame):
         content_frame = ctk.CTkScrollableFrame(dialog, fg_color=Style.BACKGROUND)
         content_frame.pack(fill="both", expand=True, padx=30, pady=10)
         
-        # --- UPDATED LINE ---
-        staff_data = self.db.analytics.get_staff_performance()
-        
-        if not staff_data:
-            ctk.CTkLabel(content_frame, text="No performance data available", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
-            return
+        def render(staff_data):
+            if not staff_data:
+                ctk.CTkLabel(content_frame, text="No performance data available", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
+                return
             
-        for staff in staff_data:
-            staff_card = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
-            staff_card.pack(fill="x", pady=10)
+            for staff in staff_data:
+                staff_card = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
+                staff_card.pack(fill="x", pady=10)
             
-            info_frame = ctk.CTkFrame(staff_card, fg_color="transparent")
-            info_frame.pack(fill="x", padx=20, pady=15)
+                info_frame = ctk.CTkFrame(staff_card, fg_color="transparent")
+                info_frame.pack(fill="x", padx=20, pady=15)
             
-            icon = "👑" if staff['role'] == 'Admin' else "👨‍🍳"
-            ctk.CTkLabel(info_frame, text=f"{icon} {staff['username']}", font=Style.HEADER_FONT, text_color=Style.TEXT).pack(anchor="w")
+                icon = "👑" if staff['role'] == 'Admin' else "👨‍🍳"
+                ctk.CTkLabel(info_frame, text=f"{icon} {staff['username']}", font=Style.HEADER_FONT, text_color=Style.TEXT).pack(anchor="w")
             
-            stats_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-            stats_frame.pack(fill="x", pady=10)
+                stats_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+                stats_frame.pack(fill="x", pady=10)
             
-            self.create_stat_item(stats_frame, "Orders", str(staff['total_orders']), 0)
-            self.create_stat_item(stats_frame, "Revenue", f"${staff['total_sales']:.2f}", 1)
-            self.create_stat_item(stats_frame, "Avg Order", f"${staff['average_order']:.2f}", 2)
+                self.create_stat_item(stats_frame, "Orders", str(staff['total_orders']), 0)
+                self.create_stat_item(stats_frame, "Revenue", f"${staff['total_sales']:.2f}", 1)
+                self.create_stat_item(stats_frame, "Avg Order", f"${staff['average_order']:.2f}", 2)
+
+        self.load_into(content_frame, render, self.db.analytics.get_staff_performance)
 
     def create_stat_item(self, parent, label, value, column):
         """Helper to create a small stat display item."""
@@ -258,7 +289,11 @@ class ReportsScreen(ctk.CTkFrame):
         ctk.CTkLabel(stat_frame, text=value, font=Style.BUTTON_FONT, text_color=Style.ACCENT).pack()
 
     def show_order_history(self):
-        """Displays a dialog with a filterable list of all past orders."""
+        """
+        Displays a dialog with a filterable list of all past orders.
+        Orders are fetched a page at a time and only the visible rows have
+        widgets, so even "All Time" on a large database opens instantly.
+        """
         dialog = ctk.CTkToplevel(self)
         dialog.title("Order History")
         dialog.geometry("1000x700")
@@ -271,43 +306,50 @@ class ReportsScreen(ctk.CTkFrame):
         filter_frame = ctk.CTkFrame(dialog, fg_color="transparent")
         filter_frame.pack(pady=10)
         
-        content_frame = ctk.CTkScrollableFrame(dialog, fg_color=Style.BACKGROUND)
-        content_frame.pack(fill="both", expand=True, padx=30, pady=10)
+        history_list = VirtualList(dialog, self.controller.tasks, self.HISTORY_ROW_HEIGHT,
+                                   self._create_history_row, self._bind_history_row,
+                                   empty_text="No orders found for this period")
+        history_list.pack(fill="both", expand=True, padx=30, pady=10)
         
         def load_orders(date_filter):
-            for widget in content_frame.winfo_children():
-                widget.destroy()
-            
-            # --- UPDATED LINE ---
-            orders = self.db.analytics.get_order_history(date_filter)
-            
-            if not orders:
-                ctk.CTkLabel(content_frame, text="No orders found for this period", font=Style.BODY_FONT, text_color=Style.TEXT_MUTED).pack(pady=50)
-                return
-            
-            for order in orders:
-                order_card = ctk.CTkFrame(content_frame, fg_color=Style.CARD_BG, corner_radius=10)
-                order_card.pack(fill="x", pady=5)
-                
-                header_frame = ctk.CTkFrame(order_card, fg_color="transparent")
-                header_frame.pack(fill="x", padx=20, pady=15)
-                
-                ctk.CTkLabel(header_frame, text=f"Order #{order['id']}", font=Style.BUTTON_FONT, text_color=Style.TEXT).pack(side="left")
-                ctk.CTkLabel(header_frame, text=f"${order['total']:.2f}", font=Style.BUTTON_FONT, text_color=Style.ACCENT).pack(side="right")
-                
-                details_frame = ctk.CTkFrame(order_card, fg_color="transparent")
-                details_frame.pack(fill="x", padx=20, pady=(0, 15))
-                
-                ctk.CTkLabel(details_frame, text=f"Table: {order['table_name']} | Server: {order['user_name']}", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED).pack(anchor="w")
-                ctk.CTkLabel(details_frame, text=f"Date: {order['closed_at']}", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED).pack(anchor="w")
-                
-                ctk.CTkButton(order_card, text="View Details", height=25, fg_color=Style.SECONDARY, hover_color="#fd8f30",
-                              command=lambda o=order: self.show_order_details(o)).pack(pady=(0, 10))
+            history_list.reset(lambda cursor: self.db.analytics.get_order_history_page(
+                date_filter, cursor, self.HISTORY_PAGE_SIZE))
         
         ctk.CTkOptionMenu(filter_frame, values=["Today", "Last 7 Days", "Last 30 Days", "All Time"],
                           command=load_orders).pack(side="left", padx=5)
         load_orders("Today") # Initial view
 
+    def _create_history_row(self, slot):
+        """Builds one reusable order card for the history list."""
+        order_card = ctk.CTkFrame(slot, fg_color=Style.CARD_BG, corner_radius=10)
+        order_card.pack(fill="both", expand=True, pady=5)
+        
+        header_frame = ctk.CTkFrame(order_card, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(10, 0))
+        order_card.id_label = ctk.CTkLabel(header_frame, text="", font=Style.BUTTON_FONT, text_color=Style.TEXT)
+        order_card.id_label.pack(side="left")
+        order_card.details_button = ctk.CTkButton(header_frame, text="View Details", width=110, height=25,
+                                                  fg_color=Style.SECONDARY, hover_color="#fd8f30")
+        order_card.details_button.pack(side="right", padx=(15, 0))
+        order_card.total_label = ctk.CTkLabel(header_frame, text="", font=Style.BUTTON_FONT, text_color=Style.ACCENT)
+        order_card.total_label.pack(side="right")
+        
+        details_frame = ctk.CTkFrame(order_card, fg_color="transparent")
+        details_frame.pack(fill="x", padx=20, pady=(0, 10))
+        order_card.info_label = ctk.CTkLabel(details_frame, text="", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED)
+        order_card.info_label.pack(anchor="w")
+        order_card.date_label = ctk.CTkLabel(details_frame, text="", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED)
+        order_card.date_label.pack(anchor="w")
+        return order_card
+
+    def _bind_history_row(self, order_card, order):
+        """Shows an order in a pooled history card."""
+        order_card.id_label.configure(text=f"Order #{order['id']}")
+        order_card.total_label.configure(text=f"${order['total']:.2f}")
+        order_card.info_label.configure(text=f"Table: {order['table_name']} | Server: {order['user_name']}")
+        order_card.date_label.configure(text=f"Date: {order['closed_at']}")
+        order_card.details_button.configure(command=lambda: self.show_order_details(order))
+
     def show_order_details(self, order):
         """Displays a dialog showing the itemized details of a single past order."""
         detail_dialog = ctk.CTkToplevel(self)
@@ -328,28 +370,29 @@ class ReportsScreen(ctk.CTkFrame):
         items_frame = ctk.CTkScrollableFrame(detail_dialog, fg_color=Style.BACKGROUND)
         items_frame.pack(fill="both", expand=True, padx=30, pady=10)
         
-        # --- UPDATED LINE ---
-        order_items = self.db.orders.get_order_items(order['id'])
-        
-        for item in order_items:
-            item_frame = ctk.CTkFrame(items_frame, fg_color=Style.CARD_BG, corner_radius=10)
-            item_frame.pack(fill="x", pady=5)
-            ctk.CTkLabel(item_frame, text=f"{item['product_name']} x{item['quantity']}", font=Style.BODY_FONT, text_color=Style.TEXT).pack(side="left", padx=20, pady=10)
-            ctk.CTkLabel(item_frame, text=f"${item['price_at_time'] * item['quantity']:.2f}", font=Style.BODY_FONT, text_color=Style.ACCENT).pack(side="right", padx=20, pady=10)
+        def render_items(order_items):
+            for item in order_items:
+                item_frame = ctk.CTkFrame(items_frame, fg_color=Style.CARD_BG, corner_radius=10)
+                item_frame.pack(fill="x", pady=5)
+                ctk.CTkLabel(item_frame, text=f"{item['product_name']} x{item['quantity']}", font=Style.BODY_FONT, text_color=Style.TEXT).pack(side="left", padx=20, pady=10)
+                ctk.CTkLabel(item_frame, text=f"${item['price_at_time'] * item['quantity']:.2f}", font=Style.BODY_FONT, text_color=Style.ACCENT).pack(side="right", padx=20, pady=10)
+
+        self.load_into(items_frame, render_items, self.db.orders.get_order_items, order['id'])
             
         total_frame = ctk.CTkFrame(detail_dialog, fg_color=Style.CARD_BG, corner_radius=10)
         total_frame.pack(fill="x", padx=30, pady=10)
         ctk.CTkLabel(total_frame, text=f"Total: ${order['total']:.2f}", font=Style.HEADER_FONT, text_color=Style.ACCENT).pack(pady=15)
 
     def export_data(self):
-        """Opens a dialog to export various reports to an Excel file."""
-        if not pd:
-            messagebox.showerror("❌ Missing Library", "Excel export requires the 'pandas' library.\nPlease install it using: pip install pandas")
-            return
-            
+        """
+        Opens a dialog to export a report to Excel, CSV or JSON Lines, or every
+        report as one Excel workbook. The export streams from the database in
+        batches on a worker thread, so memory stays flat however long the
+        history is; progress is shown as it goes and the export can be cancelled.
+        """
         dialog = ctk.CTkToplevel(self)
         dialog.title("Export Data")
-        dialog.geometry("500x400")
+        dialog.geometry("500x720")
         dialog.configure(fg_color=Style.FRAME_BG)
         dialog.transient(self.controller)
         dialog.grab_set()
@@ -366,38 +409,125 @@ class ReportsScreen(ctk.CTkFrame):
             ("Monthly Sales Report", "monthly_sales"),
             ("Product Sales Report", "product_sales"),
             ("Staff Performance Report", "staff_performance"),
-            ("Complete Order History", "order_history")
+            ("Complete Order History", "order_history"),
+            ("Full Workbook (all reports, Excel)", "full_workbook")
         ]
         
+        def on_type_changed():
+            # The full workbook is always an Excel file
+            format_menu.configure(state="disabled" if export_type.get() == "full_workbook" else "normal")
+
         for text, value in options:
-            ctk.CTkRadioButton(options_frame, text=text, variable=export_type, value=value, font=Style.BODY_FONT).pack(anchor="w", pady=5)
-        
-        def export():
-            export_dir = filedialog.askdirectory(title="Select Export Location")
-            if not export_dir: return
-            
-            try:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"DineDash_{export_type.get()}_{timestamp}.xlsx"
-                filepath = os.path.join(export_dir, filename)
-                
-                with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                    report_map = {
-                        "daily_sales": self.db.analytics.get_daily_sales_details,
-                        "monthly_sales": self.db.analytics.get_monthly_sales_details,
-                        "product_sales": self.db.analytics.get_product_sales_details,
-                        "staff_performance": self.db.analytics.get_staff_performance_details,
-                        "order_history": self.db.analytics.get_complete_order_history
-                    }
-                    sheet_name = export_type.get().replace('_', ' ').title()
-                    data = report_map[export_type.get()]()
-                    df = pd.DataFrame(data)
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                messagebox.showinfo("✅ Success", f"Data exported successfully!\nFile saved to: {filepath}")
+            ctk.CTkRadioButton(options_frame, text=text, variable=export_type, value=value, font=Style.BODY_FONT,
+                               command=on_type_changed).pack(anchor="w", pady=5)
+
+        export_format = ctk.StringVar(value=next(iter(WRITERS)))
+        format_menu = ctk.CTkOptionMenu(dialog, values=list(WRITERS), variable=export_format)
+        format_menu.pack(pady=10)
+
+        progress_bar = ctk.CTkProgressBar(dialog, width=360)
+        progress_bar.set(0)
+        progress_label = ctk.CTkLabel(dialog, text="", font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED)
+        progress_label.pack(pady=(10, 0))
+        sheets_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        sheet_rows = {}  # report -> (status label, progress bar), for the full workbook
+        cancel_event = threading.Event()
+        
+        def on_progress(written, total):
+            """Called on the export thread; hands the numbers to the Tk thread."""
+            self.controller.tasks.call_soon(show_progress, written, total)
+
+        def show_progress(written, total):
+            if dialog.winfo_exists():
+                progress_bar.set(written / total if total else 1)
+                progress_label.configure(text=f"{written:,} of {total:,} rows written")
+
+        def on_sheet_progress(report, written, total):
+            """Called on the export thread for each sheet of the full workbook."""
+            self.controller.tasks.call_soon(show_sheet_progress, report, written, total)
+
+        def show_sheet_progress(report, written, total):
+            if not dialog.winfo_exists():
+                return
+            status, bar = sheet_rows[report]
+            bar.set(written / total if total else 1)
+            state = "done" if written >= total else f"{written:,} / {total:,}"
+            status.configure(text=f"{report.replace('_', ' ').title()}: {state}")
+
+        def show_sheet_rows():
+            for widget in sheets_frame.winfo_children():
+                widget.destroy()
+            sheet_rows.clear()
+            for report in WORKBOOK_REPORTS:
+                status = ctk.CTkLabel(sheets_frame, text=f"{report.replace('_', ' ').title()}: waiting",
+                                      font=Style.SMALL_FONT, text_color=Style.TEXT_MUTED)
+                status.pack(anchor="w")
+                bar = ctk.CTkProgressBar(sheets_frame, width=360)
+                bar.set(0)
+                bar.pack(pady=(0, 6))
+                sheet_rows[report] = (status, bar)
+            sheets_frame.pack(pady=(10, 0))
+
+        def finish():
+            cancel_event.clear()
+            progress_bar.pack_forget()
+            sheets_frame.pack_forget()
+            cancel_button.pack_forget()
+            export_button.pack(pady=30)
+
+        def on_done(filepath, rows):
+            if isinstance(rows, dict): # Full workbook: rows per sheet
+                rows = sum(rows.values())
+            messagebox.showinfo("✅ Success", f"Exported {rows:,} rows.\nFile saved to: {filepath}")
+            if dialog.winfo_exists():
                 dialog.destroy()
-            except Exception as e:
-                messagebox.showerror("❌ Export Error", f"Failed to export data: {str(e)}", parent=dialog)
+
+        def on_failed(error):
+            if not dialog.winfo_exists():
+                return
+            finish()
+            if isinstance(error, ExportCancelled):
+                progress_label.configure(text="Export cancelled.")
+            else:
+                progress_label.configure(text="")
+                messagebox.showerror("❌ Export Error", f"Failed to export data: {str(error)}", parent=dialog)
         
-        ctk.CTkButton(dialog, text="📥 Export to Excel", font=Style.BUTTON_FONT, fg_color=Style.SUCCESS, command=export).pack(pady=30)
+        def export():
+            full_workbook = export_type.get() == "full_workbook"
+            format_label = "Excel (.xlsx)" if full_workbook else export_format.get()
+            writer_class = WRITERS[format_label]
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = filedialog.asksaveasfilename(
+                title="Select Export Location", parent=dialog, defaultextension=writer_class.extension,
+                initialfile=f"DineDash_{export_type.get()}_{timestamp}{writer_class.extension}",
+                filetypes=[(format_label, f"*{writer_class.extension}")]
+            )
+            if not filepath: return
 
+            export_button.pack_forget()
+            progress_label.configure(text="Building workbook..." if full_workbook else "Starting export...")
+            if full_workbook:
+                show_sheet_rows()
+            else:
+                progress_bar.pack(pady=(20, 0))
+                progress_bar.set(0)
+            cancel_button.pack(pady=20)
+            if full_workbook:
+                # Each sheet's query runs on its own read connection; see export_workbook
+                self.controller.tasks.submit(
+                    export_workbook, self.db.analytics, WORKBOOK_REPORTS, filepath,
+                    progress=on_sheet_progress, cancel_event=cancel_event,
+                    on_success=lambda rows: on_done(filepath, rows), on_error=on_failed
+                )
+            else:
+                self.controller.tasks.submit(
+                    export_report, self.db.analytics, export_type.get(), filepath, writer_class,
+                    progress=on_progress, cancel_event=cancel_event,
+                    on_success=lambda rows: on_done(filepath, rows), on_error=on_failed
+                )
+        
+        export_button = ctk.CTkButton(dialog, text="📥 Export", font=Style.BUTTON_FONT, fg_color=Style.SUCCESS, command=export)
+        export_button.pack(pady=30)
+        cancel_button = ctk.CTkButton(dialog, text="Cancel Export", font=Style.BUTTON_FONT, fg_color=Style.DANGER, command=cancel_event.set)
+        # Closing the dialog also stops a running export
+        dialog.protocol("WM_DELETE_WINDOW", lambda: (cancel_event.set(), dialog.destroy()))
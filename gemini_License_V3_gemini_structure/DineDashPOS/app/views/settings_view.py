@@ -217,6 +217,13 @@ class SettingsScreen(ctk.CTkFrame):
         
         self.load_products()
 
+    @staticmethod
+    def _swap_image(label, photo):
+        """Shows an image on a product row, e.g. when a prefetched thumbnail arrives."""
+        if label.winfo_exists():
+            label.configure(image=photo)
+            label.image = photo
+
     def load_products(self):
         """Loads and displays all menu products, grouped by category."""
         for widget in self.products_frame.winfo_children():
@@ -245,11 +252,12 @@ class SettingsScreen(ctk.CTkFrame):
                 image_frame.pack_propagate(False)
                 
                 try:
-                    product_image = ImageManager.get_product_image(product.get('image'), (50, 50))
-                    if product_image:
-                        image_label = ctk.CTkLabel(image_frame, image=product_image, text="")
-                        image_label.pack(expand=True)
-                        image_label.image = product_image
+                    image_label = ctk.CTkLabel(image_frame, text="")
+                    product_image = self.controller.images.request(
+                        product.get('image'), (50, 50), lambda photo, l=image_label: self._swap_image(l, photo)
+                    )
+                    self._swap_image(image_label, product_image)
+                    image_label.pack(expand=True)
                 except Exception:
                     pass
                 
@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from app.utils.style import Style
+from app.db import events
 from datetime import datetime
 
 try:
@@ -12,13 +13,20 @@ except (ImportError, ModuleNotFoundError):
 class StatsScreen(ctk.CTkFrame):
     """
     Admin-only screen for viewing a live dashboard of restaurant activity.
-    Displays key performance indicators and charts that update automatically.
+    Displays key performance indicators and charts that update automatically
+    whenever the database change feed reports a relevant change.
     """
+    # Topics that can change any figure on the dashboard
+    WATCHED_TOPICS = (events.ORDERS, events.TABLES, events.USERS, events.CATALOG, events.EXTERNAL)
+
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color=Style.BACKGROUND)
         self.controller = controller
         self.db = controller.get_db()
         self.update_job = None
+        self.is_subscribed = False
+        self.stats_future = None
+        self.rerun_update = False
         
         # Header
         header = ctk.CTkFrame(self, fg_color=Style.FRAME_BG, corner_radius=0, height=80)
@@ -87,16 +95,37 @@ class StatsScreen(ctk.CTkFrame):
         return {"value_label": value_label}
 
     def refresh(self):
-        """Called when the screen is shown. Starts the auto-update loop."""
+        """Called when the screen is shown. Starts listening for data changes."""
         self.update_stats()
         self.start_auto_update()
 
     def update_stats(self):
-        """Fetches fresh data and updates all widgets on the dashboard."""
+        """Fetches fresh data in the background; widgets update when it arrives."""
+        if self.stats_future is not None and not self.stats_future.done():
+            self.rerun_update = True # Fetch again once the running query finishes
+            return
+        self.last_update_label.configure(text="Updating...")
+        self.stats_future = self.controller.tasks.submit(
+            self.db.analytics.get_live_stats,
+            on_success=self.show_stats, on_error=self.show_stats_error
+        )
+
+    def show_stats_error(self, error):
+        """Reports a failed stats query without blocking the dashboard."""
+        print(f"Error updating stats: {error}")
+        self.last_update_label.configure(text="Update failed")
+        self._rerun_if_requested()
+
+    def _rerun_if_requested(self):
+        """Starts a queued refresh that arrived while a query was running."""
+        if self.rerun_update:
+            self.rerun_update = False
+            self.update_stats()
+
+    def show_stats(self, stats):
+        """Updates all widgets on the dashboard from a stats dictionary."""
+        self._rerun_if_requested()
         try:
-            # --- UPDATED LINE ---
-            stats = self.db.analytics.get_live_stats()
-            
             self.revenue_card["value_label"].configure(text=f"${stats['today_revenue']:.2f}")
             self.orders_card["value_label"].configure(text=str(stats['active_orders']))
             self.tables_card["value_label"].configure(text=f"{stats['occupied_tables']}/{stats['total_tables']}")
@@ -172,22 +201,42 @@ class StatsScreen(ctk.CTkFrame):
         canvas.get_tk_widget().grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
 
     def start_auto_update(self):
-        """Starts the periodic update loop."""
-        self.update_job = self.after(5000, self.auto_update)
+        """Subscribes to the change feed so the dashboard refreshes on demand."""
+        if self.is_subscribed:
+            return
+        for topic in self.WATCHED_TOPICS:
+            self.db.events.subscribe(topic, self.on_data_changed)
+        self.is_subscribed = True
+
+    def on_data_changed(self, topic, action=None, **payload):
+        """Schedules a refresh for relevant changes. May be called from any thread."""
+        if topic == events.ORDERS and action == "items":
+            return # Open-order line items do not affect any dashboard figure
+        self.controller.tasks.call_soon(self._schedule_update)
+
+    def _schedule_update(self):
+        """Coalesces bursts of change events into a single refresh."""
+        if self.is_subscribed and self.update_job is None:
+            self.update_job = self.after(250, self.auto_update)
 
     def auto_update(self):
-        """The function that runs periodically to update stats."""
+        """Runs the coalesced refresh scheduled by on_data_changed."""
+        self.update_job = None
         self.update_stats()
-        self.update_job = self.after(5000, self.auto_update)
 
     def go_back(self):
-        """Stops the update loop and returns to the table screen."""
-        self.stop_auto_update()
+        """Returns to the table screen (on_hide stops the updates)."""
         self.controller.show_frame("TableScreen")
 
+    def on_hide(self):
+        """Called by the controller whenever the dashboard is left, by any route."""
+        self.stop_auto_update()
+
     def stop_auto_update(self):
-        """Cancels the scheduled auto-update job."""
+        """Unsubscribes from the change feed and cancels any pending refresh."""
+        for topic in self.WATCHED_TOPICS:
+            self.db.events.unsubscribe(topic, self.on_data_changed)
+        self.is_subscribed = False
         if self.update_job:
             self.after_cancel(self.update_job)
             self.update_job = None
-
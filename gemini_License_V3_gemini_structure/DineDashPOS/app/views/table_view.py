@@ -2,6 +2,7 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 from app.utils.style import Style
+from app.db import events
 import os # Import the os module
 
 class TableScreen(ctk.CTkFrame):
@@ -70,6 +71,28 @@ class TableScreen(ctk.CTkFrame):
         self.table_grid_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
         self.table_grid_frame.pack(fill="both", expand=True, padx=30, pady=20)
 
+        # Redraw the floor plan only when table occupancy actually changes
+        self.refresh_job = None
+        for topic in (events.ORDERS, events.TABLES, events.EXTERNAL):
+            self.db.events.subscribe(topic, self.on_data_changed)
+
+    def on_data_changed(self, topic, action=None, **payload):
+        """Schedules a refresh when a change affects table status. May be called from any thread."""
+        if topic == events.ORDERS and action not in ("created", "closed"):
+            return
+        self.controller.tasks.call_soon(self._schedule_refresh)
+
+    def _schedule_refresh(self):
+        """Coalesces change events into a refresh while this screen is visible."""
+        if self.controller.current_frame != "TableScreen" or self.refresh_job is not None:
+            return # Hidden screens are refreshed by show_frame when raised
+        self.refresh_job = self.after(250, self._apply_refresh)
+
+    def _apply_refresh(self):
+        """Runs the coalesced refresh scheduled by on_data_changed."""
+        self.refresh_job = None
+        self.refresh()
+
     def refresh(self):
         """Refreshes the screen content, including user info and the table grid."""
         if self.controller.current_user:
@@ -87,11 +110,19 @@ class TableScreen(ctk.CTkFrame):
                 self.reports_button.pack_forget()
                 self.settings_button.pack_forget()
 
+        # Keep the current cards on screen until the fresh status arrives
+        self.stats_label.configure(text="Loading tables...")
+        self.controller.tasks.submit(
+            self.db.orders.get_tables_with_status,
+            on_success=self.render_tables,
+            on_error=lambda e: self.stats_label.configure(text=f"Could not load tables: {e}")
+        )
+
+    def render_tables(self, tables):
+        """Rebuilds the table grid from the fetched table status rows."""
         for widget in self.table_grid_frame.winfo_children():
             widget.destroy()
 
-        tables = self.db.crud.get_tables()
-        
         if not tables:
             # --- UPDATED CODE BLOCK for better debugging ---
             db_path = os.path.join(os.path.expanduser("~"), "DineDashPOS", "restaurant_pos.db")
@@ -164,27 +195,18 @@ class TableScreen(ctk.CTkFrame):
         menu.tk_popup(event.x_root, event.y_root)
 
     def reprint_receipt(self, table_id):
-        last_order = self.db.orders.get_last_closed_order_for_table(table_id)
-        if not last_order:
+        """Reprints the table's last receipt from the receipt archive."""
+        self.controller.tasks.submit(
+            self.db.receipts.get_last_receipt_for_table, table_id,
+            on_success=self._on_reprint_loaded,
+            on_error=lambda e: messagebox.showerror("❌ Error", f"Failed to load receipt: {e}")
+        )
+
+    def _on_reprint_loaded(self, receipt_details):
+        """Sends a loaded receipt to the printer queue, marked as a reprint."""
+        if not receipt_details:
             messagebox.showinfo("ℹ️ No Receipt", "No previous closed orders found for this table.")
             return
-        
-        order_items = self.db.orders.get_order_items(last_order['id'])
-        
-        subtotal = sum(item['quantity'] * item['price_at_time'] for item in order_items)
-        tax = subtotal * 0.10
-        total = subtotal + tax
-        
-        user = self.db.crud.get_user_by_id(last_order['user_id'])
-        table = self.db.crud.get_table_by_id(table_id)
-        
-        receipt_details = {
-            "items": order_items, "subtotal": subtotal, "tax": tax, "total": total,
-            "table_name": table['name'] if table else 'N/A', 
-            "user_name": user['username'] if user else 'N/A',
-            "timestamp": last_order['closed_at']
-        }
-        
         self.controller.frames["OrderScreen"]._print_receipt_logic(receipt_details, is_reprint=True)
 
     def logout(self):
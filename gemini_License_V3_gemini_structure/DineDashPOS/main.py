@@ -1,4 +1,5 @@
 import customtkinter as ctk
+from tkinter import messagebox
 import os
 from ctypes import windll
 
@@ -16,6 +17,9 @@ from app.views.stats_view import StatsScreen
 
 # Import the centralized style
 from app.utils.style import Style
+from app.utils.task_runner import TaskRunner
+from app.utils.image_prefetcher import ImagePrefetcher
+from app.utils.print_spooler import PrintSpooler
 
 class App(ctk.CTk):
     """
@@ -39,6 +43,16 @@ class App(ctk.CTk):
             pass
 
         self.db = db_manager
+        # Background workers so views never block the UI on SQL
+        self.tasks = TaskRunner(self)
+        # Decodes product thumbnails off the UI thread
+        self.images = ImagePrefetcher(self.tasks, db_manager)
+        # Receipts print in the background over a persistent printer connection
+        self.spooler = PrintSpooler(listener=self.on_print_job_finished)
+        # Keep the receipt archive small: rotate old receipts out and apply retention
+        self.tasks.submit_write(self.db.receipts.rotate)
+        self.tasks.submit_write(self.db.receipts.purge)
+        self.current_frame = None
         self.current_user = None
         self.current_order_id = None
         self.selected_table_id = None
@@ -59,6 +73,9 @@ class App(ctk.CTk):
             frame.grid(row=0, column=0, sticky="nsew")
 
         self.check_license()
+
+        # Watch for commits made by other terminals (one cheap PRAGMA per tick)
+        self.poll_external_changes()
         
         # Protocol for graceful shutdown
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -73,17 +90,40 @@ class App(ctk.CTk):
 
     def show_frame(self, page_name: str):
         """Raises the specified frame to the top."""
+        previous = self.frames.get(self.current_frame)
+        if previous is not None and hasattr(previous, 'on_hide'):
+            previous.on_hide()
         frame = self.frames[page_name]
+        self.current_frame = page_name
         frame.tkraise()
         if hasattr(frame, 'refresh'):
             frame.refresh()
 
+    def poll_external_changes(self):
+        """Publishes changes from other terminals onto the change feed."""
+        self.db.poll_external_changes()
+        self.external_poll_job = self.after(1000, self.poll_external_changes)
+
+    def on_print_job_finished(self, job_id, status, detail):
+        """Tells the user when a receipt could not be printed (called from the spooler thread)."""
+        if status == 'saved':
+            self.tasks.call_soon(messagebox.showinfo, "🖨️ Receipt Saved", f"No printer found.\nReceipt saved to:\n{detail}")
+        elif status == 'dead':
+            self.tasks.call_soon(messagebox.showwarning, "🖨️ Printer Problem", f"Receipt #{job_id} could not be printed.\n{detail}")
+
     def get_db(self) -> DatabaseManager:
         """Provides access to the database manager instance."""
         return self.db
         
     def on_closing(self):
         """Handles application shutdown, ensuring database connection is closed."""
+        self.after_cancel(self.external_poll_job)
+        current = self.frames.get(self.current_frame)
+        if current is not None and hasattr(current, 'on_hide'):
+            current.on_hide() # Lets screens queue their final writes before shutdown
+        self.images.shutdown()
+        self.spooler.stop()
+        self.tasks.shutdown()
         self.db.close()
         self.destroy()
 
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+from app.db import DatabaseManager
+from tools.generate_data import generate_data
+
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+BASELINE_PATH = os.path.join(os.path.expanduser("~"), "DineDashPOS", "benchmarks", "baseline.json")
+
+
+def _db_name(scale: str) -> str:
+    return f"benchmark_{scale}.db"
+
+
+def _db_path(scale: str) -> str:
+    return os.path.join(os.path.expanduser("~"), "DineDashPOS", _db_name(scale))
+
+
+def _scratch_copy(scale: str) -> str:
+    """
+    Copies a benchmark database to a throwaway file for the write cases, so
+    timing them never changes the data the read cases run against.
+    Returns the copy's database name.
+    """
+    name = f"benchmark_{scale}_scratch.db"
+    source = sqlite3.connect(_db_path(scale))
+    target = sqlite3.connect(os.path.join(os.path.dirname(_db_path(scale)), name))
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return name
+
+
+def _remove_db(name: str):
+    path = os.path.join(os.path.expanduser("~"), "DineDashPOS", name)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def _timed(samples: dict, name: str, fn, *args, **kwargs):
+    """Runs one call, appends its duration to samples[name] and returns its result."""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples.setdefault(name, []).append(time.perf_counter() - started)
+    return result
+
+
+def _read_cases(db) -> list:
+    """
+    The read-only AnalyticsManager and OrderManager calls, as (name, fn, args).
+    Cached reports are timed cold, with a separate '[cached]' case for the hit.
+    """
+    table_id = db.orders.get_tables_with_status()[0]['id']
+    cases = [
+        ("analytics.get_live_stats", db.analytics.get_live_stats, ()),
+        ("analytics.get_daily_sales_summary", db.analytics.get_daily_sales_summary, ()),
+        ("analytics.get_top_products", db.analytics.get_top_products, (10,)),
+        ("analytics.get_staff_performance", db.analytics.get_staff_performance, ()),
+        ("analytics.get_all_sales_data_for_export", db.analytics.get_all_sales_data_for_export, ()),
+        ("orders.get_tables_with_status", db.orders.get_tables_with_status, ()),
+        ("orders.get_open_order_for_table", db.orders.get_open_order_for_table, (table_id,)),
+        ("orders.get_last_closed_order_for_table", db.orders.get_last_closed_order_for_table, (table_id,)),
+    ]
+    for period in ("Last 7 Days", "Last 30 Days", "This Month", "Last Month"):
+        cases.append((f"analytics.get_sales_by_period[{period}]", db.analytics.get_sales_by_period, (period,)))
+    for period in ("Today", "Last 7 Days", "Last 30 Days", "All Time"):
+        cases.append((f"analytics.get_order_history[{period}]", db.analytics.get_order_history, (period,)))
+    return cases
+
+
+def _time_order_lifecycle(db, samples: dict):
+    """Times each OrderManager write by taking one order from open to closed (run on a scratch copy)."""
+    tables = db.orders.get_tables_with_status()
+    table_id = next((t['id'] for t in tables if t['status'] == 'available'), tables[0]['id'])
+    user_id = db.crud.get_users()[0]['id']
+    products = db.crud.get_products()[:12]
+
+    order_id = _timed(samples, "orders.create_order", db.orders.create_order, table_id, user_id)
+    _timed(samples, "orders.add_item_to_order", db.orders.add_item_to_order,
+           order_id, products[0]['id'], 1, products[0]['price'])
+    item = _timed(samples, "orders.get_order_items", db.orders.get_order_items, order_id)[0]
+    _timed(samples, "orders.update_order_item_quantity", db.orders.update_order_item_quantity, item['id'], 3)
+
+    session = db.orders.session(order_id)
+    for product in products[1:]:
+        session.add(product['id'], product['name'], product['price'])
+    _timed(samples, "orders.session.flush[11 lines]", session.flush)
+
+    extra = db.orders.get_order_items(order_id)[-1]
+    _timed(samples, "orders.remove_order_item", db.orders.remove_order_item, extra['id'])
+    _timed(samples, "orders.close_order", db.orders.close_order, order_id)
+
+
+def run_benchmarks(scales: list[str], repeat: int = 5, only: str = None) -> dict:
+    """
+    Times every AnalyticsManager and OrderManager method against generated
+    databases of each scale (creating them on first use).
+    Returns {scale: {case: {"median": s, "min": s}}}.
+
+    Args:
+        scales: Keys of SCALES to run, e.g. ["10k", "1m"].
+        repeat: How many times each case is run; the median is reported.
+        only: If given, only cases whose name contains this text are reported.
+    """
+    results = {}
+    for scale in scales:
+        if not os.path.exists(_db_path(scale)):
+            print(f"[DEBUG] Generating {scale} dataset ({SCALES[scale]} line items)...")
+            generate_data(_db_name(scale), line_items=SCALES[scale], years=3 if SCALES[scale] >= 1_000_000 else 1)
+
+        db = DatabaseManager(_db_name(scale))
+        samples = {}
+        try:
+            for _ in range(repeat):
+                for name, fn, args in _read_cases(db):
+                    if not only or only in name:
+                        # Time the query itself, not a ReportCache hit left by the previous repeat
+                        db.analytics.cache.invalidate()
+                        _timed(samples, name, fn, *args)
+                        if hasattr(fn, "__wrapped__"): # A @cached_report method; also time the warm path
+                            _timed(samples, f"{name}[cached]", fn, *args)
+        finally:
+            db.close()
+
+        scratch = _scratch_copy(scale)
+        db = DatabaseManager(scratch)
+        try:
+            for _ in range(repeat):
+                _time_order_lifecycle(db, samples)
+        finally:
+            db.close()
+            _remove_db(scratch)
+
+        results[scale] = {
+            name: {"median": statistics.median(times), "min": min(times)}
+            for name, times in sorted(samples.items())
+            if not only or only in name
+        }
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float = 0.2) -> list[str]:
+    """Lists cases whose median is more than `threshold` slower than the baseline median."""
+    regressions = []
+    for scale, cases in results.items():
+        for name, timing in cases.items():
+            previous = baseline.get(scale, {}).get(name)
+            if previous and timing["median"] > previous["median"] * (1 + threshold):
+                regressions.append(
+                    f"[{scale}] {name}: {previous['median'] * 1000:.2f} ms -> {timing['median'] * 1000:.2f} ms"
+                )
+    return regressions
+
+
+def _print_results(results: dict, baseline: dict):
+    for scale, cases in results.items():
+        print(f"\n--- {scale} line items ---")
+        for name, timing in cases.items():
+            previous = baseline.get(scale, {}).get(name)
+            change = f"{(timing['median'] / previous['median'] - 1) * 100:+6.1f}%" if previous else "   new"
+            print(f"{name:<56} {timing['median'] * 1000:10.2f} ms  {change}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark AnalyticsManager and OrderManager.")
+    parser.add_argument("--scales", default="10k", help="comma separated: " + ",".join(SCALES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks([s.strip().lower() for s in args.scales.split(",")], args.repeat, args.only)
+
+    print("="*40)
+    print("  DineDash POS Benchmark")
+    print("="*40)
+    _print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        for scale, cases in results.items():
+            baseline.setdefault(scale, {}).update(cases)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        sys.exit(0)
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    print("="*40)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print("No regressions." if baseline else "No baseline yet; run with --save-baseline.")
@@ -0,0 +1,218 @@
+import argparse
+import math
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from app.db import DatabaseManager
+from app.db.business_day import get_cutoff_hour, business_date_for
+from app.db.rollup_manager import rebuild_rollups
+
+# Relative order volume by hour of the (local) day; 0-1 is the late bar crowd.
+HOURLY_WEIGHTS = {
+    11: 4, 12: 14, 13: 13, 14: 6, 15: 3, 16: 3, 17: 6,
+    18: 12, 19: 15, 20: 13, 21: 8, 22: 4, 23: 2, 0: 1, 1: 0.5,
+}
+# Monday..Sunday
+WEEKDAY_WEIGHTS = [0.75, 0.8, 0.85, 0.95, 1.3, 1.45, 1.1]
+# Lines per order (1..6) and quantity per line (1..4)
+LINE_COUNT_WEIGHTS = [20, 28, 22, 15, 9, 6]
+QUANTITY_WEIGHTS = [70, 20, 7, 3]
+
+MENU = {
+    'Appetizers': ((5.0, 12.0), ["Spring Rolls", "Garlic Bread", "Bruschetta", "Calamari", "Wings", "Nachos", "Soup", "Dumplings"]),
+    'Mains': ((12.0, 34.0), ["Burger", "Pizza", "Risotto", "Steak", "Salmon", "Curry", "Pasta", "Tacos", "Ramen", "Schnitzel"]),
+    'Desserts': ((5.0, 11.0), ["Tiramisu", "Cheesecake", "Brownie", "Sorbet", "Panna Cotta", "Crumble"]),
+    'Drinks': ((2.5, 9.0), ["Cola", "Lemonade", "Iced Tea", "Espresso", "Latte", "Juice", "Beer", "Wine"]),
+    'Sides': ((3.0, 7.0), ["Fries", "Salad", "Rice", "Coleslaw", "Onion Rings"]),
+}
+STYLES = ["Classic", "Spicy", "House", "Smoky", "Garden", "Truffle", "Crispy", "Chef's", "Rustic", "Golden"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley", "Morgan", "Jamie", "Avery", "Quinn", "Drew", "Robin"]
+
+AVERAGE_LINES_PER_ORDER = sum((i + 1) * w for i, w in enumerate(LINE_COUNT_WEIGHTS)) / sum(LINE_COUNT_WEIGHTS)
+BATCH_ORDERS = 20000
+
+
+def _seasonal_weight(day: date) -> float:
+    """Busier in summer and December, quieter in January and February."""
+    weight = 1 + 0.2 * math.sin((day.timetuple().tm_yday - 100) / 365 * 2 * math.pi)
+    if day.month == 12:
+        weight *= 1.25
+    elif day.month in (1, 2):
+        weight *= 0.85
+    return weight
+
+
+def _create_catalog(cursor, rng, products: int, staff: int, tables: int) -> dict:
+    """Inserts synthetic products, staff and tables; returns the ids to draw orders from."""
+    product_rows = []
+    categories = list(MENU)
+    for i in range(products):
+        category = categories[i % len(categories)]
+        (low, high), dishes = MENU[category]
+        name = f"{rng.choice(STYLES)} {rng.choice(dishes)} #{i + 1}"
+        product_rows.append((name, round(rng.uniform(low, high), 2), category))
+    cursor.executemany("INSERT INTO products (name, price, category) VALUES (?, ?, ?)", product_rows)
+    cursor.execute(
+        "INSERT OR IGNORE INTO inventory (product_id, stock_quantity, min_stock_level) "
+        "SELECT id, 1000, 50 FROM products"
+    )
+
+    cursor.executemany(
+        "INSERT OR IGNORE INTO users (username, role) VALUES (?, ?)",
+        [(f"{rng.choice(FIRST_NAMES)}{i + 1:03d}", 'Admin' if i % 15 == 0 else 'Server') for i in range(staff)]
+    )
+    cursor.executemany(
+        "INSERT OR IGNORE INTO tables (name, capacity) VALUES (?, ?)",
+        [(f"G{i + 1}", rng.choice((2, 2, 4, 4, 4, 6, 8))) for i in range(tables)]
+    )
+
+    cursor.execute("SELECT id, price FROM products")
+    product_prices = [(row['id'], row['price']) for row in cursor.fetchall()]
+    rng.shuffle(product_prices)
+    cursor.execute("SELECT id FROM users")
+    user_ids = [row['id'] for row in cursor.fetchall()]
+    cursor.execute("SELECT id FROM tables")
+    table_ids = [row['id'] for row in cursor.fetchall()]
+    return {'products': product_prices, 'users': user_ids, 'tables': table_ids}
+
+
+def generate_data(db_name: str = "benchmark.db", line_items: int = 100000, years: float = 1.0,
+                  products: int = 300, staff: int = 30, tables: int = 40, seed: int = 42) -> dict:
+    """
+    Fills a DineDash database with realistic synthetic sales history.
+    Order volume follows hourly, weekday and seasonal curves; product
+    popularity follows a Zipf-like curve. Rollups are rebuilt at the end.
+    The database is created under ~/DineDashPOS like the real one, so use a
+    separate name (never the live restaurant_pos.db).
+    Run from the DineDashPOS folder: python -m tools.generate_data --line-items 1000000
+
+    Args:
+        db_name: Database file name under ~/DineDashPOS.
+        line_items: Approximate number of order_items rows to create.
+        years: How many years of history (ending yesterday) to spread orders over.
+        products: Number of synthetic products to add.
+        staff: Number of synthetic staff members to add.
+        tables: Number of synthetic tables to add.
+        seed: Random seed, so the same arguments always produce the same data.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    db = DatabaseManager(db_name)
+    try:
+        with db.pool.transaction() as conn:
+            catalog = _create_catalog(conn.cursor(), rng, products, staff, tables)
+            cutoff = get_cutoff_hour(conn.cursor())
+            start_order_id = (conn.execute("SELECT MAX(id) FROM orders").fetchone()[0] or 0) + 1
+            start_item_id = (conn.execute("SELECT MAX(id) FROM order_items").fetchone()[0] or 0) + 1
+        db.crud.invalidate_catalog()
+
+        product_weights = [1 / (rank + 1) ** 1.1 for rank in range(len(catalog['products']))]
+        product_cum = _cumulative(product_weights)
+        hours = list(HOURLY_WEIGHTS)
+        hour_cum = _cumulative(HOURLY_WEIGHTS.values())
+        line_cum = _cumulative(LINE_COUNT_WEIGHTS)
+        quantity_cum = _cumulative(QUANTITY_WEIGHTS)
+
+        last_day = date.today() - timedelta(days=1)
+        days = [last_day - timedelta(days=n) for n in range(max(1, int(years * 365)) - 1, -1, -1)]
+        day_weights = [WEEKDAY_WEIGHTS[day.weekday()] * _seasonal_weight(day) for day in days]
+        orders_per_weight = line_items / AVERAGE_LINES_PER_ORDER / sum(day_weights)
+
+        order_id, item_id = start_order_id, start_item_id
+        order_rows, item_rows = [], []
+        total_orders = total_items = 0
+
+        for day, weight in zip(days, day_weights):
+            expected = weight * orders_per_weight * rng.uniform(0.85, 1.15)
+            for _ in range(int(expected) + (rng.random() < expected % 1)):
+                hour = rng.choices(hours, cum_weights=hour_cum)[0]
+                # Hours after midnight belong to the previous business day's service
+                created = datetime(day.year, day.month, day.day) + timedelta(
+                    days=1 if hour < cutoff else 0, hours=hour, minutes=rng.randrange(60))
+                closed = created + timedelta(minutes=rng.randint(15, 95))
+
+                total = 0.0
+                line_count = rng.choices(range(1, len(LINE_COUNT_WEIGHTS) + 1), cum_weights=line_cum)[0]
+                picked = {catalog['products'][i] for i in
+                          rng.choices(range(len(catalog['products'])), cum_weights=product_cum, k=line_count)}
+                for product_id, price in picked:
+                    quantity = rng.choices(range(1, len(QUANTITY_WEIGHTS) + 1), cum_weights=quantity_cum)[0]
+                    item_rows.append((item_id, order_id, product_id, quantity, price, _utc(created)))
+                    item_id += 1
+                    total += quantity * price
+
+                order_rows.append((
+                    order_id, rng.choice(catalog['tables']), rng.choice(catalog['users']), round(total, 2),
+                    _utc(created), _utc(closed), business_date_for(closed, cutoff).isoformat()
+                ))
+                order_id += 1
+                if len(order_rows) >= BATCH_ORDERS:
+                    total_orders, total_items = _flush(db, order_rows, item_rows, total_orders, total_items)
+
+        total_orders, total_items = _flush(db, order_rows, item_rows, total_orders, total_items)
+        print("[DEBUG] Rebuilding sales rollups...")
+        with db.pool.transaction() as conn:
+            rebuild_rollups(conn.cursor())
+    finally:
+        db.close()
+
+    return {
+        'orders': total_orders, 'line_items': total_items, 'products': products,
+        'staff': staff, 'tables': tables, 'days': len(days),
+        'seconds': round(time.perf_counter() - started, 1),
+    }
+
+
+def _cumulative(weights) -> list[float]:
+    """Cumulative weights for random.choices, computed once instead of per draw."""
+    running, result = 0.0, []
+    for weight in weights:
+        running += weight
+        result.append(running)
+    return result
+
+
+def _utc(local: datetime) -> str:
+    """Formats a naive local time as the UTC string the app stores."""
+    return local.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _flush(db, order_rows: list, item_rows: list, total_orders: int, total_items: int) -> tuple[int, int]:
+    """Writes one batch of generated orders and their items in a single transaction."""
+    if order_rows:
+        with db.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO orders (id, table_id, user_id, status, total_amount, created_at, closed_at, business_date) "
+                "VALUES (?, ?, ?, 'closed', ?, ?, ?, ?)", order_rows
+            )
+            conn.executemany(
+                "INSERT INTO order_items (id, order_id, product_id, quantity, price_at_time, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", item_rows
+            )
+        total_orders += len(order_rows)
+        total_items += len(item_rows)
+        print(f"[DEBUG] Wrote {total_orders} orders / {total_items} line items...")
+        order_rows.clear()
+        item_rows.clear()
+    return total_orders, total_items
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic DineDash sales history.")
+    parser.add_argument("--db", default="benchmark.db", help="database file name under ~/DineDashPOS")
+    parser.add_argument("--line-items", type=int, default=100000)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--staff", type=int, default=30)
+    parser.add_argument("--tables", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    summary = generate_data(args.db, args.line_items, args.years, args.products, args.staff, args.tables, args.seed)
+    print("="*40)
+    print("  DineDash POS Synthetic Data Generator")
+    print("="*40)
+    for key, value in summary.items():
+        print(f"{key:>12}: {value}")
+    print("="*40)
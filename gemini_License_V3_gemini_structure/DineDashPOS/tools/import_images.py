@@ -0,0 +1,109 @@
+import argparse
+import csv
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.db import DatabaseManager
+from app.utils.image_manager import ImageManager, IMAGE_EXTENSIONS
+from app.utils.image_prefetcher import UI_IMAGE_SIZES
+
+
+def _normalize(name: str) -> str:
+    """Makes 'Margherita Pizza', 'margherita_pizza' and 'MargheritaPizza' compare equal."""
+    return re.sub(r'[^a-z0-9]+', '', name.lower())
+
+
+def _mapping_from_directory(directory: str) -> dict[str, str]:
+    """Maps normalized file names (without extension) to image paths."""
+    mapping = {}
+    for entry in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(entry)
+        if ext.lower() in IMAGE_EXTENSIONS:
+            mapping[_normalize(stem)] = os.path.join(directory, entry)
+    return mapping
+
+
+def _mapping_from_csv(csv_path: str) -> dict[str, str]:
+    """
+    Reads a CSV of product name and image path (header optional). Relative
+    image paths are resolved against the CSV's folder.
+    """
+    base_dir = os.path.dirname(os.path.abspath(csv_path))
+    mapping = {}
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip():
+                continue
+            name, path = row[0].strip(), row[1].strip()
+            if (name.lower(), path.lower()) == ("name", "image"):
+                continue # Header row
+            mapping[_normalize(name)] = path if os.path.isabs(path) else os.path.join(base_dir, path)
+    return mapping
+
+
+def import_images(source: str, db_name: str = "restaurant_pos.db", workers: int = None, progress=print) -> dict:
+    """
+    Imports product photos in bulk. Matching files are resized, converted to
+    the standard product JPEG and given pre-rendered UI thumbnails in a
+    process pool; the products table is then updated in one transaction.
+    Run from the DineDashPOS folder: python -m tools.import_images ~/menu_photos
+
+    Args:
+        source: A directory of images named after products, or a CSV of
+            "name,image" rows.
+        db_name: Database file name under ~/DineDashPOS.
+        workers: Number of worker processes (defaults to the CPU count).
+        progress: Called with one status line per processed file.
+    """
+    mapping = _mapping_from_csv(source) if source.lower().endswith(".csv") else _mapping_from_directory(source)
+
+    db = DatabaseManager(db_name)
+    try:
+        products = {_normalize(p['name']): p for p in db.crud.get_products()}
+        matched = {key: path for key, path in mapping.items() if key in products}
+        unmatched = sorted(path for key, path in mapping.items() if key not in products)
+
+        images, failures = {}, []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(ImageManager.import_product_image, products[key]['id'], path, UI_IMAGE_SIZES): key
+                for key, path in matched.items()
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                product = products[futures[future]]
+                try:
+                    images[product['id']] = future.result()
+                    progress(f"[{done}/{len(futures)}] {product['name']}: ok")
+                except Exception as e:
+                    failures.append((product['name'], matched[futures[future]], str(e)))
+                    progress(f"[{done}/{len(futures)}] {product['name']}: FAILED ({e})")
+
+        updated = db.crud.set_product_images(images) if images else 0
+    finally:
+        db.close()
+
+    return {'updated': updated, 'failures': failures, 'unmatched': unmatched}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import product images.")
+    parser.add_argument("source", help="directory of images named after products, or a name,image CSV")
+    parser.add_argument("--db", default="restaurant_pos.db", help="database file name under ~/DineDashPOS")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    result = import_images(args.source, args.db, args.workers)
+    print("="*40)
+    print("  DineDash POS Bulk Image Import")
+    print("="*40)
+    print(f"\nProducts updated: {result['updated']}")
+    if result['failures']:
+        print(f"\nFailed ({len(result['failures'])}):")
+        for name, path, error in result['failures']:
+            print(f"  {name} <- {path}: {error}")
+    if result['unmatched']:
+        print(f"\nNo matching product ({len(result['unmatched'])}):")
+        for path in result['unmatched']:
+            print(f"  {path}")
+    print("="*40)
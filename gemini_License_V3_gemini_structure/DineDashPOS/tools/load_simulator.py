@@ -0,0 +1,184 @@
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import time
+
+from app.db import DatabaseManager
+
+OPERATIONS = ("create_order", "add_item_to_order", "close_order")
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _terminal(worker: int, db_name: str, duration: float, think_ms: int, seed: int) -> dict:
+    """
+    One simulated terminal: a server repeatedly opening a random table,
+    ringing in items one tap at a time and settling, through the real
+    OrderManager APIs on its own connection pool.
+    """
+    rng = random.Random(seed + worker)
+    db = DatabaseManager(db_name)
+    latencies = {name: [] for name in OPERATIONS}
+    errors = {}
+    closed_orders = 0
+    try:
+        table_ids = [t['id'] for t in db.orders.get_tables_with_status()]
+        user_ids = [u['id'] for u in db.crud.get_users()]
+        products = db.crud.get_products()
+        deadline = time.perf_counter() + duration
+
+        def timed(name, fn, *args):
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            except sqlite3.Error as e:
+                errors[f"{name}: {e}"] = errors.get(f"{name}: {e}", 0) + 1
+                return None
+            finally:
+                latencies[name].append(time.perf_counter() - started)
+
+        while time.perf_counter() < deadline:
+            table_id = rng.choice(table_ids)
+            order = db.orders.get_open_order_for_table(table_id)
+            order_id = order['id'] if order else timed("create_order", db.orders.create_order, table_id, rng.choice(user_ids))
+            if order_id is None:
+                continue
+
+            for _ in range(rng.randint(1, 6)):
+                product = rng.choice(products)
+                timed("add_item_to_order", db.orders.add_item_to_order, order_id, product['id'], 1, product['price'])
+                if think_ms:
+                    time.sleep(rng.uniform(0, think_ms) / 1000)
+
+            # Leave some tables open so terminals also meet each other's orders
+            if rng.random() < 0.7:
+                if timed("close_order", db.orders.close_order, order_id):
+                    closed_orders += 1
+
+        return {
+            'latencies': latencies, 'errors': errors, 'closed_orders': closed_orders,
+            'lock_wait_seconds': db.pool.lock_wait_seconds, 'transactions': db.pool.transactions,
+        }
+    finally:
+        db.close()
+
+
+def check_consistency(db_name: str) -> list[str]:
+    """Looks for states that concurrent terminals must never produce."""
+    db = DatabaseManager(db_name)
+    problems = []
+    try:
+        with db.pool.reader() as conn:
+            for row in conn.execute(
+                "SELECT table_id, COUNT(*) AS open_orders FROM orders WHERE status='open' "
+                "GROUP BY table_id HAVING COUNT(*) > 1"
+            ):
+                problems.append(f"Table {row['table_id']} has {row['open_orders']} open orders")
+            for row in conn.execute("SELECT product_id, stock_quantity FROM inventory WHERE stock_quantity < 0"):
+                problems.append(f"Product {row['product_id']} has negative stock ({row['stock_quantity']})")
+            for row in conn.execute('''
+                SELECT o.id, o.total_amount, COALESCE(SUM(oi.quantity * oi.price_at_time), 0) AS item_total
+                FROM orders o LEFT JOIN order_items oi ON oi.order_id = o.id
+                WHERE o.status = 'closed'
+                GROUP BY o.id
+                HAVING ABS(o.total_amount - item_total) > 0.005
+            '''):
+                problems.append(f"Order {row['id']} total {row['total_amount']:.2f} != items {row['item_total']:.2f}")
+            rollup, orders = conn.execute('''
+                SELECT (SELECT COALESCE(SUM(revenue), 0) FROM sales_rollup_orders),
+                       (SELECT COALESCE(SUM(total_amount), 0) FROM orders WHERE status = 'closed')
+            ''').fetchone()
+            if abs(rollup - orders) > 0.01:
+                problems.append(f"Sales rollups ({rollup:.2f}) disagree with closed orders ({orders:.2f})")
+    finally:
+        db.close()
+    return problems
+
+
+def simulate(db_name: str = "loadtest.db", workers: int = 4, duration: float = 30.0,
+             think_ms: int = 0, stock: int = 100000, seed: int = 1) -> dict:
+    """
+    Runs several simulated terminals against one database in separate
+    processes and summarizes throughput, latency, lock waits and any
+    consistency violations found afterwards.
+    Run from the DineDashPOS folder: python -m tools.load_simulator --workers 8
+
+    Args:
+        db_name: Database file name under ~/DineDashPOS (never the live one).
+        workers: Number of terminal processes.
+        duration: How long each terminal keeps taking orders, in seconds.
+        think_ms: Maximum random pause between taps, to mimic a human.
+        stock: Stock level each product starts with.
+        seed: Base random seed for the terminals.
+    """
+    db = DatabaseManager(db_name)
+    try:
+        with db.pool.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO inventory (product_id, stock_quantity, min_stock_level) "
+                "SELECT id, ?, 0 FROM products", (stock,)
+            )
+    finally:
+        db.close()
+
+    started = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.starmap(_terminal, [(w, db_name, duration, think_ms, seed) for w in range(workers)])
+    elapsed = time.perf_counter() - started
+
+    summary = {'workers': workers, 'seconds': round(elapsed, 1), 'operations': {}, 'errors': {}}
+    for name in OPERATIONS:
+        values = sorted(v for r in results for v in r['latencies'][name])
+        summary['operations'][name] = {
+            'count': len(values),
+            'per_second': round(len(values) / elapsed, 1),
+            'p50_ms': round(_percentile(values, 50) * 1000, 2),
+            'p95_ms': round(_percentile(values, 95) * 1000, 2),
+            'p99_ms': round(_percentile(values, 99) * 1000, 2),
+        }
+    for r in results:
+        for message, count in r['errors'].items():
+            summary['errors'][message] = summary['errors'].get(message, 0) + count
+    transactions = sum(r['transactions'] for r in results)
+    lock_wait = sum(r['lock_wait_seconds'] for r in results)
+    summary['closed_orders_per_second'] = round(sum(r['closed_orders'] for r in results) / elapsed, 1)
+    summary['lock_wait_total_s'] = round(lock_wait, 2)
+    summary['lock_wait_avg_ms'] = round(lock_wait / transactions * 1000, 2) if transactions else 0.0
+    summary['violations'] = check_consistency(db_name)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate several terminals taking orders concurrently.")
+    parser.add_argument("--db", default="loadtest.db", help="database file name under ~/DineDashPOS")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--think-ms", type=int, default=0)
+    parser.add_argument("--stock", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    summary = simulate(args.db, args.workers, args.duration, args.think_ms, args.stock, args.seed)
+    print("="*40)
+    print("  DineDash POS Load Simulator")
+    print("="*40)
+    print(f"\n{summary['workers']} terminals for {summary['seconds']}s, "
+          f"{summary['closed_orders_per_second']} orders settled/s")
+    print(f"\n{'operation':<20}{'count':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, stats in summary['operations'].items():
+        print(f"{name:<20}{stats['count']:>8}{stats['per_second']:>9}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+    print(f"\nLock wait: {summary['lock_wait_total_s']}s total, {summary['lock_wait_avg_ms']} ms per transaction")
+    for message, count in summary['errors'].items():
+        print(f"Error x{count}: {message}")
+    print(f"\nConsistency violations: {len(summary['violations'])}")
+    for problem in summary['violations']:
+        print("  " + problem)
+    print("="*40)
@@ -0,0 +1,22 @@
+from app.db import DatabaseManager
+
+def rebuild_rollups():
+    """
+    Recomputes the sales rollup tables from the full order history.
+    Use this after importing old data or if the rollups ever drift.
+    Run from the DineDashPOS folder: python -m tools.rebuild_rollups
+    """
+    db = DatabaseManager()
+    try:
+        return db.rollups.rebuild()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    counts = rebuild_rollups()
+    print("="*40)
+    print("  DineDash POS Sales Rollup Rebuild")
+    print("="*40)
+    print(f"\nItem rollup rows:  {counts['item_rows']}")
+    print(f"Order rollup rows: {counts['order_rows']}")
+    print("="*40)
@@ -0,0 +1,40 @@
+import argparse
+import time
+
+from app.db import DatabaseManager
+from app.utils.parquet_snapshot import SNAPSHOT_DIR, write_snapshot
+
+def snapshot_parquet(db_name: str = "restaurant_pos.db", out: str = SNAPSHOT_DIR, compression: str = "zstd", full: bool = False) -> dict:
+    """
+    Appends orders closed since the last run to the month-partitioned Parquet
+    snapshot (see app.utils.parquet_snapshot). Meant to run nightly.
+    Run from the DineDashPOS folder: python -m tools.snapshot_parquet
+    """
+    db = DatabaseManager(db_name)
+    try:
+        return write_snapshot(db.analytics, out, compression, full,
+                              progress=lambda orders: print(f"\r  {orders:,} orders written", end="", flush=True))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write closed orders to a partitioned Parquet snapshot.")
+    parser.add_argument("--db", default="restaurant_pos.db", help="Database file name in ~/DineDashPOS")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="Snapshot directory")
+    parser.add_argument("--compression", default="zstd", choices=["zstd", "snappy", "gzip", "none"])
+    parser.add_argument("--full", action="store_true", help="Discard the snapshot and re-export all history")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = snapshot_parquet(args.db, args.out, args.compression, args.full)
+    print()
+    print("="*40)
+    print("  DineDash POS Parquet Snapshot")
+    print("="*40)
+    print(f"\nNew orders:     {result['orders']}")
+    print(f"New line items: {result['order_items']}")
+    print(f"Months touched: {', '.join(result['months']) or 'none'}")
+    print(f"Up to:          {result['cursor'][0] if result['cursor'] else 'no new orders'}")
+    print(f"Written to:     {args.out}")
+    print(f"Time:           {time.perf_counter() - started:.1f}s")
+    print("="*40)
@@ -1,10 +1,13 @@
 import tkinter as tk
 from pos_app.database.db_manager import DBManager
 from pos_app.gui.login_window import LoginWindow
+from pos_app.utils.receipt_archive import ReceiptArchive
 
 if __name__ == "__main__":
     db = DBManager()
     db.create_tables()
+    # Drop archived bills past the retention period
+    ReceiptArchive().purge()
 
     root = tk.Tk()
     LoginWindow(root)
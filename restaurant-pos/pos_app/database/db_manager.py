@@ -69,6 +69,32 @@ class DBManager:
         self.conn.commit()
         return order_id
 
+    def order_receipts_for_day(self, day: str):
+        """
+        Receipt data for every order placed on day (YYYY-MM-DD), used to
+        re-render bills: [{id, subtotal, tax, total, items: [(name, line_total)]}]
+        """
+        rows = self.conn.execute(
+            """
+            SELECT o.id, o.total, COALESCE(p.name, 'Item #' || oi.product_id) AS name, oi.line_total
+            FROM orders o
+            JOIN order_items oi ON oi.order_id = o.id
+            LEFT JOIN products p ON p.id = oi.product_id
+            WHERE date(o.date) = date(?)
+            ORDER BY o.id, oi.id
+            """,
+            (day,),
+        ).fetchall()
+
+        orders = {}
+        for r in rows:
+            order = orders.setdefault(r["id"], {"id": r["id"], "total": float(r["total"]), "items": []})
+            order["items"].append((r["name"], float(r["line_total"])))
+        for order in orders.values():
+            order["subtotal"] = round(sum(price for _, price in order["items"]), 2)
+            order["tax"] = round(order["total"] - order["subtotal"], 2)
+        return list(orders.values())
+
     # ---------- Reports ----------
     def daily_sales_between(self, date_from: str, date_to: str):
         """
@@ -3,7 +3,8 @@ from tkinter import messagebox
 from PIL import Image, ImageTk
 from pos_app.utils.constants import APP_TITLE, WINDOW_SIZE, CURRENCY
 from pos_app.logic.products import ProductService
-from pos_app.logic.billing import CartItem, calculate_totals, process_order
+from pos_app.logic.billing import CartItem, calculate_totals, process_order, queue_pdf_bill
+from pos_app.utils.pdf_service import get_pdf_service
 from pos_app.database.db_manager import DBManager
 from pos_app.gui.admin_panel import AdminPanel
 
@@ -108,6 +109,10 @@ class MainWindow:
         ctk.CTkButton(self.cart_frame, text="Checkout", fg_color="green", command=self._checkout).pack(pady=10)
         ctk.CTkButton(self.cart_frame, text="Clear Cart", fg_color="red", command=self._clear_cart).pack(pady=5)
 
+        # Background PDF bill progress for the last checkout
+        self.pdf_status_var = ctk.StringVar(value="")
+        ctk.CTkLabel(self.cart_frame, textvariable=self.pdf_status_var, font=("Arial", 11)).pack(pady=5)
+
     # ---------------- CART LOGIC ----------------
     def _add_to_cart(self, product):
         for item in self.cart:
@@ -156,8 +161,27 @@ class MainWindow:
             messagebox.showerror("Error", f"Failed to process order: {e}")
             return
 
+        # The order is committed; the PDF bill renders in the background
+        try:
+            queue_pdf_bill(order_id, result)
+            self._watch_pdf(order_id)
+        except Exception as e:
+            self.pdf_status_var.set(f"Bill #{order_id}: PDF not queued ({e})")
+
         self._clear_cart()
-        messagebox.showinfo("Success", f"Order #{order_id} placed!\nTotal: {CURRENCY}{result['total']:.2f}\nPDF saved at: {result['pdf']}")
+        messagebox.showinfo("Success", f"Order #{order_id} placed!\nTotal: {CURRENCY}{result['total']:.2f}")
+
+    def _watch_pdf(self, order_id: int):
+        """Poll the PDF service until the bill for order_id is ready or failed."""
+        status = get_pdf_service().status(order_id)
+        if status == "ready":
+            self.pdf_status_var.set(f"Bill #{order_id}: PDF ready")
+        elif status in ("failed", "missing"):
+            error = get_pdf_service().error(order_id) or "not generated"
+            self.pdf_status_var.set(f"Bill #{order_id}: PDF failed ({error})")
+        else:
+            self.pdf_status_var.set(f"Bill #{order_id}: PDF {status}...")
+            self.root.after(250, self._watch_pdf, order_id)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Dict
 from pos_app.utils.constants import TAX_RATE
-from pos_app.utils.printer import generate_pdf_bill, print_thermal
+from pos_app.utils.printer import print_thermal
+from pos_app.utils.pdf_service import get_pdf_service
 
 @dataclass
 class CartItem:
@@ -21,23 +22,20 @@ def calculate_totals(cart: List[CartItem]) -> Dict[str, float]:
     return {"subtotal": subtotal, "tax": tax, "total": total}
 
 def process_order(cart: List[CartItem], use_thermal: bool = False) -> Dict:
-    """Calculate totals, generate PDF, and optionally print thermal receipt."""
+    """
+    Calculate totals and optionally queue a thermal receipt.
+    The PDF bill is rendered in the background by queue_pdf_bill() once the
+    order has been saved, so checkout does not wait on ReportLab.
+    """
     totals = calculate_totals(cart)
 
     # Prepare items in tuple format for the printer
     items_for_receipt = [(i.name, i.line_total) for i in cart]
 
-    # Generate PDF bill
-    pdf_path = generate_pdf_bill(
-        items_for_receipt,
-        totals["subtotal"],
-        totals["tax"],
-        totals["total"]
-    )
-
-    # Optionally print thermal
+    # Optionally queue a thermal receipt (returns before it prints)
+    print_job = None
     if use_thermal:
-        print_thermal(
+        print_job = print_thermal(
             items_for_receipt,
             totals["subtotal"],
             totals["tax"],
@@ -48,5 +46,16 @@ def process_order(cart: List[CartItem], use_thermal: bool = False) -> Dict:
         "subtotal": totals["subtotal"],
         "tax": totals["tax"],
         "total": totals["total"],
-        "pdf": pdf_path
+        "items": items_for_receipt,
+        "print_job": print_job
     }
+
+def queue_pdf_bill(order_id: int, result: Dict):
+    """Queue the PDF bill for a saved order; poll get_pdf_service().status(order_id) for progress."""
+    return get_pdf_service().submit(
+        order_id,
+        result["items"],
+        result["subtotal"],
+        result["tax"],
+        result["total"]
+    )
@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import date
+
+from pos_app.utils.printer import pdf_bill_bytes
+from pos_app.utils.receipt_archive import ReceiptArchive
+
+
+def _render(items, total, tax, grand_total):
+    """Runs in a worker process: renders one bill and returns the PDF bytes."""
+    return pdf_bill_bytes(items, total, tax, grand_total)
+
+
+class PdfService:
+    """
+    Renders PDF bills in a background process pool so checkout never waits
+    on ReportLab. Orders are queued with submit() after they are saved and
+    the finished bills are appended to the day's ReceiptArchive segment;
+    status() tells the UI when a bill is ready. render_missing() re-renders
+    a whole day's missing bills in parallel, e.g. after a crash.
+    """
+
+    def __init__(self, max_workers: int | None = None, archive: ReceiptArchive | None = None):
+        self.max_workers = max_workers
+        self.archive = archive or ReceiptArchive()
+        self._pool = None
+        self._jobs = {}  # order_id -> (render Future, archived Future)
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def submit(self, order_id: int, items, total, tax, grand_total, day: str | None = None) -> Future:
+        """Queue a bill; returns a Future resolving to the archive segment it was stored in."""
+        day = day or date.today().isoformat()
+        with self._lock:
+            job = self._jobs.get(order_id)
+            if job is not None and not job[1].done():
+                return job[1]
+            archived = Future()
+            render = self._executor().submit(_render, items, total, tax, grand_total)
+            render.add_done_callback(lambda done: self._store(order_id, day, done, archived))
+            self._jobs[order_id] = (render, archived)
+            return archived
+
+    def _store(self, order_id: int, day: str, render: Future, archived: Future):
+        """Appends a rendered bill to the archive (runs on the pool's result thread)."""
+        try:
+            archived.set_result(self.archive.add(order_id, day, render.result()))
+        except Exception as e:
+            archived.set_exception(e)
+
+    def status(self, order_id: int, day: str | None = None) -> str:
+        """
+        Return 'queued', 'rendering', 'ready', 'failed' or 'missing'.
+        Bills rendered by an earlier run are found in the archive when day is given.
+        """
+        with self._lock:
+            job = self._jobs.get(order_id)
+        if job is not None:
+            render, archived = job
+            if not archived.done():
+                return "rendering" if render.running() else "queued"
+            return "failed" if archived.exception() is not None else "ready"
+        if day is not None and self.archive.has(order_id, day):
+            return "ready"
+        return "missing"
+
+    def error(self, order_id: int) -> str | None:
+        with self._lock:
+            job = self._jobs.get(order_id)
+        if job is not None and job[1].done() and job[1].exception() is not None:
+            return str(job[1].exception())
+        return None
+
+    def render_missing(self, db, day: str, progress=None) -> dict:
+        """
+        Render every bill for `day` (YYYY-MM-DD) that is not archived yet and
+        wait for them. Returns {"rendered": [order_id, ...], "failed": {order_id: error}}.
+        """
+        jobs = {}
+        for order in db.order_receipts_for_day(day):
+            if self.status(order["id"], day) in ("missing", "failed"):
+                job = self.submit(order["id"], order["items"], order["subtotal"], order["tax"], order["total"], day)
+                jobs[job] = order["id"]
+
+        rendered, failed = [], {}
+        for done, job in enumerate(as_completed(jobs), 1):
+            order_id = jobs[job]
+            try:
+                job.result()
+                rendered.append(order_id)
+            except Exception as e:
+                failed[order_id] = str(e)
+            if progress:
+                progress(done, len(jobs), order_id)
+        return {"rendered": sorted(rendered), "failed": failed}
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_service() -> PdfService:
+    """Return the process-wide PDF service; workers start on first submit."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PdfService()
+        return _service
+
+
+if __name__ == "__main__":
+    # Batch mode: python -m pos_app.utils.pdf_service 2025-01-31
+    import argparse
+    from pos_app.database.db_manager import DBManager
+
+    parser = argparse.ArgumentParser(description="Render missing PDF bills for a day.")
+    parser.add_argument("day", nargs="?", default=date.today().isoformat(), help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    service = PdfService(args.workers)
+    result = service.render_missing(
+        DBManager(), args.day, progress=lambda done, total, order_id: print(f"[{done}/{total}] order #{order_id}")
+    )
+    service.shutdown()
+    print(f"Rendered {len(result['rendered'])} bill(s) for {args.day} into {service.archive.segment_path(args.day)}")
+    for order_id, error in result["failed"].items():
+        print(f"  order #{order_id} failed: {error}")
@@ -0,0 +1,199 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from escpos.printer import Usb
+except ImportError:
+    Usb = None
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+SPOOL_PATH = BASE_DIR / "data" / "print_spool.db"
+RECEIPTS_DIR = BASE_DIR / "data" / "receipts"
+
+# Adjust vendor/product IDs to match your printer
+PRINTER_USB = (0x0416, 0x5011, 0)  # vendor_id, product_id, interface
+
+MAX_ATTEMPTS = 5
+BASE_BACKOFF_S = 1.0
+MAX_BACKOFF_S = 60.0
+
+
+class PrintSpooler:
+    """
+    Durable background print queue for thermal receipts.
+    Jobs are ESC/POS command lists (["text", s], ["set", {...}], ["cut"])
+    stored in data/print_spool.db and printed in order by one worker thread
+    that keeps the USB connection open. Failures are retried with exponential
+    backoff; after MAX_ATTEMPTS a job is marked 'dead' and appended to the day's
+    thermal_<date>.txt in data/receipts. Without python-escpos, jobs go
+    straight to that file.
+    """
+
+    def __init__(self, spool_path: Path = SPOOL_PATH, usb_args: tuple = PRINTER_USB):
+        self.usb_args = usb_args
+        spool_path.parent.mkdir(parents=True, exist_ok=True)
+        RECEIPTS_DIR.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(spool_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS print_jobs (
+                    id INTEGER PRIMARY KEY,
+                    commands TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            # Jobs interrupted mid-print are printed again
+            self._conn.execute("UPDATE print_jobs SET status='pending' WHERE status='printing'")
+
+        self._printer = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+        self._thread.start()
+
+    def submit(self, commands: list) -> int:
+        """Queue a job and return its id without waiting for the printer."""
+        with self._lock, self._conn:
+            job_id = self._conn.execute(
+                "INSERT INTO print_jobs (commands) VALUES (?)", (json.dumps(commands),)
+            ).lastrowid
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id: int) -> str | None:
+        """Return 'pending', 'printing', 'done', 'saved' or 'dead'."""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM print_jobs WHERE id=?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def dead_letters(self) -> list:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, attempts, last_error, created_at FROM print_jobs WHERE status='dead' ORDER BY id"
+            ).fetchall()
+
+    def retry(self, job_id: int):
+        """Re-queue a dead job, e.g. after the printer has been reconnected."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE print_jobs SET status='pending', attempts=0, next_attempt_at=0 WHERE id=? AND status='dead'",
+                (job_id,),
+            )
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._disconnect()
+        with self._lock:
+            self._conn.close()
+
+    # ---------- Worker ----------
+    def _run(self):
+        while not self._stopping.is_set():
+            job, wait = self._next_job()
+            if job is None:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            self._process(job)
+
+    def _next_job(self):
+        """Claim the oldest pending job once due; later jobs wait behind it so receipts stay in order."""
+        with self._lock, self._conn:
+            job = self._conn.execute(
+                "SELECT * FROM print_jobs WHERE status='pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if job is None:
+                return None, None
+            wait = job["next_attempt_at"] - time.time()
+            if wait > 0:
+                return None, wait
+            self._conn.execute("UPDATE print_jobs SET status='printing' WHERE id=?", (job["id"],))
+        return job, None
+
+    def _process(self, job):
+        commands = json.loads(job["commands"])
+        if Usb is None:
+            self._save_to_file(job["id"], commands)
+            self._set_status(job["id"], "saved")
+            return
+        try:
+            self._send(commands)
+            self._set_status(job["id"], "done")
+        except Exception as e:
+            self._disconnect()  # Reconnect from scratch on the next attempt
+            attempts = job["attempts"] + 1
+            if attempts >= MAX_ATTEMPTS:
+                path = self._save_to_file(job["id"], commands)
+                self._set_status(job["id"], "dead", attempts, f"{e}; saved to {path}")
+                return
+            delay = min(MAX_BACKOFF_S, BASE_BACKOFF_S * 2 ** (attempts - 1))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE print_jobs SET status='pending', attempts=?, next_attempt_at=?, last_error=? WHERE id=?",
+                    (attempts, time.time() + delay, str(e), job["id"]),
+                )
+
+    def _send(self, commands: list):
+        if self._printer is None:
+            self._printer = Usb(*self.usb_args)
+        for command, *args in commands:
+            if command == "text":
+                self._printer.text(args[0])
+            elif command == "set":
+                self._printer.set(**args[0])
+            elif command == "cut":
+                self._printer.cut()
+
+    def _disconnect(self):
+        if self._printer is not None:
+            try:
+                self._printer.close()
+            except Exception:
+                pass
+            self._printer = None
+
+    def _save_to_file(self, job_id: int, commands: list) -> Path:
+        """Append the receipt text to the day's log (one file per day, not per receipt)."""
+        now = datetime.now()
+        path = RECEIPTS_DIR / f"thermal_{now:%Y-%m-%d}.txt"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"----- job #{job_id} {now:%H:%M:%S} -----\n")
+            f.write("".join(args[0] for command, *args in commands if command == "text"))
+            f.write("\n")
+        return path
+
+    def _set_status(self, job_id: int, status: str, attempts: int | None = None, error: str | None = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE print_jobs SET status=?, attempts=COALESCE(?, attempts), last_error=COALESCE(?, last_error) WHERE id=?",
+                (status, attempts, error, job_id),
+            )
+
+
+_spooler = None
+_spooler_lock = threading.Lock()
+
+
+def get_spooler() -> PrintSpooler:
+    """Return the process-wide spooler, starting it on first use."""
+    global _spooler
+    with _spooler_lock:
+        if _spooler is None:
+            _spooler = PrintSpooler()
+        return _spooler
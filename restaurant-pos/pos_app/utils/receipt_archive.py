@@ -0,0 +1,90 @@
+import tempfile
+import threading
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+ARCHIVE_DIR = BASE_DIR / "data" / "receipts" / "archive"
+
+
+class ReceiptArchive:
+    """
+    PDF bills stored as one zip segment per day
+    (data/receipts/archive/bills_YYYY-MM-DD.zip, member bill_<order_id>.pdf)
+    instead of one loose file per sale. A lookup opens a single segment and
+    reads its central directory. Segments are only ever appended to, and
+    purge() drops whole days past the retention period. Bills can always be
+    re-rendered from the orders table (see PdfService.render_missing).
+    """
+
+    def __init__(self, directory: Path = ARCHIVE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._names = {}  # day -> set of member names, loaded on first lookup
+
+    def segment_path(self, day: str) -> Path:
+        return self.directory / f"bills_{day}.zip"
+
+    @staticmethod
+    def member_name(order_id: int) -> str:
+        return f"bill_{order_id}.pdf"
+
+    def add(self, order_id: int, day: str, data: bytes) -> Path:
+        """Append one bill to the day's segment; a re-rendered bill is skipped if already stored."""
+        path, name = self.segment_path(day), self.member_name(order_id)
+        with self._lock:
+            names = self._load_names(day)
+            if name not in names:
+                with zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+                    zf.writestr(name, data)
+                names.add(name)
+        return path
+
+    def has(self, order_id: int, day: str) -> bool:
+        with self._lock:
+            return self.member_name(order_id) in self._load_names(day)
+
+    def read(self, order_id: int, day: str) -> bytes | None:
+        if not self.has(order_id, day):
+            return None
+        with self._lock, zipfile.ZipFile(self.segment_path(day)) as zf:
+            return zf.read(self.member_name(order_id))
+
+    def extract(self, order_id: int, day: str) -> Path | None:
+        """Copy one bill to a temp file, e.g. to open or reprint it."""
+        data = self.read(order_id, day)
+        if data is None:
+            return None
+        path = Path(tempfile.gettempdir()) / self.member_name(order_id)
+        path.write_bytes(data)
+        return path
+
+    def purge(self, keep_days: int = 7 * 365) -> int:
+        """Delete segments older than the retention period; returns how many were removed."""
+        cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+        removed = 0
+        with self._lock:
+            for path in self.directory.glob("bills_*.zip"):
+                day = path.stem[len("bills_"):]
+                if day < cutoff:
+                    path.unlink()
+                    self._names.pop(day, None)
+                    removed += 1
+        return removed
+
+    def _load_names(self, day: str) -> set:
+        names = self._names.get(day)
+        if names is None:
+            path = self.segment_path(day)
+            names = set()
+            if path.exists():
+                try:
+                    with zipfile.ZipFile(path) as zf:
+                        names = set(zf.namelist())
+                except zipfile.BadZipFile:
+                    # Interrupted append: set the segment aside; render_missing rebuilds it
+                    path.rename(path.with_suffix(".zip.bad"))
+            self._names[day] = names
+        return names
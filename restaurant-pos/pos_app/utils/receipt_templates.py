@@ -0,0 +1,170 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Characters per line. "pdf" only limits how much of an item name fits.
+PAPER_WIDTHS = {"58mm": 32, "80mm": 48, "pdf": 60}
+
+# align is 'left', 'center' or 'rule'; right is an optional right-aligned column
+Line = namedtuple("Line", "align bold italic left right")
+
+# Shared by the thermal printer and the PDF bill:
+#   ("center", key, bold)   centered value from details
+#   ("rule", char)          full-width divider
+#   ("items",)              one row per (name, price) item
+#   ("amount", label, key)  label on the left, amount on the right
+#   ("stamp", key)          small italic footer value from details
+RECEIPT_LAYOUT = (
+    ("center", "shop_name", True),
+    ("rule", "="),
+    ("items",),
+    ("rule", "="),
+    ("amount", "Total:", "total"),
+    ("amount", "Tax:", "tax"),
+    ("amount", "Grand Total:", "grand_total"),
+    ("stamp", "timestamp"),
+)
+
+
+class ReceiptTemplate:
+    """
+    RECEIPT_LAYOUT compiled for one paper width: static lines are formatted
+    once and dynamic lines become closures with their widths baked in, so
+    rendering a receipt is one pass over the compiled steps.
+    """
+
+    def __init__(self, layout, width: int):
+        self.width = width
+        self._steps = [self._compile(spec) for spec in layout]
+
+    def render(self, details: dict) -> "Receipt":
+        """details: items (list of (name, price)), total, tax, grand_total, shop_name, timestamp."""
+        lines = []
+        for step in self._steps:
+            if isinstance(step, list):
+                lines.extend(step)
+            else:
+                step(details, lines)
+        return Receipt(lines)
+
+    def _format(self, line: Line) -> tuple:
+        width = self.width
+        if line.align == "rule":
+            return line, line.left * width
+        if line.align == "center":
+            return line, line.left[:width].center(width).rstrip()
+        if line.right is None:
+            return line, line.left[:width]
+        room = max(0, width - len(line.right) - 1)
+        return line, f"{line.left[:room]:<{room}} {line.right}"
+
+    def _compile(self, spec):
+        kind, fmt = spec[0], self._format
+
+        if kind == "rule":
+            return [fmt(Line("rule", False, False, spec[1], None))]
+
+        if kind == "center":
+            _, key, bold = spec
+            def step(details, out):
+                out.append(fmt(Line("center", bold, False, str(details[key]), None)))
+            return step
+
+        if kind == "items":
+            def step(details, out):
+                for name, price in details["items"]:
+                    out.append(fmt(Line("left", False, False, name, f"{price:>8.2f}")))
+            return step
+
+        if kind == "amount":
+            _, label, key = spec
+            def step(details, out):
+                out.append(fmt(Line("left", False, False, label, f"{details[key]:.2f}")))
+            return step
+
+        if kind == "stamp":
+            _, key = spec
+            def step(details, out):
+                out.append(fmt(Line("left", False, True, str(details[key]), None)))
+            return step
+
+        raise ValueError(f"Unknown receipt layout entry '{kind}'")
+
+
+class Receipt:
+    """A laid-out receipt, emitted as text, ESC/POS bytes, spooler commands or a PDF."""
+
+    ESC_INIT = b"\x1b@"
+    ESC_BOLD = {False: b"\x1bE\x00", True: b"\x1bE\x01"}
+    FEED_AND_CUT = b"\x1dV\x42\x00"
+
+    def __init__(self, lines: list):
+        self.lines = lines  # (Line, text) pairs
+
+    @property
+    def text(self) -> str:
+        return "\n".join(text for _, text in self.lines) + "\n"
+
+    def escpos(self, encoding: str = "cp437") -> bytes:
+        out = bytearray(self.ESC_INIT)
+        bold = False
+        for line, text in self.lines:
+            if line.bold != bold:
+                bold = line.bold
+                out += self.ESC_BOLD[bold]
+            out += text.encode(encoding, "replace") + b"\n"
+        if bold:
+            out += self.ESC_BOLD[False]
+        return bytes(out + self.FEED_AND_CUT)
+
+    def commands(self) -> list:
+        """PrintSpooler job for this receipt; bold runs use python-escpos' text_type."""
+        commands, run, bold = [], [], False
+        for line, text in self.lines:
+            if line.bold != bold:
+                if run:
+                    commands.append(["text", "\n".join(run) + "\n"])
+                    run = []
+                bold = line.bold
+                commands.append(["set", {"align": "left", "font": "a", "text_type": "B" if bold else "normal"}])
+            run.append(text)
+        if run:
+            commands.append(["text", "\n".join(run) + "\n"])
+        commands.append(["cut"])
+        return commands
+
+    def draw(self, c, page_size):
+        """Draw onto a reportlab canvas, starting new pages when one fills up."""
+        width, height = page_size
+        margin, leading = 50, 20
+        y = height - margin
+        for line, _ in self.lines:
+            if y < 100:  # If page is nearly full, start new page
+                c.showPage()
+                y = height - margin
+            if line.align == "rule":
+                y -= leading / 2
+                continue
+            if line.bold:
+                c.setFont("Helvetica-Bold", 16)
+            elif line.italic:
+                y -= leading
+                c.setFont("Helvetica-Oblique", 10)
+            else:
+                c.setFont("Helvetica", 12)
+            if line.align == "center":
+                c.drawCentredString(width / 2, y, line.left)
+            else:
+                c.drawString(margin, y, line.left)
+                if line.right is not None:
+                    c.drawRightString(width - 112, y, line.right.strip())
+            y -= leading
+
+
+@lru_cache(maxsize=None)
+def get_template(paper: str = "58mm") -> ReceiptTemplate:
+    """Compiled template for a paper size, built on first use."""
+    return ReceiptTemplate(RECEIPT_LAYOUT, PAPER_WIDTHS[paper])
+
+
+def render_receipt(details: dict, paper: str = "58mm") -> Receipt:
+    return get_template(paper).render(details)